@@ -2,6 +2,8 @@ from flask import Blueprint, request, jsonify
 from app.integrations.linkedin import LinkedInIntegration
 from app.integrations.github import import_github_profile, parse_github_username
 from app.database import get_db_connection
+from app.services.import_writer import ImportWriter
+from app.services.user_readiness import after_skills_write
 import json
 from datetime import datetime
 import os
@@ -44,59 +46,38 @@ def import_from_linkedin():
         # Initialize LinkedIn integration
         linkedin = LinkedInIntegration(access_token)
         
-        imported_counts = {
-            "skills": 0,
-            "courses": 0,
-            "total": 0
-        }
+        writer = ImportWriter(user_id)
         
         # Import skills
         if import_type in ['skills', 'all']:
-            skills = linkedin.import_skills(user_email)
-            
-            for skill in skills:
-                try:
-                    cursor.execute("""
-                        INSERT INTO user_skills 
-                        (user_id, skill_name, sector_context, confidence, source, acquired_date, evidence)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        user_id,
-                        skill['skill_name'],
-                        skill['sector_context'],
-                        skill['confidence'],
-                        'linkedin',
-                        skill['acquired_date'],
-                        json.dumps(skill['evidence'])
-                    ))
-                    imported_counts['skills'] += 1
-                except Exception as e:
-                    # Skip if duplicate (unique constraint)
-                    if 'UNIQUE constraint failed' not in str(e):
-                        print(f"Error importing skill {skill['skill_name']}: {e}")
+            for skill in linkedin.import_skills(user_email):
+                writer.add_skill(
+                    skill['skill_name'],
+                    skill['sector_context'],
+                    skill['confidence'],
+                    'linkedin',
+                    skill['evidence'],
+                    acquired_date=skill['acquired_date'],
+                )
         
         # Import courses
         if import_type in ['courses', 'all']:
-            courses = linkedin.import_courses(user_email)
-            
-            for course in courses:
-                try:
-                    cursor.execute("""
-                        INSERT INTO user_courses 
-                        (user_id, course_name, platform, sector, completion_date, skills_gained, certificate_url)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        user_id,
-                        course['course_name'],
-                        course['platform'],
-                        course['sector'],
-                        course['completion_date'],
-                        json.dumps(course['skills_gained']),
-                        course['certificate_url']
-                    ))
-                    imported_counts['courses'] += 1
-                except Exception as e:
-                    print(f"Error importing course {course['course_name']}: {e}")
+            for course in linkedin.import_courses(user_email):
+                writer.add_course(
+                    course['course_name'],
+                    course['platform'],
+                    course['sector'],
+                    course['completion_date'],
+                    course['skills_gained'],
+                    course['certificate_url'],
+                )
+        
+        written = writer.write(conn)
+        imported_counts = {
+            "skills": written['skills']['inserted'],
+            "courses": written['courses']['inserted'],
+        }
+        imported_counts['total'] = imported_counts['skills'] + imported_counts['courses']
         
         # Update user's last_updated timestamp
         cursor.execute("""
@@ -106,14 +87,15 @@ def import_from_linkedin():
         """, (datetime.now().isoformat(), user_id))
         
         conn.commit()
+        if written['skills']['inserted'] or written['skills']['updated']:
+            after_skills_write(conn, user_id)
         conn.close()
         
-        imported_counts['total'] = imported_counts['skills'] + imported_counts['courses']
-        
         return jsonify({
             "status": "success",
             "message": "LinkedIn data imported successfully",
             "imported": imported_counts,
+            "details": {"skills": written['skills'], "courses": written['courses']},
             "source": "linkedin",
             "timestamp": datetime.now().isoformat()
         }), 200
@@ -171,8 +153,12 @@ def import_from_github():
 
     Optional:
     {
-      "include_language_breakdown": true
+      "include_language_breakdown": true,
+      "incremental": true
     }
+
+    With "incremental", only repos updated since this user's last GitHub
+    import are read; existing skills keep their confidence.
     """
     try:
         data = request.get_json(silent=True)
@@ -202,6 +188,7 @@ def import_from_github():
         include_language_breakdown = str(data.get('include_language_breakdown', 'false')).lower() in {
             '1', 'true', 'yes', 'on'
         }
+        incremental = str(data.get('incremental', 'false')).lower() in {'1', 'true', 'yes', 'on'}
 
         # Rate-limit friendly behavior:
         # - we always derive skills only from repo languages
@@ -226,6 +213,14 @@ def import_from_github():
             return jsonify({"error": "User not found"}), 404
 
         user = dict(user)
+
+        since = None
+        if incremental:
+            sync = cursor.execute("""
+                SELECT last_fetched_at FROM github_sync_state
+                WHERE user_id = ? AND github_username = ?
+            """, (user_id, github_username.lower())).fetchone()
+            since = sync['last_fetched_at'] if sync else None
         
         # Server-side caps to keep token usage under control
         project_limit = int(os.getenv('GITHUB_PROJECT_LIMIT', '10'))
@@ -236,6 +231,7 @@ def import_from_github():
             project_limit=project_limit,
             include_language_breakdown=include_language_breakdown,
             language_call_limit=language_call_limit,
+            since=since,
         )
 
         if 'error' in github_data and not github_data.get('projects'):
@@ -248,68 +244,35 @@ def import_from_github():
         github_projects = github_data.get('projects') or []
         github_skills = github_data.get('skills') or []
         
-        imported_projects = 0
-        imported_skills = 0
-        
-        # Insert projects
-        returned_projects = []
-        returned_skills = []
-
+        # A partial window of repos would skew the confidence of known skills
+        writer = ImportWriter(user_id, refresh_skills=since is None)
         for project in github_projects:
-            try:
-                # prevent duplicate project rows for same URL
-                cursor.execute(
-                    "SELECT 1 FROM user_projects WHERE user_id = ? AND github_url = ? LIMIT 1",
-                    (user_id, project['url'])
-                )
-                exists = cursor.fetchone()
-
-                if exists:
-                    returned_projects.append(project)
-                    continue
-
-                cursor.execute("""
-                    INSERT INTO user_projects 
-                    (user_id, project_name, description, sector, skills_used, github_url, date_completed)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    user_id,
-                    project['name'],
-                    project['description'],
-                    user.get('target_sector', 'Tech'),
-                    json.dumps([project.get('language')] if project.get('language') else []),
-                    project['url'],
-                    project['updated_at']
-                ))
-                imported_projects += 1
-                returned_projects.append(project)
-            except Exception as e:
-                # Skip duplicates
-                continue
-        
-        # Insert skills
+            writer.add_project(
+                project['name'],
+                project['description'],
+                user.get('target_sector', 'Tech'),
+                [project.get('language')] if project.get('language') else [],
+                project['url'],
+                project['updated_at'],
+            )
         for skill in github_skills:
-            try:
-                cursor.execute("""
-                    INSERT INTO user_skills 
-                    (user_id, skill_name, sector_context, confidence, source, evidence)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    user_id,
-                    skill['name'],
-                    "GitHub",
-                    skill['confidence'],
-                    'github',
-                    json.dumps([skill['evidence']])
-                ))
-                imported_skills += 1
-                returned_skills.append(skill)
-            except Exception as e:
-                # Skip duplicates
-                returned_skills.append(skill)
-                continue
+            writer.add_skill(skill['name'], "GitHub", skill['confidence'], 'github', [skill['evidence']])
+        
+        written = writer.write(conn)
+        imported_projects = written['projects']['inserted']
+        imported_skills = written['skills']['inserted']
+
+        cursor.execute("""
+            INSERT INTO github_sync_state (user_id, github_username, last_fetched_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(user_id, github_username) DO UPDATE SET
+                last_fetched_at = excluded.last_fetched_at,
+                updated_at = CURRENT_TIMESTAMP
+        """, (user_id, github_username.lower(), github_data['fetched_at']))
         
         conn.commit()
+        if written['skills']['inserted'] or written['skills']['updated']:
+            after_skills_write(conn, user_id)
         conn.close()
         
         return jsonify({
@@ -318,10 +281,13 @@ def import_from_github():
                 "projects": imported_projects,
                 "skills": imported_skills
             },
+            "details": {"projects": written['projects'], "skills": written['skills']},
             "github_username": github_username,
             "total_repos": github_data.get('total_repos', 0),
-            "projects": returned_projects,
-            "skills": returned_skills,
+            "incremental": since is not None,
+            "since": since,
+            "projects": github_projects,
+            "skills": github_skills,
             "message": f"Imported {imported_projects} projects and {imported_skills} skills from GitHub"
         }), 200
         
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Tuple
 
 from flask import Blueprint, jsonify, request
 
 from app.database import get_db_connection
-from app.services.readiness import compute_core_fit, compute_role_readiness
+from app.services.readiness import SkillMatchIndex, compute_role_readiness
+from app.services.role_fit import get_role_fit_engine
+from app.services.resume_analysis.course_mapper import get_courses_for_skills, skill_key as course_skill_key
 from app.services.resume_analysis.roadmap import _load_roles
 from app.services.resume_analysis.utils import match_role
 
@@ -14,22 +16,6 @@ from app.services.resume_analysis.utils import match_role
 pathways_bp = Blueprint('pathways', __name__)
 
 
-def _find_matching_confidence(required_skill: str, user_skills_dict: Dict[str, float]) -> Optional[float]:
-    """Find a user's confidence for a required skill using exact or partial match."""
-    required_lower = (required_skill or '').strip().lower()
-    if not required_lower:
-        return None
-
-    if required_lower in user_skills_dict:
-        return user_skills_dict[required_lower]
-
-    for user_skill, confidence in user_skills_dict.items():
-        if required_lower in user_skill or user_skill in required_lower:
-            return confidence
-
-    return None
-
-
 def _safe_json_loads(value: Any, default: Any) -> Any:
     if value is None:
         return default
@@ -90,31 +76,6 @@ def _get_user_skill_map(user_id: str) -> Tuple[Dict[str, float], Dict[str, List[
         conn.close()
 
 
-def _get_courses_for_skill(skill: str, limit: int = 2) -> List[Dict[str, str]]:
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT platform, title, url
-            FROM courses
-            WHERE LOWER(skill) = LOWER(?)
-            LIMIT ?
-            """,
-            (skill, limit),
-        )
-        return [
-            {
-                'platform': row['platform'],
-                'title': row['title'],
-                'url': row['url'],
-            }
-            for row in cursor.fetchall()
-        ]
-    finally:
-        conn.close()
-
-
 @pathways_bp.route('/pathways/tree', methods=['GET'])
 def get_pathway_tree():
     """Return a role-based skill pathway tree with completion statuses.
@@ -156,6 +117,8 @@ def get_pathway_tree():
         role_requirements = roles_data[matched_role]
 
         skill_to_conf, skill_to_evidence = _get_user_skill_map(user_id)
+        # Built once and shared by the pathway and every suggested-role score
+        skill_index = SkillMatchIndex(skill_to_conf)
 
         phases_out: List[Dict[str, Any]] = []
         complete = weak = missing = 0
@@ -166,7 +129,7 @@ def get_pathway_tree():
             skills_out: List[Dict[str, Any]] = []
 
             for skill in required_skills:
-                confidence = _find_matching_confidence(skill, skill_to_conf)
+                confidence = skill_index.lookup(skill)
 
                 if confidence is None:
                     status = 'missing'
@@ -185,35 +148,25 @@ def get_pathway_tree():
                         'status': status,
                         'confidence': confidence,
                         'evidence': skill_to_evidence.get(skill_key, []),
-                        'courses': _get_courses_for_skill(skill) if status != 'complete' else [],
+                        'courses': [],
                     }
                 )
 
             phases_out.append({'phase': phase_name, 'skills': skills_out})
 
-        # Use a single shared definition of readiness across the app
-        readiness_stats = compute_role_readiness(role_requirements, skill_to_conf)
+        # Resolve courses for every missing/weak skill in a single lookup
+        skills_needing_courses = [
+            s for phase in phases_out for s in phase['skills'] if s['status'] != 'complete'
+        ]
+        courses_by_skill = get_courses_for_skills(s['name'] for s in skills_needing_courses)
+        for s in skills_needing_courses:
+            s['courses'] = list(courses_by_skill.get(course_skill_key(s['name']), []))
 
-        # "Which jobs can you get": score other roles (core-fit + projected readiness)
-        suggested_roles: List[Dict[str, Any]] = []
-        for role_name, reqs in roles_data.items():
-            core_fit = compute_core_fit(reqs, skill_to_conf)
-            if core_fit['total_required'] <= 0:
-                continue
+        # Use a single shared definition of readiness across the app
+        readiness_stats = compute_role_readiness(role_requirements, skill_index)
 
-            projected = compute_role_readiness(reqs, skill_to_conf)
-            suggested_roles.append(
-                {
-                    'role': role_name,
-                    'fit_score': core_fit['fit_score'],
-                    'matched_required': core_fit['matched_required'],
-                    'total_required': core_fit['total_required'],
-                    'projected_readiness_score': projected['readiness_score'],
-                }
-            )
-
-        suggested_roles.sort(key=lambda r: r['fit_score'], reverse=True)
-        suggested_roles = suggested_roles[:5]
+        # "Which jobs can you get": score every role at once (core-fit + projected readiness)
+        suggested_roles = get_role_fit_engine().top_roles(skill_index, k=5)
 
         return jsonify(
             {
@@ -1,8 +1,9 @@
 from flask import Blueprint, request, jsonify
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from app.models.schemas import Skill
 from app.services.resume_analysis.roadmap import generate_roadmap
 from app.services.resume_analysis.course_mapper import map_courses_to_skills
+from app.services.resume_analysis.response_cache import cached_response
 from app.services.readiness import build_skill_conf_map_from_request, compute_role_readiness
 
 recommendations_bp = Blueprint("recommendations", __name__)
@@ -81,6 +82,50 @@ def get_youtube_videos(skill: str) -> List[Dict]:
         {"title": f"Learn {skill}", "channel": "Various", "url": f"https://youtube.com/results?search_query={skill}+tutorial", "duration": "N/A"}
     ]
 
+def _build_recommendations(skills: List[Skill], target_role: str) -> Tuple[List[Dict], int]:
+    """Course/video recommendations for the role's skill gaps, and the gap count."""
+    # Generate roadmap (identifies skill gaps)
+    roadmap_phases = generate_roadmap(skills, target_role)
+
+    # Map courses to skills
+    roadmap_with_courses = map_courses_to_skills(roadmap_phases)
+
+    # Build response with courses, videos, and priority
+    recommendations = []
+
+    for phase in roadmap_with_courses:
+        for skill in phase.skills:
+            # Get YouTube videos for this skill
+            videos = get_youtube_videos(skill.name)
+
+            # Determine priority based on phase
+            priority_map = {
+                "foundation": "high",
+                "core": "medium",
+                "advanced": "low",
+                "projects": "medium"
+            }
+
+            recommendation = {
+                "skill_name": skill.name,
+                "phase": phase.phase,
+                "priority": priority_map.get(phase.phase, "medium"),
+                "courses": [
+                    {
+                        "platform": course.platform,
+                        "title": course.title,
+                        "url": course.url
+                    }
+                    for course in skill.courses
+                ],
+                "videos": videos[:2],  # Top 2 videos
+                "reason": f"Required for {target_role} role in {phase.phase} phase"
+            }
+
+            recommendations.append(recommendation)
+
+    return recommendations, sum(len(phase.skills) for phase in roadmap_with_courses)
+
 @recommendations_bp.route("/recommendations", methods=["POST"])
 def get_recommendations():
     """
@@ -113,45 +158,10 @@ def get_recommendations():
 
         role_requirements = roles_data.get(matched_role)
         
-        # Generate roadmap (identifies skill gaps)
-        roadmap_phases = generate_roadmap(skills, target_role)
-        
-        # Map courses to skills
-        roadmap_with_courses = map_courses_to_skills(roadmap_phases)
-        
-        # Build response with courses, videos, and priority
-        recommendations = []
-        
-        for phase in roadmap_with_courses:
-            for skill in phase.skills:
-                # Get YouTube videos for this skill
-                videos = get_youtube_videos(skill.name)
-                
-                # Determine priority based on phase
-                priority_map = {
-                    "foundation": "high",
-                    "core": "medium",
-                    "advanced": "low",
-                    "projects": "medium"
-                }
-                
-                recommendation = {
-                    "skill_name": skill.name,
-                    "phase": phase.phase,
-                    "priority": priority_map.get(phase.phase, "medium"),
-                    "courses": [
-                        {
-                            "platform": course.platform,
-                            "title": course.title,
-                            "url": course.url
-                        }
-                        for course in skill.courses
-                    ],
-                    "videos": videos[:2],  # Top 2 videos
-                    "reason": f"Required for {target_role} role in {phase.phase} phase"
-                }
-                
-                recommendations.append(recommendation)
+        recommendations, total_skills_needed = cached_response(
+            "recommendations", skills, target_role,
+            lambda: _build_recommendations(skills, target_role)
+        )
         
         # Calculate readiness score (shared definition used across the app)
         skill_conf = build_skill_conf_map_from_request(data["skills"])
@@ -162,7 +172,7 @@ def get_recommendations():
             "target_role": matched_role,
             "recommendations": recommendations,
             "summary": {
-                "total_skills_needed": sum(len(phase.skills) for phase in roadmap_with_courses),
+                "total_skills_needed": total_skills_needed,
                 "current_skills": len(skills),
                 "courses_available": sum(len(r["courses"]) for r in recommendations),
                 "videos_available": sum(len(r["videos"]) for r in recommendations)
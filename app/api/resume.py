@@ -1,16 +1,23 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context, url_for
 from typing import Optional, List
 import json
-from app.models.schemas import Skill
-from app.services.resume_analysis.extractor import extract_text
-from app.services.resume_analysis.normalizer import normalize_text
-from app.services.resume_analysis.skill_extractor import extract_skills
-from app.services.resume_analysis.scorer import score_skills
-from app.services.resume_analysis.roadmap import generate_roadmap
-from app.services.resume_analysis.course_mapper import map_courses_to_skills
+import shutil
+import tempfile
+from app.services.resume_analysis.pipeline import (
+    build_roadmap_response,
+    expand_uploads,
+    iter_analyze_documents,
+    run_analysis,
+)
+from app.services.resume_analysis.jobs import STATUS_SUCCEEDED, get_resume_job, submit_resume_job
 
 bp = Blueprint("resume", __name__)
 
+def _wants_async() -> bool:
+    value = request.form.get("async") or request.args.get("async") or ""
+    return value.strip().lower() in ("1", "true", "yes")
+
+
 @bp.route("/extract", methods=["POST"])
 def extract_skills_only():
     if "file" not in request.files:
@@ -23,14 +30,11 @@ def extract_skills_only():
     if not file.filename.lower().endswith(('.pdf', '.docx')):
         return jsonify({"error": "File must be PDF or DOCX"}), 400
     
-    content = file.read()
-    
-    raw_text = extract_text(content, file.filename)
-    normalized_text = normalize_text(raw_text)
-    skills_list = extract_skills(normalized_text, raw_text)
+    # The spooled upload stream is read in place, never copied into memory
+    analysis = run_analysis(file.stream, file.filename)
     
     return jsonify({
-        "extracted_skills": skills_list
+        "extracted_skills": analysis["extracted_skills"]
     })
 
 @bp.route("/analyze", methods=["POST"])
@@ -38,6 +42,11 @@ def analyze_resume():
     """
     Complete resume analysis - upload file and get analysis
     Supports both file upload and pre-extracted skills
+
+    With async=true (form field or query string) a file upload is queued
+    and 202 is returned with a job_id to poll at /api/resume/jobs/<job_id>.
+    If the same file and role already succeeded, that job is returned with
+    its result and 200 instead.
     """
     
     # Check if file is uploaded
@@ -47,19 +56,20 @@ def analyze_resume():
         if not file.filename.lower().endswith(('.pdf', '.docx')):
             return jsonify({"error": "File must be PDF or DOCX"}), 400
         
-        # Extract and score skills from resume
-        content = file.read()
-        raw_text = extract_text(content, file.filename)
-        normalized_text = normalize_text(raw_text)
-        skills_list = extract_skills(normalized_text, raw_text)
+        # Extract and score skills from resume, reading the spooled upload in place
+        if _wants_async():
+            job = submit_resume_job(file.stream, file.filename, request.form.get("target_role", "general"))
+            status_url = url_for("resume.get_job_status", job_id=job["job_id"])
+            # The same file and role already finished: nothing left to wait for
+            if job["status"] == STATUS_SUCCEEDED:
+                return jsonify({**job, "status_url": status_url}), 200
+            return jsonify({
+                "job_id": job["job_id"],
+                "status": job["status"],
+                "status_url": status_url,
+            }), 202
         
-        # Auto-score the extracted skills
-        scored_skills = score_skills(skills_list, raw_text)
-        
-        final_skills = [
-            {"name": skill.name, "confidence": skill.confidence}
-            for skill in scored_skills
-        ]
+        final_skills = run_analysis(file.stream, file.filename)["skills"]
     
     # Or use pre-provided skills with scores
     elif request.form.get("skills_with_scores"):
@@ -97,33 +107,67 @@ def analyze_resume():
     target_role = request.form.get("target_role", "general")
     
     # Generate roadmap
-    roadmap_phases = generate_roadmap(
-        [Skill(name=s["name"], confidence=s["confidence"]) for s in final_skills],
-        target_role
-    )
-    roadmap_with_courses = map_courses_to_skills(roadmap_phases)
-    
-    roadmap_response = []
-    for phase in roadmap_with_courses:
-        roadmap_response.append({
-            "phase": phase.phase,
-            "skills": [
-                {
-                    "name": skill.name,
-                    "courses": [
-                        {
-                            "platform": course.platform,
-                            "title": course.title,
-                            "url": course.url
-                        }
-                        for course in skill.courses
-                    ]
-                }
-                for skill in phase.skills
-            ]
-        })
+    roadmap_response = build_roadmap_response(final_skills, target_role)
     
     return jsonify({
         "skills": final_skills,
         "roadmap": roadmap_response
     })
+
+@bp.route("/jobs/<job_id>", methods=["GET"])
+def get_job_status(job_id):
+    """Status of an async analysis job; includes the result once succeeded."""
+    job = get_resume_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+@bp.route("/analyze/batch", methods=["POST"])
+def analyze_resume_batch():
+    """
+    Bulk resume analysis.
+
+    Accepts any number of PDF/DOCX files (multipart field "files", or
+    "file") and/or .zip archives of them. Files are processed in parallel
+    and results are streamed back as NDJSON, one line per file in
+    completion order, followed by a summary line.
+    """
+    uploads = [
+        (f.filename, f.stream)
+        for field in ("files", "file")
+        for f in request.files.getlist(field)
+        if f.filename
+    ]
+    if not uploads:
+        return jsonify({"error": "No files provided"}), 400
+
+    # Uploads and zip members are spooled to disk in chunks; workers read them by path
+    spool_dir = tempfile.mkdtemp(prefix="resume-batch-")
+    try:
+        documents, rejected = expand_uploads(uploads, spool_dir)
+    except Exception:
+        shutil.rmtree(spool_dir, ignore_errors=True)
+        raise
+    if not documents:
+        shutil.rmtree(spool_dir, ignore_errors=True)
+        return jsonify({"error": "No PDF or DOCX files found", "rejected": rejected}), 400
+
+    def generate():
+        try:
+            failed = len(rejected)
+            for item in rejected:
+                yield json.dumps({"index": None, **item}) + "\n"
+            for result in iter_analyze_documents(documents):
+                if "error" in result:
+                    failed += 1
+                yield json.dumps(result) + "\n"
+            yield json.dumps({
+                "done": True,
+                "total": len(documents) + len(rejected),
+                "succeeded": len(documents) + len(rejected) - failed,
+                "failed": failed,
+            }) + "\n"
+        finally:
+            shutil.rmtree(spool_dir, ignore_errors=True)
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
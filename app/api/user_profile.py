@@ -1,10 +1,11 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from app.database import get_db_connection
 import json
 import uuid
 from datetime import datetime
 
-from app.services.readiness import build_skill_conf_map_from_rows, compute_role_readiness
+from app.services.skill_store import iter_ndjson, upsert_user_skills
+from app.services.user_readiness import after_skills_write, get_user_readiness
 
 profile_bp = Blueprint('profile', __name__)
 
@@ -88,23 +89,9 @@ def get_profile(user_id):
         """, (user_id,))
         latest_analysis = cursor.fetchone()
 
-        # Compute a live readiness score (authoritative) for the user's current target role
-        computed_readiness = None
+        # Readiness for the user's current target role, kept up to date on every skill write
         try:
-            from app.services.resume_analysis.roadmap import _load_roles
-            from app.services.resume_analysis.utils import match_role
-
-            roles_data = _load_roles()
-            target_role = (dict(user).get('target_role') or 'software engineer').strip()
-            matched_role = match_role(target_role, roles_data) or target_role
-            if matched_role not in roles_data and 'software engineer' in roles_data:
-                matched_role = 'software engineer'
-            role_requirements = roles_data.get(matched_role, {})
-            skill_conf = build_skill_conf_map_from_rows(skills)
-            computed_readiness = {
-                **compute_role_readiness(role_requirements, skill_conf),
-                'target_role': matched_role,
-            }
+            computed_readiness = get_user_readiness(conn, user_id)
         except Exception:
             computed_readiness = None
         
@@ -151,6 +138,8 @@ def update_profile(user_id):
         cursor.execute(query, values)
         
         conn.commit()
+        if 'target_role' in data:
+            after_skills_write(conn, user_id)
         conn.close()
         
         return jsonify({"status": "success", "message": "Profile updated"}), 200
@@ -161,13 +150,23 @@ def update_profile(user_id):
 
 @profile_bp.route('/profile/<user_id>/skills/bulk', methods=['POST'])
 def bulk_add_skills(user_id):
-    """Add multiple skills to user profile"""
+    """Add or update multiple skills on a user profile in one transaction
+
+    Accepts {"skills": [...]} as JSON, or one skill object per line with
+    Content-Type application/x-ndjson (answered as NDJSON: one outcome line
+    per skill, then a summary line). Every skill gets an outcome of
+    inserted, updated or invalid.
+    """
     try:
-        data = request.json
-        skills = data.get('skills', [])
-        
-        if not skills:
-            return jsonify({"error": "No skills provided"}), 400
+        streaming = request.mimetype == 'application/x-ndjson'
+        if streaming:
+            skills = iter_ndjson(request.stream)
+        else:
+            data = request.json
+            skills = data.get('skills', [])
+            
+            if not skills:
+                return jsonify({"error": "No skills provided"}), 400
             
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -178,39 +177,37 @@ def bulk_add_skills(user_id):
             conn.close()
             return jsonify({"error": "User not found"}), 404
         
-        for skill in skills:
-            skill_name = skill.get('skill_name')
-            sector_context = skill.get('sector_context')
-            confidence = skill.get('confidence', 0.5)
-            source = skill.get('source', 'manual')
-            acquired_date = skill.get('acquired_date')
-            evidence = json.dumps(skill.get('evidence', []))
-
-            # 1. Try to update existing skill
-            cursor.execute("""
-                UPDATE user_skills 
-                SET confidence = ?, source = ?, evidence = ?
-                WHERE user_id = ? AND skill_name = ? AND (sector_context = ? OR (sector_context IS NULL AND ? IS NULL))
-            """, (confidence, source, evidence, user_id, skill_name, sector_context, sector_context))
-            
-            # 2. If no row was updated, insert new one
-            if cursor.rowcount == 0:
-                cursor.execute("""
-                    INSERT INTO user_skills 
-                    (user_id, skill_name, sector_context, confidence, source, acquired_date, evidence)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    user_id, skill_name, sector_context, confidence, 
-                    source, acquired_date, evidence
-                ))
+        outcome = upsert_user_skills(conn, user_id, skills)
+        if not outcome['total']:
+            conn.close()
+            return jsonify({"error": "No skills provided"}), 400
+        if outcome['invalid'] == outcome['total']:
+            conn.close()
+            return jsonify({"error": "No valid skills provided", "results": outcome['results']}), 400
             
         conn.commit()
+        if outcome['inserted'] or outcome['updated']:
+            after_skills_write(conn, user_id)
         conn.close()
         
-        return jsonify({
+        written = outcome['inserted'] + outcome['updated']
+        summary = {
             "status": "success",
-            "message": f"Added {len(skills)} skills successfully"
-        }), 201
+            "message": f"Added {written} skills successfully",
+            "total": outcome['total'],
+            "inserted": outcome['inserted'],
+            "updated": outcome['updated'],
+            "invalid": outcome['invalid'],
+        }
+        
+        if streaming:
+            def generate():
+                for result in outcome['results']:
+                    yield json.dumps(result) + "\n"
+                yield json.dumps({"done": True, **summary}) + "\n"
+            return Response(generate(), status=201, mimetype="application/x-ndjson")
+        
+        return jsonify({**summary, "results": outcome['results']}), 201
         
     except Exception as e:
         return jsonify({"error": str(e)}), 400
@@ -250,6 +247,7 @@ def update_skill(user_id, skill_id):
         cursor.execute(query, values)
         
         conn.commit()
+        after_skills_write(conn, user_id)
         conn.close()
         
         return jsonify({"status": "success", "message": "Skill updated"}), 200
@@ -274,6 +272,7 @@ def delete_skill(user_id, skill_id):
         cursor.execute("DELETE FROM user_skills WHERE id = ? AND user_id = ?", (skill_id, user_id))
         
         conn.commit()
+        after_skills_write(conn, user_id)
         conn.close()
         
         return jsonify({"status": "success", "message": "Skill deleted"}), 200
@@ -1,4 +1,6 @@
+from app.database import ensure_schema
 from app.main import app
 
 if __name__ == "__main__":
+    ensure_schema()
     app.run(debug=True)
\ No newline at end of file
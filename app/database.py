@@ -1,13 +1,237 @@
 import sqlite3
 import os
+import threading
 
-def get_db_connection():
-    """Get database connection with proper configuration"""
+from flask import current_app, g, has_app_context
+
+# Applied once when a connection is created, not on every checkout
+CONNECTION_PRAGMAS = (
+    ('journal_mode', 'WAL'),        # better read/write concurrency
+    ('synchronous', 'NORMAL'),      # safe with WAL, far fewer fsyncs
+    ('cache_size', -20000),         # ~20MB page cache per connection
+    ('mmap_size', 268435456),       # 256MB memory-mapped reads
+    ('temp_store', 'MEMORY'),
+)
+
+# sqlite3 keeps this many prepared statements per connection; pooled
+# connections live long enough for the cache to actually be reused.
+STATEMENT_CACHE_SIZE = 256
+
+
+def get_db_path():
+    """Path of the SQLite database (overridable with SKILLGENOME_DB_PATH)."""
+    override = os.getenv('SKILLGENOME_DB_PATH', '').strip()
+    if override:
+        return override
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    db_path = os.path.join(base_dir, 'skillgenome.db')
-    
-    conn = sqlite3.connect(db_path, timeout=30.0, check_same_thread=False)
+    return os.path.join(base_dir, 'skillgenome.db')
+
+
+def create_connection():
+    """Open a new, unpooled connection with the standard configuration.
+
+    Use this for long-lived connections owned by a single component;
+    request handlers should use get_db_connection().
+    """
+    conn = sqlite3.connect(
+        get_db_path(),
+        timeout=30.0,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
     conn.row_factory = sqlite3.Row
-    # Enable WAL mode for better concurrency
-    conn.execute('PRAGMA journal_mode=WAL')
+    for name, value in CONNECTION_PRAGMAS:
+        conn.execute(f'PRAGMA {name}={value}')
     return conn
+
+
+class ConnectionPool:
+    """A small LIFO pool of configured SQLite connections."""
+
+    def __init__(self, max_idle=8):
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+        self._stats = {
+            'created': 0,
+            'reused': 0,
+            'released': 0,
+            'discarded': 0,
+            'in_use': 0,
+            'peak_in_use': 0,
+        }
+
+    def acquire(self):
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+            if conn is not None:
+                self._stats['reused'] += 1
+            self._stats['in_use'] += 1
+            self._stats['peak_in_use'] = max(self._stats['peak_in_use'], self._stats['in_use'])
+
+        if conn is None:
+            try:
+                conn = create_connection()
+            except Exception:
+                with self._lock:
+                    self._stats['in_use'] -= 1
+                raise
+            with self._lock:
+                self._stats['created'] += 1
+        return conn
+
+    def release(self, conn):
+        # Match sqlite3 close() semantics: uncommitted work is discarded
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            healthy = True
+        except sqlite3.Error:
+            healthy = False
+
+        with self._lock:
+            self._stats['in_use'] -= 1
+            if healthy and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                self._stats['released'] += 1
+                return
+            self._stats['discarded'] += 1
+        conn.close()
+
+    def reset_after_fork(self):
+        # Connections inherited from the parent must not be used (or closed)
+        # in the child; just forget them.
+        self._lock = threading.Lock()
+        self._idle = []
+        self._stats['in_use'] = 0
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, 'idle': len(self._idle), 'max_idle': self.max_idle}
+
+
+def _pool_size():
+    try:
+        return int(os.getenv('DB_POOL_SIZE', '8'))
+    except Exception:
+        return 8
+
+
+_pool = ConnectionPool(max_idle=_pool_size())
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_pool.reset_after_fork)
+
+
+class PooledConnection:
+    """Connection handle returned by get_db_connection().
+
+    Behaves like a sqlite3.Connection; close() hands the underlying
+    connection back instead of closing it.
+    """
+
+    __slots__ = ('_conn', '_on_close')
+
+    def __init__(self, conn, on_close):
+        self._conn = conn
+        self._on_close = on_close
+
+    def __getattr__(self, name):
+        conn = self._conn
+        if conn is None:
+            raise sqlite3.ProgrammingError('Cannot operate on a closed database.')
+        return getattr(conn, name)
+
+    def __enter__(self):
+        # Hand out the handle, not the raw connection: closing what the
+        # `with` yields must return it to the pool, not close it
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._conn.__exit__(exc_type, exc, tb)
+
+    def close(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._on_close(conn)
+
+
+def _request_bound():
+    return has_app_context() and 'db_pool' in current_app.extensions
+
+
+def _close_request_handle(conn):
+    g._db_conn_refs -= 1
+    if g._db_conn_refs <= 0 and conn.in_transaction:
+        conn.rollback()
+
+
+def get_db_connection(private: bool = False):
+    """Get database connection with proper configuration.
+
+    Inside a Flask app context every call shares one pooled connection,
+    which goes back to the pool when the context tears down. Because it is
+    shared, a commit() or rollback() through any handle applies to every
+    caller's pending writes in that request. Helpers that commit on their
+    own schedule (caches, job bookkeeping) pass `private=True` to check out
+    a connection of their own, as every call outside a request does; it
+    stays theirs until close().
+    """
+    if private or not _request_bound():
+        return PooledConnection(_pool.acquire(), _pool.release)
+
+    if getattr(g, '_db_conn', None) is None:
+        g._db_conn = _pool.acquire()
+        g._db_conn_refs = 0
+    g._db_conn_refs += 1
+    return PooledConnection(g._db_conn, _close_request_handle)
+
+
+def _teardown_connection(exc=None):
+    conn = g.pop('_db_conn', None)
+    g.pop('_db_conn_refs', None)
+    if conn is not None:
+        _pool.release(conn)
+
+
+_schema_lock = threading.Lock()
+_schema_applied = False
+
+
+def apply_schema(conn):
+    """Run app/schema.sql on `conn`; every statement in it is idempotent."""
+    schema_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema.sql')
+    with open(schema_path, 'r', encoding='utf-8') as f:
+        schema = f.read()
+    conn.executescript(schema)
+    conn.commit()
+
+
+def ensure_schema():
+    """Apply app/schema.sql (idempotent) once per process.
+
+    Nothing runs it on import: the entry points (`flask --app app.main
+    init-db`, run_flask.py, start_server.py) and the components that own
+    tables in the schema call it before first use.
+    """
+    global _schema_applied
+    with _schema_lock:
+        if _schema_applied:
+            return
+        conn = create_connection()
+        try:
+            apply_schema(conn)
+        finally:
+            conn.close()
+        _schema_applied = True
+
+
+def pool_stats():
+    return _pool.stats()
+
+
+def init_db_pool(app):
+    """Bind get_db_connection() to the app/request context of `app`."""
+    app.extensions['db_pool'] = _pool
+    app.teardown_appcontext(_teardown_connection)
@@ -4,23 +4,189 @@ Free tier: 5000 requests/hour, no auth needed for public data
 """
 import requests
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from requests.adapters import HTTPAdapter
+from requests.utils import parse_header_links
 from urllib.parse import urlparse
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import time
 
+from app.integrations import github_cache
 
-# Simple in-memory cache to avoid burning GitHub rate limits during demos.
-# Keyed by username. Value: (expires_at_epoch_seconds, repos_list)
-_REPOS_CACHE = {}
+
+def _api_url() -> str:
+    """GitHub API base URL (overridable, e.g. for GitHub Enterprise or a local stub)."""
+    return os.getenv('GITHUB_API_URL', 'https://api.github.com').strip().rstrip('/')
 
 
 def _cache_ttl_seconds() -> int:
+    # Cached responses younger than this are used without asking GitHub;
+    # older ones are revalidated
     try:
         return int(os.getenv('GITHUB_CACHE_TTL_SECONDS', '600'))
     except Exception:
         return 600
 
 
+def _max_repo_pages() -> int:
+    # Upper bound on repo list pages (100 repos each) read per listing
+    try:
+        return max(1, int(os.getenv('GITHUB_MAX_REPO_PAGES', '10')))
+    except Exception:
+        return 10
+
+
+# Incremental imports re-read repos updated this long before the last sync,
+# so clock skew between GitHub and us cannot drop an update
+_SYNC_OVERLAP_SECONDS = 60
+
+
+class GitHubFetchError(Exception):
+    """Reading from the GitHub API failed; the message is safe to show to users."""
+
+
+def _language_workers() -> int:
+    try:
+        return max(1, int(os.getenv('GITHUB_LANGUAGE_WORKERS', '30')))
+    except Exception:
+        return 30
+
+
+# One keep-alive session for every GitHub call, sized for the language fan-out
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_language_workers())
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
+
+
+def _reset_session_after_fork():
+    # A forked child must not share the parent's sockets
+    global _session, _session_lock
+    _session = None
+    _session_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_session_after_fork)
+
+
+# Last rate-limit state reported by GitHub: calls left and when the window resets
+_rate_limit = {'remaining': None, 'reset': None}
+_rate_limit_lock = threading.Lock()
+
+
+def _record_rate_limit(response) -> None:
+    headers = response.headers
+    try:
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        retry_after = headers.get('Retry-After')
+        remaining = int(remaining) if remaining is not None else None
+        reset = int(reset) if reset is not None else None
+        if retry_after is not None and response.status_code in (403, 429):
+            # Secondary limits only say how long to back off
+            remaining, reset = 0, int(time.time()) + int(retry_after)
+    except ValueError:
+        return
+    if remaining is None:
+        return
+
+    with _rate_limit_lock:
+        # Concurrent responses arrive out of order: within one window the
+        # lowest count is the current one
+        if reset is not None and _rate_limit['reset'] is not None and reset < _rate_limit['reset']:
+            return
+        if reset == _rate_limit['reset'] and _rate_limit['remaining'] is not None:
+            remaining = min(remaining, _rate_limit['remaining'])
+        _rate_limit['remaining'] = remaining
+        _rate_limit['reset'] = reset
+
+
+def _rate_limited() -> bool:
+    """True while GitHub has told us the current window is used up."""
+    with _rate_limit_lock:
+        remaining, reset = _rate_limit['remaining'], _rate_limit['reset']
+    return remaining is not None and remaining <= 0 and reset is not None and reset > time.time()
+
+
+def _github_get(url: str, extra_headers=None):
+    headers = _github_headers()
+    if extra_headers:
+        headers.update(extra_headers)
+    response = _get_session().get(url, headers=headers, timeout=10)
+    _record_rate_limit(response)
+    return response
+
+
+def _cached_github_get(url: str):
+    """GET `url` through the persistent response cache.
+
+    Returns a response (live or `CachedResponse`), or None when GitHub's
+    rate limit is used up and nothing is cached for `url`.
+    """
+    started = time.time()
+    if not github_cache.cache_enabled():
+        if _rate_limited():
+            return None
+        response = _github_get(url)
+        response.fetched_at = started
+        return response
+
+    key = github_cache.cache_key(url, os.getenv('GITHUB_TOKEN', '').strip())
+    try:
+        entry = github_cache.lookup(key)
+    except Exception as e:
+        print(f"GitHub cache lookup failed: {e}")
+        github_cache.count('errors')
+        entry = None
+
+    if entry is not None:
+        # Fresh, or stale but the rate limit leaves no way to revalidate
+        if entry['fetched_at'] + _cache_ttl_seconds() > time.time() or _rate_limited():
+            github_cache.count('hits')
+            return github_cache.CachedResponse(entry)
+    elif _rate_limited():
+        return None
+
+    validators = {}
+    if entry is not None:
+        if entry['etag']:
+            validators['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            validators['If-Modified-Since'] = entry['last_modified']
+
+    response = _github_get(url, validators)
+    try:
+        if response.status_code == 304 and entry is not None:
+            github_cache.renew(key)
+            github_cache.count('revalidated')
+            return github_cache.CachedResponse({**entry, 'fetched_at': started}, headers=response.headers)
+        github_cache.count('misses')
+        if response.status_code == 200:
+            github_cache.store(
+                key, response.content,
+                response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                response.headers.get('Link'),
+            )
+    except Exception as e:
+        print(f"GitHub cache update failed: {e}")
+        github_cache.count('errors')
+    response.fetched_at = started
+    return response
+
+
 def _has_github_token() -> bool:
     return bool(os.getenv('GITHUB_TOKEN', '').strip())
 
@@ -65,8 +231,8 @@ def fetch_repo_languages(languages_url: str):
         # Only allow it when a token is configured.
         if not _has_github_token():
             return {}
-        res = requests.get(languages_url, headers=_github_headers(), timeout=10)
-        if res.status_code != 200:
+        res = _cached_github_get(languages_url)
+        if res is None or res.status_code != 200:
             return {}
         data = res.json()
         return data if isinstance(data, dict) else {}
@@ -74,50 +240,153 @@ def fetch_repo_languages(languages_url: str):
         return {}
 
 
-def fetch_user_repos(username: str):
-    if not username:
-        return None, {"error": "Missing GitHub username"}
+def _rate_limit_message(reset) -> str:
+    msg = "GitHub API rate limit exceeded"
+    if reset:
+        msg += f" (resets at unix={reset})"
+    msg += ". Set GITHUB_TOKEN env var to increase limits."
+    return msg
 
-    now = time.time()
-    cached = _REPOS_CACHE.get(username)
-    if cached:
-        expires_at, repos = cached
-        if isinstance(expires_at, (int, float)) and expires_at > now and isinstance(repos, list):
-            return repos, None
 
-    # Keep this as a single request to avoid rate limiting.
-    # Note: unauthenticated requests are limited to 60/hour.
-    url = f"https://api.github.com/users/{username}/repos?per_page=100&sort=updated"
-    response = requests.get(url, headers=_github_headers(), timeout=10)
+def _repo_list_error(response):
+    """User-facing error for a failed repo list response, or None."""
+    if response is None:
+        return _rate_limit_message(_rate_limit['reset'])
 
     if response.status_code == 404:
-        return None, {"error": "GitHub user not found"}
+        return "GitHub user not found"
 
     if response.status_code == 403:
         remaining = response.headers.get('X-RateLimit-Remaining')
         reset = response.headers.get('X-RateLimit-Reset')
         if remaining == '0':
-            msg = "GitHub API rate limit exceeded"
-            if reset:
-                msg += f" (resets at unix={reset})"
-            msg += ". Set GITHUB_TOKEN env var to increase limits."
-            return None, {"error": msg}
-        return None, {"error": "GitHub API forbidden (403)"}
+            return _rate_limit_message(reset)
+        return "GitHub API forbidden (403)"
 
     if response.status_code != 200:
-        return None, {"error": f"GitHub API error: {response.status_code}"}
+        return f"GitHub API error: {response.status_code}"
+
+    return None
 
-    repos = response.json()
-    if not isinstance(repos, list):
-        return None, {"error": "GitHub API returned unexpected response"}
 
-    ttl = _cache_ttl_seconds()
-    if ttl > 0:
-        _REPOS_CACHE[username] = (now + ttl, repos)
+def _next_page_url(response):
+    link = response.headers.get('Link')
+    if not link:
+        return None
+    for part in parse_header_links(link):
+        if part.get('rel') == 'next':
+            return part.get('url')
+    return None
+
+
+def iter_repo_pages(username: str):
+    """Yield (repos, fetched_at) for each page of a user's repos, most recently updated first.
+
+    Pages are requested lazily by following the `Link: rel="next"` header,
+    so a caller that stops iterating stops fetching. `fetched_at` is the unix
+    time the page was read from GitHub (earlier than now if it came from the
+    cache). Raises GitHubFetchError when a page cannot be read.
+    """
+    if not username:
+        raise GitHubFetchError("Missing GitHub username")
+
+    url = f"{_api_url()}/users/{username}/repos?per_page=100&sort=updated"
+    for _ in range(_max_repo_pages()):
+        try:
+            response = _cached_github_get(url)
+        except requests.RequestException as e:
+            # Connection errors and timeouts from the shared session
+            raise GitHubFetchError(f"GitHub API request failed: {e}") from e
+        error = _repo_list_error(response)
+        if error:
+            raise GitHubFetchError(error)
+
+        try:
+            repos = response.json()
+        except ValueError:
+            repos = None
+        if not isinstance(repos, list):
+            raise GitHubFetchError("GitHub API returned unexpected response")
+
+        yield repos, response.fetched_at
+
+        url = _next_page_url(response)
+        if not url:
+            return
+
+
+def _parse_timestamp(value):
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _sync_cutoff(since):
+    """Repos last updated before this were already seen by the sync at `since`."""
+    if since is None:
+        return None
+    since = _parse_timestamp(since)
+    if since is None:
+        return None
+    return since - timedelta(seconds=_SYNC_OVERLAP_SECONDS)
+
+
+def _updated_before(repo, cutoff) -> bool:
+    updated_at = _parse_timestamp(repo.get('updated_at'))
+    return updated_at is not None and updated_at < cutoff
+
+
+def iter_user_repos(username: str, since=None):
+    """Yield a user's repos, most recently updated first, fetching pages as needed.
 
+    With `since` (an ISO timestamp or datetime of a previous sync), stops at
+    the first repo that has not been updated since then.
+    """
+    cutoff = _sync_cutoff(since)
+    for repos, _fetched_at in iter_repo_pages(username):
+        for repo in repos:
+            if cutoff is not None and _updated_before(repo, cutoff):
+                return
+            yield repo
+
+
+def fetch_user_repos(username: str, limit: int = None, since=None):
+    """Returns (repos, None), or (None, {"error": ...}); at most `limit` repos when given."""
+    try:
+        repos = list(islice(iter_user_repos(username, since=since), limit))
+    except GitHubFetchError as e:
+        return None, {"error": str(e)}
     return repos, None
 
 
+def _collect_repos(username: str, limit: int, since=None):
+    """Read repo pages until `limit` repos are collected or the `since` cutoff is hit.
+
+    Returns (repos, repos_listed, fetched_at): `repos_listed` counts every
+    repo on the pages read and `fetched_at` is when the first page (the most
+    recently updated repos) was read. Raises GitHubFetchError.
+    """
+    cutoff = _sync_cutoff(since)
+    repos = []
+    repos_listed = 0
+    fetched_at = None
+    for page, page_fetched_at in iter_repo_pages(username):
+        if fetched_at is None:
+            fetched_at = page_fetched_at
+        repos_listed += len(page)
+        for repo in page:
+            if cutoff is not None and _updated_before(repo, cutoff):
+                return repos, repos_listed, fetched_at
+            repos.append(repo)
+        if len(repos) >= limit:
+            break
+    return repos, repos_listed, fetched_at
+
+
 def build_projects_and_skills(
     repos,
     *,
@@ -131,10 +400,21 @@ def build_projects_and_skills(
     language_count = {}
     language_bytes = {}
 
-    remaining_language_calls = max(int(language_call_limit or 0), 0)
-    allow_language_breakdown = bool(include_language_breakdown) and remaining_language_calls > 0 and _has_github_token()
+    language_calls = max(int(language_call_limit or 0), 0)
+    allow_language_breakdown = bool(include_language_breakdown) and language_calls > 0 and _has_github_token()
+
+    selected = repos[:project_limit]
+
+    # Language lookups for the first `language_call_limit` repos run
+    # concurrently; results are merged below in repo order.
+    breakdowns = {}
+    if allow_language_breakdown:
+        urls = [repo.get('languages_url') for repo in selected[:language_calls]]
+        if urls:
+            with ThreadPoolExecutor(max_workers=min(_language_workers(), len(urls))) as executor:
+                breakdowns = dict(enumerate(executor.map(fetch_repo_languages, urls)))
 
-    for repo in repos[:project_limit]:
+    for index, repo in enumerate(selected):
         # repo primary language
         primary_lang = repo.get('language')
         if primary_lang:
@@ -145,9 +425,8 @@ def build_projects_and_skills(
         topics = []
 
         language_breakdown = {}
-        if allow_language_breakdown and remaining_language_calls > 0:
-            remaining_language_calls -= 1
-            language_breakdown = fetch_repo_languages(repo.get('languages_url'))
+        if index in breakdowns:
+            language_breakdown = breakdowns[index]
             for lang, bytes_count in (language_breakdown or {}).items():
                 skills_extracted.add(lang)
                 try:
@@ -198,11 +477,18 @@ def import_github_profile(
     project_limit: int = 10,
     include_language_breakdown: bool = False,
     language_call_limit: int = 0,
+    since=None,
 ):
-    """Fetches repos once and returns both projects and derived skills."""
-    repos, err = fetch_user_repos(username)
-    if err:
-        return {"error": err.get("error", "GitHub fetch failed"), "projects": [], "skills": [], "skills_extracted": [], "total_repos": 0}
+    """Reads repos once and returns both projects and derived skills.
+
+    Repo pages stop being fetched once `project_limit` repos are in hand.
+    With `since` (the `fetched_at` of a previous import), only repos updated
+    after it are read and returned.
+    """
+    try:
+        repos, repos_listed, fetched_at = _collect_repos(username, project_limit, since=since)
+    except GitHubFetchError as e:
+        return {"error": str(e), "projects": [], "skills": [], "skills_extracted": [], "total_repos": 0}
 
     projects, skills, skills_extracted = build_projects_and_skills(
         repos,
@@ -211,12 +497,14 @@ def import_github_profile(
         language_call_limit=language_call_limit,
     )
 
+    # Whole seconds, rounded down: GitHub's updated_at has no fractions
     return {
         "projects": projects,
         "skills": skills,
         "skills_extracted": skills_extracted,
-        "total_repos": len(repos),
-        "fetched_at": datetime.now(timezone.utc).isoformat(),
+        "total_repos": repos_listed,
+        "fetched_at": datetime.fromtimestamp(int(fetched_at), timezone.utc).isoformat(),
+        "incremental": since is not None,
     }
 
 def import_github_projects(username, include_language_breakdown: bool = True, limit: int = 10):
@@ -224,9 +512,8 @@ def import_github_projects(username, include_language_breakdown: bool = True, li
     Import user's GitHub repositories as projects
     """
     try:
-        repos, err = fetch_user_repos(username)
-        if err:
-            return {"error": err.get("error", "GitHub fetch failed"), "projects": []}
+        # GitHubFetchError lands in the handler below
+        repos, repos_listed, _fetched_at = _collect_repos(username, limit)
 
         projects, _skills, skills_extracted = build_projects_and_skills(
             repos,
@@ -236,7 +523,7 @@ def import_github_projects(username, include_language_breakdown: bool = True, li
             language_call_limit=0,
         )
 
-        return {"projects": projects, "skills_extracted": skills_extracted, "total_repos": len(repos)}
+        return {"projects": projects, "skills_extracted": skills_extracted, "total_repos": repos_listed}
     
     except Exception as e:
         return {"error": str(e), "projects": []}
@@ -247,7 +534,7 @@ def import_github_skills(username, include_language_breakdown: bool = True, limi
     Extract skills from GitHub profile languages
     """
     try:
-        repos, err = fetch_user_repos(username)
+        repos, err = fetch_user_repos(username, limit=limit)
         if err:
             return []
 
@@ -0,0 +1,176 @@
+"""Persistent HTTP cache for GitHub API responses.
+
+Successful responses are stored in the `github_http_cache` table with
+their `ETag` / `Last-Modified` validators, so every worker process shares
+them and they survive restarts. An entry younger than the freshness TTL is
+served without a request; an older one is revalidated with
+`If-None-Match` / `If-Modified-Since`, and GitHub's 304 answer (which does
+not count against the rate limit) just renews it. Entries are evicted
+least-recently-used once the entry or byte budget is exceeded.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+from requests.structures import CaseInsensitiveDict
+
+from app.database import ensure_schema, get_db_connection
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'errors': 0}
+
+
+def cache_enabled() -> bool:
+    return os.getenv('GITHUB_CACHE_ENABLED', 'true').strip().lower() not in ('0', 'false', 'no')
+
+
+def _max_entries() -> int:
+    try:
+        return int(os.getenv('GITHUB_CACHE_MAX_ENTRIES', '5000'))
+    except Exception:
+        return 5000
+
+
+def _max_bytes() -> int:
+    try:
+        return int(os.getenv('GITHUB_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+    except Exception:
+        return 32 * 1024 * 1024
+
+
+def count(name: str, n: int = 1) -> None:
+    with _stats_lock:
+        _stats[name] += n
+
+
+class CachedResponse:
+    """The parts of a `requests.Response` the GitHub client reads, served from the cache."""
+
+    def __init__(self, entry: Dict, headers=None):
+        self.status_code = 200
+        self.headers = CaseInsensitiveDict(headers or {})
+        # Pagination needs the stored Link header even when GitHub's 304 omits it
+        if entry.get('link') and 'Link' not in self.headers:
+            self.headers['Link'] = entry['link']
+        self.content = entry['body']
+        self.fetched_at = entry['fetched_at']
+        self.from_cache = True
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def cache_key(url: str, token: str = '') -> str:
+    """Responses depend on the credentials (private repos), so they are part of the key."""
+    scope = hashlib.sha256(token.encode('utf-8')).hexdigest()[:16] if token else 'anonymous'
+    return f"{scope}:{url}"
+
+
+def lookup(key: str) -> Optional[Dict]:
+    """The cached entry for `key` (body, etag, last_modified, link, fetched_at), or None."""
+    ensure_schema()
+    conn = get_db_connection(private=True)
+    try:
+        row = conn.execute(
+            'SELECT body, etag, last_modified, link, fetched_at FROM github_http_cache WHERE cache_key = ?',
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute('UPDATE github_http_cache SET last_used_at = ? WHERE cache_key = ?', (time.time(), key))
+        conn.commit()
+    finally:
+        conn.close()
+    return {
+        'body': zlib.decompress(row['body']),
+        'etag': row['etag'],
+        'last_modified': row['last_modified'],
+        'link': row['link'],
+        'fetched_at': row['fetched_at'],
+    }
+
+
+def renew(key: str) -> None:
+    """Mark `key` as just revalidated (after a 304)."""
+    now = time.time()
+    conn = get_db_connection(private=True)
+    try:
+        conn.execute(
+            'UPDATE github_http_cache SET fetched_at = ?, last_used_at = ? WHERE cache_key = ?',
+            (now, now, key),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def store(key: str, body: bytes, etag: Optional[str], last_modified: Optional[str],
+          link: Optional[str] = None) -> None:
+    ensure_schema()
+    blob = zlib.compress(body)
+    now = time.time()
+    conn = get_db_connection(private=True)
+    try:
+        conn.execute("""
+            INSERT OR REPLACE INTO github_http_cache
+                (cache_key, etag, last_modified, link, body, size_bytes, fetched_at, last_used_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (key, etag, last_modified, link, blob, len(blob), now, now))
+        evicted = _evict(conn)
+        conn.commit()
+    finally:
+        conn.close()
+
+    count('stores')
+    if evicted:
+        count('evictions', evicted)
+
+
+def _evict(conn) -> int:
+    entries, total_bytes = conn.execute(
+        'SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM github_http_cache'
+    ).fetchone()
+    max_entries = _max_entries()
+    max_bytes = _max_bytes()
+    if entries <= max_entries and total_bytes <= max_bytes:
+        return 0
+
+    evicted = 0
+    rows = conn.execute('SELECT cache_key, size_bytes FROM github_http_cache ORDER BY last_used_at').fetchall()
+    doomed = []
+    for row in rows:
+        if entries <= max_entries and total_bytes <= max_bytes:
+            break
+        doomed.append((row['cache_key'],))
+        entries -= 1
+        total_bytes -= row['size_bytes']
+        evicted += 1
+    conn.executemany('DELETE FROM github_http_cache WHERE cache_key = ?', doomed)
+    return evicted
+
+
+def github_cache_stats() -> Dict:
+    with _stats_lock:
+        stats = dict(_stats)
+    if not cache_enabled():
+        return {**stats, 'enabled': False}
+    ensure_schema()
+    conn = get_db_connection(private=True)
+    try:
+        entries, total_bytes = conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM github_http_cache'
+        ).fetchone()
+    finally:
+        conn.close()
+    return {
+        **stats,
+        'enabled': True,
+        'entries': entries,
+        'bytes': total_bytes,
+        'max_entries': _max_entries(),
+        'max_bytes': _max_bytes(),
+    }
@@ -7,6 +7,12 @@ from app.api.pathways import pathways_bp
 from app.routes.gap_analysis import gap_analysis_bp
 from app.routes import auth_bp
 from app.models.database import db
+from app.database import ensure_schema, init_db_pool, pool_stats
+from app.integrations.github_cache import github_cache_stats
+from app.services.resume_analysis.cache import resume_cache_stats
+from app.services.resume_analysis.models import model_stats, preload_models_if_configured
+from app.services.resume_analysis.response_cache import response_cache_stats
+from app.services.resume_analysis.roadmap import roadmap_cache_stats
 import os
 
 app = Flask(__name__, template_folder='../templates')
@@ -17,6 +23,8 @@ app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
 db.init_app(app)
+init_db_pool(app)
+preload_models_if_configured()
 
 # Configure CORS properly for preflight requests
 from flask_cors import CORS
@@ -57,6 +65,12 @@ app.register_blueprint(auth_bp, url_prefix="/auth")
 with app.app_context():
     db.create_all()
 
+@app.cli.command("init-db")
+def init_db_command():
+    """Apply app/schema.sql to the database (run before serving)."""
+    ensure_schema()
+    print("Database schema is up to date")
+
 @app.route("/", methods=["GET"])
 def root():
     """Serve the test interface"""
@@ -72,6 +86,8 @@ def api_info():
         "endpoints": {
             "user_profiles": "/api/profile",
             "resume_analysis": "/api/resume/analyze",
+            "resume_batch_analysis": "/api/resume/analyze/batch",
+            "resume_job_status": "/api/resume/jobs/<job_id>",
             "gap_analysis": "/api/gap-analysis/<user_id>",
             "linkedin_import": "/api/import/linkedin",
             "health": "/health",
@@ -84,6 +100,18 @@ def health():
     """Health check endpoint"""
     return jsonify({"status": "healthy"}), 200
 
+@app.route("/health/stats", methods=["GET"])
+def health_stats():
+    """Runtime metrics (connection pool usage, resume, roadmap, response and GitHub caches, NLP models)"""
+    return jsonify({
+        "db_pool": pool_stats(),
+        "resume_cache": resume_cache_stats(),
+        "nlp_models": model_stats(),
+        "roadmap_cache": roadmap_cache_stats(),
+        "response_cache": response_cache_stats(),
+        "github_cache": github_cache_stats()
+    }), 200
+
 if __name__ == "__main__":
     print("=" * 60)
     print(" SkillGenome Backend Server Starting...")
@@ -92,4 +120,5 @@ if __name__ == "__main__":
     print("Health: http://localhost:5000/health")
     print("API Docs: See /api endpoints")
     print("=" * 60)
+    ensure_schema()
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -1,5 +1,5 @@
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 class Skill(BaseModel):
     name: str
@@ -10,6 +10,9 @@ class ManualSkill(BaseModel):
     confidence: float
 
 class Course(BaseModel):
+    # Course records are shared between roadmaps (see CourseIndex)
+    model_config = ConfigDict(frozen=True)
+
     platform: str
     title: str
     url: str
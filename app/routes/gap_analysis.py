@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.database import get_db_connection
+from app.services.readiness import SkillMatchIndex, compute_role_readiness
+from app.services.reference_data import get_reference_data
 import json
 import os
 from datetime import datetime
@@ -70,26 +72,14 @@ def analyze_gaps(user_id):
         
         # 4. Calculate gaps using scorer
         # Extract required skills from role
-        required_skills = role_requirements.get('foundation', []) + role_requirements.get('core', [])
-        preferred_skills = role_requirements.get('advanced', []) + role_requirements.get('projects', [])
+        required_skills = list(role_requirements.get('foundation', [])) + list(role_requirements.get('core', []))
+        preferred_skills = list(role_requirements.get('advanced', [])) + list(role_requirements.get('projects', []))
         
         # Map user skills to skill names with fuzzy matching
         user_skill_names = {skill['skill_name'].lower(): skill['confidence'] for skill in user_skills}
         
-        def find_matching_skill(required_skill, user_skills_dict):
-            """Check if user has skill with exact or partial match"""
-            required_lower = required_skill.lower()
-            
-            # Exact match
-            if required_lower in user_skills_dict:
-                return user_skills_dict[required_lower]
-            
-            # Partial match - check if required skill is contained in any user skill
-            for user_skill, confidence in user_skills_dict.items():
-                if required_lower in user_skill or user_skill in required_lower:
-                    return confidence
-            
-            return None
+        # Exact-then-partial matching, indexed once for all requirements
+        skill_index = SkillMatchIndex(user_skill_names)
         
         # Calculate gaps
         missing_required = []
@@ -97,7 +87,7 @@ def analyze_gaps(user_id):
         weak_skills = []
         
         for skill in required_skills:
-            confidence = find_matching_skill(skill, user_skill_names)
+            confidence = skill_index.lookup(skill)
             
             if confidence is None:
                 missing_required.append({
@@ -113,7 +103,7 @@ def analyze_gaps(user_id):
                 })
         
         for skill in preferred_skills:
-            confidence = find_matching_skill(skill, user_skill_names)
+            confidence = skill_index.lookup(skill)
             
             if confidence is None:
                 missing_preferred.append({
@@ -123,9 +113,7 @@ def analyze_gaps(user_id):
                 })
         
         # Calculate readiness score (shared definition used across the app)
-        from app.services.readiness import compute_role_readiness
-
-        readiness_score = compute_role_readiness(role_requirements, user_skill_names)['readiness_score']
+        readiness_score = compute_role_readiness(role_requirements, skill_index)['readiness_score']
         
         # 5. Generate recommendations
         recommendations = generate_recommendations(
@@ -218,42 +206,26 @@ def generate_recommendations(missing_required, missing_preferred, weak_skills, s
     
     recommendations = []
     
-    # Load course recommendations from database
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    # Course recommendations come from the reference-data snapshot
+    course_index = get_reference_data().course_index
     
     # Recommend courses for missing required skills (HIGH PRIORITY)
     for skill_obj in missing_required[:3]:  # Top 3 missing
         skill = skill_obj['skill']
         
-        # Find relevant courses from database, filtered by sector if possible
-        cursor.execute("""
-            SELECT platform, title, url FROM courses 
-            WHERE LOWER(skill) = LOWER(?) AND (LOWER(sector) = LOWER(?) OR sector IS NULL OR sector = 'Technology')
-            LIMIT 1
-        """, (skill, sector))
-        
-        course = cursor.fetchone()
-        
-        if not course:
-            # Fallback to any course for this skill
-            cursor.execute("""
-                SELECT platform, title, url FROM courses 
-                WHERE LOWER(skill) = LOWER(?)
-                LIMIT 1
-            """, (skill,))
-            course = cursor.fetchone()
+        # Find a relevant course, filtered by sector if possible
+        course = course_index.course_for_sector(skill, sector)
         
         if course:
             recommendations.append({
                 "type": "course",
                 "priority": "high",
                 "skill": skill,
-                "action": f"Complete course: {course['title']}",
+                "action": f"Complete course: {course.title}",
                 "courses": [{
-                    "platform": course['platform'],
-                    "title": course['title'],
-                    "url": course['url']
+                    "platform": course.platform,
+                    "title": course.title,
+                    "url": course.url
                 }],
                 "reason": f"Critical skill gap - {skill} is required for {role} in {sector}"
             })
@@ -274,22 +246,7 @@ def generate_recommendations(missing_required, missing_preferred, weak_skills, s
     for skill_obj in missing_preferred[:2]:
         skill = skill_obj['skill']
         
-        # Find course from database
-        cursor.execute("""
-            SELECT platform, title, url FROM courses 
-            WHERE LOWER(skill) = LOWER(?) AND (LOWER(sector) = LOWER(?) OR sector IS NULL OR sector = 'Technology')
-            LIMIT 1
-        """, (skill, sector))
-        
-        course = cursor.fetchone()
-        
-        if not course:
-            cursor.execute("""
-                SELECT platform, title, url FROM courses 
-                WHERE LOWER(skill) = LOWER(?)
-                LIMIT 1
-            """, (skill,))
-            course = cursor.fetchone()
+        course = course_index.course_for_sector(skill, sector)
         
         if course:
             recommendations.append({
@@ -298,14 +255,13 @@ def generate_recommendations(missing_required, missing_preferred, weak_skills, s
                 "skill": skill,
                 "action": f"Learn {skill} to increase competitiveness",
                 "courses": [{
-                    "platform": course['platform'],
-                    "title": course['title'],
-                    "url": course['url']
+                    "platform": course.platform,
+                    "title": course.title,
+                    "url": course.url
                 }],
                 "reason": f"Preferred skill for {role} advancement in {sector}"
             })
     
-    conn.close()
     return recommendations
 
 
@@ -84,9 +84,175 @@ CREATE TABLE IF NOT EXISTS user_achievements (
     FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
 );
 
+-- Resume Jobs: Asynchronous resume analysis queue
+CREATE TABLE IF NOT EXISTS resume_jobs (
+    job_id VARCHAR(50) PRIMARY KEY,
+    content_hash VARCHAR(64) NOT NULL,  -- SHA-256 of the uploaded file
+    filename VARCHAR(255),
+    target_role VARCHAR(100),
+    analysis_version VARCHAR(50),  -- reference data + NLP models the result depends on
+    status VARCHAR(20) NOT NULL,  -- 'queued', 'running', 'succeeded', 'failed'
+    payload_path TEXT,  -- spooled upload, removed once processed
+    owner VARCHAR(100),  -- host:pid of the process running the job
+    heartbeat_at TIMESTAMP,  -- refreshed by the owner while the job runs
+    result TEXT,  -- JSON analysis response
+    error TEXT,
+    timings TEXT,  -- JSON object: stage -> seconds
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+-- Resume Cache: extraction results keyed by file content + ontology version
+CREATE TABLE IF NOT EXISTS resume_cache (
+    cache_key VARCHAR(128) PRIMARY KEY,  -- sha256:extension:ontology version
+    raw_text BLOB,  -- zlib-compressed
+    normalized_text BLOB,  -- zlib-compressed
+    extracted_skills TEXT,  -- JSON array
+    skills TEXT,  -- JSON array of {name, confidence}
+    size_bytes INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_used_at REAL NOT NULL  -- unix time, for LRU eviction
+);
+
+-- GitHub HTTP Cache: API responses with their validators, shared by all workers
+CREATE TABLE IF NOT EXISTS github_http_cache (
+    cache_key TEXT PRIMARY KEY,  -- credential scope + request URL
+    etag TEXT,
+    last_modified TEXT,
+    link TEXT,  -- Link header, for following pagination from the cache
+    body BLOB NOT NULL,  -- zlib-compressed response body
+    size_bytes INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,  -- unix time of the last 200/304 from GitHub
+    last_used_at REAL NOT NULL  -- unix time, for LRU eviction
+);
+
+-- GitHub Sync State: when each user's repo list was last read, for incremental imports
+CREATE TABLE IF NOT EXISTS github_sync_state (
+    user_id VARCHAR(50) NOT NULL,
+    github_username VARCHAR(100) NOT NULL,  -- lowercased
+    last_fetched_at TEXT NOT NULL,  -- ISO 8601 UTC, when the newest repos were read
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, github_username),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+-- User Readiness: materialized readiness for each user's target role
+CREATE TABLE IF NOT EXISTS user_readiness (
+    user_id VARCHAR(50) PRIMARY KEY,
+    target_role VARCHAR(100),  -- as set on the profile
+    matched_role VARCHAR(100),  -- canonical role it resolved to
+    reference_version VARCHAR(50) NOT NULL,  -- roles/courses version it was computed against
+    skills_total INTEGER NOT NULL,
+    skills_complete INTEGER NOT NULL,
+    skills_weak INTEGER NOT NULL,
+    skills_missing INTEGER NOT NULL,
+    readiness_score REAL NOT NULL,
+    fit_score REAL NOT NULL,
+    matched_required INTEGER NOT NULL,
+    total_required INTEGER NOT NULL,
+    phase_status TEXT NOT NULL,  -- JSON object: phase -> {complete, weak, missing}
+    updated_at TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+-- Any other write to a user's skills or target role invalidates the row
+CREATE TRIGGER IF NOT EXISTS trg_user_skills_insert_readiness AFTER INSERT ON user_skills
+BEGIN
+    DELETE FROM user_readiness WHERE user_id = NEW.user_id;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_user_skills_update_readiness AFTER UPDATE ON user_skills
+BEGIN
+    DELETE FROM user_readiness WHERE user_id IN (OLD.user_id, NEW.user_id);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_user_skills_delete_readiness AFTER DELETE ON user_skills
+BEGIN
+    DELETE FROM user_readiness WHERE user_id = OLD.user_id;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_users_target_role_readiness AFTER UPDATE OF target_role ON users
+BEGIN
+    DELETE FROM user_readiness WHERE user_id = NEW.user_id;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_users_delete_readiness AFTER DELETE ON users
+BEGIN
+    DELETE FROM user_readiness WHERE user_id = OLD.user_id;
+END;
+
+-- Reference data: roles, skill ontology and courses (filled by the populate scripts)
+CREATE TABLE IF NOT EXISTS roles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    role_name TEXT NOT NULL,
+    category TEXT NOT NULL,  -- foundation, core, advanced, projects
+    skill TEXT NOT NULL,
+    sector TEXT
+);
+
+CREATE TABLE IF NOT EXISTS ontology (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    skill TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS courses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    skill TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    sector TEXT
+);
+
+-- Reference Data Version: bumped by every write to the reference tables,
+-- so the in-process snapshot (app/services/reference_data.py) knows to reload
+CREATE TABLE IF NOT EXISTS reference_data_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO reference_data_version (id, version) VALUES (1, 0);
+CREATE TRIGGER IF NOT EXISTS trg_roles_insert_version AFTER INSERT ON roles
+BEGIN
+    UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_roles_update_version AFTER UPDATE ON roles
+BEGIN
+    UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_roles_delete_version AFTER DELETE ON roles
+BEGIN
+    UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_ontology_insert_version AFTER INSERT ON ontology
+BEGIN
+    UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_ontology_update_version AFTER UPDATE ON ontology
+BEGIN
+    UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_ontology_delete_version AFTER DELETE ON ontology
+BEGIN
+    UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_courses_insert_version AFTER INSERT ON courses
+BEGIN
+    UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_courses_update_version AFTER UPDATE ON courses
+BEGIN
+    UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_courses_delete_version AFTER DELETE ON courses
+BEGIN
+    UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+END;
+
 -- Indexes for performance
 CREATE INDEX IF NOT EXISTS idx_user_skills_user ON user_skills(user_id);
 CREATE INDEX IF NOT EXISTS idx_user_courses_user ON user_courses(user_id);
 CREATE INDEX IF NOT EXISTS idx_user_projects_user ON user_projects(user_id);
+CREATE INDEX IF NOT EXISTS idx_user_projects_github ON user_projects(user_id, github_url);
 CREATE INDEX IF NOT EXISTS idx_gap_analysis_user ON skill_gap_analysis(user_id);
 CREATE INDEX IF NOT EXISTS idx_gap_analysis_date ON skill_gap_analysis(analysis_date DESC);
+CREATE INDEX IF NOT EXISTS idx_resume_jobs_hash ON resume_jobs(content_hash, target_role, analysis_version);
+CREATE INDEX IF NOT EXISTS idx_resume_jobs_status ON resume_jobs(status, created_at);
+CREATE INDEX IF NOT EXISTS idx_resume_cache_lru ON resume_cache(last_used_at);
+CREATE INDEX IF NOT EXISTS idx_github_http_cache_lru ON github_http_cache(last_used_at);
@@ -0,0 +1,158 @@
+"""Batched writes for the LinkedIn and GitHub importers.
+
+An `ImportWriter` collects the rows an import produces and writes each kind
+with a single `executemany`, all inside the caller's transaction. Conflicts
+are settled by the statements themselves (NOT EXISTS / guarded UPDATE)
+rather than by probing or catching errors row by row:
+
+- skills: new (skill, context) pairs are inserted; a pair already imported
+  from the same source gets the new confidence and evidence; anything else
+  (e.g. a manually entered skill) is left alone. A NULL context matches a
+  NULL context, as in skill_store, so these are matched with IS: the
+  UNIQUE constraint (and so ON CONFLICT) never fires for NULLs.
+  With `refresh_skills=False` existing pairs are never touched (used by
+  incremental imports, whose confidences cover only the changed repos).
+- courses: skipped when the user already has that course on that platform.
+- projects: skipped when the user already has a project with that URL.
+"""
+import json
+from typing import Dict, List, Optional, Tuple
+
+
+def _counts(inserted: int, updated: int, skipped: int) -> Dict[str, int]:
+    return {'inserted': inserted, 'updated': updated, 'skipped': skipped}
+
+
+def _valid_confidence(value) -> bool:
+    if value is None:
+        return True
+    try:
+        return 0.0 <= float(value) <= 1.0
+    except (TypeError, ValueError):
+        return False
+
+
+class ImportWriter:
+    """Stages imported skills, courses and projects for one user."""
+
+    def __init__(self, user_id: str, refresh_skills: bool = True):
+        self.user_id = user_id
+        self.refresh_skills = refresh_skills
+        self._skills: List[Tuple] = []
+        self._skill_keys = set()
+        self._courses: List[Tuple] = []
+        self._projects: List[Tuple] = []
+        # Rows dropped before writing (missing required fields, out-of-range
+        # confidence, repeats within the import); reported as skipped
+        self._rejected = {'skills': 0, 'courses': 0, 'projects': 0}
+
+    def add_skill(self, skill_name: str, sector_context: Optional[str], confidence, source: str,
+                  evidence, acquired_date=None) -> None:
+        if not skill_name or not _valid_confidence(confidence):
+            self._rejected['skills'] += 1
+            return
+        # The first entry for a (skill, context) pair wins, as it would row by row
+        key = (skill_name, sector_context)
+        if key in self._skill_keys:
+            self._rejected['skills'] += 1
+            return
+        self._skill_keys.add(key)
+        self._skills.append((
+            self.user_id, skill_name, sector_context, confidence,
+            source, acquired_date, json.dumps(evidence),
+        ))
+
+    def add_course(self, course_name: str, platform: Optional[str], sector: Optional[str],
+                   completion_date, skills_gained, certificate_url: Optional[str]) -> None:
+        if not course_name:
+            self._rejected['courses'] += 1
+            return
+        self._courses.append((
+            self.user_id, course_name, platform, sector, completion_date,
+            json.dumps(skills_gained), certificate_url,
+            self.user_id, course_name, platform,
+        ))
+
+    def add_project(self, project_name: str, description: Optional[str], sector: Optional[str],
+                    skills_used, github_url: str, date_completed) -> None:
+        if not project_name or not github_url:
+            self._rejected['projects'] += 1
+            return
+        self._projects.append((
+            self.user_id, project_name, description, sector,
+            json.dumps(skills_used), github_url, date_completed,
+            self.user_id, github_url,
+        ))
+
+    def _write_skills(self, conn) -> Dict[str, int]:
+        rejected = self._rejected['skills']
+        if not self._skills:
+            return _counts(0, 0, rejected)
+
+        # Refresh before inserting, so only rows that existed beforehand change
+        updated = 0
+        if self.refresh_skills:
+            updated = conn.executemany("""
+                UPDATE user_skills SET confidence = ?, evidence = ?
+                WHERE user_id = ? AND skill_name = ? AND sector_context IS ?
+                  AND source IS ?
+                  AND (confidence IS NOT ? OR evidence IS NOT ?)
+            """, [
+                (confidence, evidence, user_id, skill_name, sector_context, source, confidence, evidence)
+                for user_id, skill_name, sector_context, confidence, source, _date, evidence in self._skills
+            ]).rowcount
+        inserted = conn.executemany("""
+            INSERT INTO user_skills
+                (user_id, skill_name, sector_context, confidence, source, acquired_date, evidence)
+            SELECT ?, ?, ?, ?, ?, ?, ?
+            WHERE NOT EXISTS (
+                SELECT 1 FROM user_skills
+                WHERE user_id = ? AND skill_name = ? AND sector_context IS ?
+            )
+        """, [(*row, row[0], row[1], row[2]) for row in self._skills]).rowcount
+
+        # Rows duplicated by earlier imports are all refreshed; never report
+        # fewer than zero skipped entries for them
+        skipped = max(0, len(self._skills) - inserted - updated)
+        return _counts(inserted, updated, skipped + rejected)
+
+    def _write_courses(self, conn) -> Dict[str, int]:
+        rejected = self._rejected['courses']
+        if not self._courses:
+            return _counts(0, 0, rejected)
+        inserted = conn.executemany("""
+            INSERT INTO user_courses
+                (user_id, course_name, platform, sector, completion_date, skills_gained, certificate_url)
+            SELECT ?, ?, ?, ?, ?, ?, ?
+            WHERE NOT EXISTS (
+                SELECT 1 FROM user_courses
+                WHERE user_id = ? AND course_name = ? AND platform IS ?
+            )
+        """, self._courses).rowcount
+        return _counts(inserted, 0, len(self._courses) - inserted + rejected)
+
+    def _write_projects(self, conn) -> Dict[str, int]:
+        rejected = self._rejected['projects']
+        if not self._projects:
+            return _counts(0, 0, rejected)
+        inserted = conn.executemany("""
+            INSERT INTO user_projects
+                (user_id, project_name, description, sector, skills_used, github_url, date_completed)
+            SELECT ?, ?, ?, ?, ?, ?, ?
+            WHERE NOT EXISTS (
+                SELECT 1 FROM user_projects WHERE user_id = ? AND github_url = ?
+            )
+        """, self._projects).rowcount
+        return _counts(inserted, 0, len(self._projects) - inserted + rejected)
+
+    def write(self, conn) -> Dict[str, Dict[str, int]]:
+        """Write everything staged on `conn` (the caller commits).
+
+        Returns {kind: {inserted, updated, skipped}} for skills, courses
+        and projects.
+        """
+        return {
+            'skills': self._write_skills(conn),
+            'courses': self._write_courses(conn),
+            'projects': self._write_projects(conn),
+        }
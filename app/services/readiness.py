@@ -1,21 +1,105 @@
 from __future__ import annotations
 
-from typing import Dict, Iterable, Optional, Tuple
+from typing import Dict, Iterable, Optional, Tuple, Union
 
+# Requirements longer than this skip the substring index and scan instead
+_MAX_INDEXED_SUBSTRING = 48
 
-def _find_matching_confidence(required_skill: str, user_skills_dict: Dict[str, float]) -> Optional[float]:
-    required_lower = (required_skill or '').strip().lower()
-    if not required_lower:
-        return None
 
-    if required_lower in user_skills_dict:
-        return user_skills_dict[required_lower]
+class SkillMatchIndex:
+    """Precomputed lookup of a requirement's confidence in a user's skills.
 
-    for user_skill, confidence in user_skills_dict.items():
-        if required_lower in user_skill or user_skill in required_lower:
-            return confidence
+    A requirement matches the user skill with the same name, else the first
+    user skill (in dict order) that contains it or is contained in it.
+    Exact matches are a dict probe. Containment matches ("required in user
+    skill" or "user skill in required") are answered from a substring index
+    and a probe per user-skill length, and resolve to the same user skill the
+    linear scan would pick (the earliest one in dict order). Results are
+    memoized, so an index built once per request can be shared across every
+    role being scored.
+    """
 
-    return None
+    def __init__(self, user_skills_dict: Dict[str, float]):
+        self._skills = dict(user_skills_dict)
+        self._confidences = list(self._skills.values())
+        self._order: Dict[str, int] = {}
+        for i, name in enumerate(self._skills):
+            self._order.setdefault(name, i)
+        self._lengths = sorted({len(name) for name in self._skills})
+        self._contained_in: Optional[Dict[str, int]] = None
+        self._memo: Dict[str, Optional[float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+    @property
+    def skills(self) -> Dict[str, float]:
+        """The indexed user skills (lowercase name -> confidence), in match order."""
+        return self._skills
+
+    def _substring_index(self) -> Dict[str, int]:
+        # substring -> earliest user skill containing it; built on first use
+        if self._contained_in is None:
+            index: Dict[str, int] = {}
+            for name, i in self._order.items():
+                n = len(name)
+                for start in range(n):
+                    for end in range(start + 1, min(n, start + _MAX_INDEXED_SUBSTRING) + 1):
+                        sub = name[start:end]
+                        if sub not in index:
+                            index[sub] = i
+            self._contained_in = index
+        return self._contained_in
+
+    def _containment_match(self, required_lower: str) -> Optional[int]:
+        best: Optional[int] = None
+
+        # required in user_skill
+        if len(required_lower) <= _MAX_INDEXED_SUBSTRING:
+            best = self._substring_index().get(required_lower)
+        else:
+            for name, i in self._order.items():
+                if required_lower in name:
+                    best = i
+                    break
+
+        # user_skill in required
+        order = self._order
+        for length in self._lengths:
+            if length > len(required_lower):
+                break
+            for start in range(len(required_lower) - length + 1):
+                i = order.get(required_lower[start:start + length])
+                if i is not None and (best is None or i < best):
+                    best = i
+        return best
+
+    def lookup(self, required_skill: str) -> Optional[float]:
+        required_lower = (required_skill or '').strip().lower()
+        if not required_lower:
+            return None
+
+        if required_lower in self._memo:
+            return self._memo[required_lower]
+
+        if required_lower in self._skills:
+            confidence = self._skills[required_lower]
+        else:
+            i = self._containment_match(required_lower)
+            confidence = self._confidences[i] if i is not None else None
+
+        self._memo[required_lower] = confidence
+        return confidence
+
+
+UserSkills = Union[Dict[str, float], SkillMatchIndex]
+
+
+def as_match_index(user_skill_conf: UserSkills) -> SkillMatchIndex:
+    """Return `user_skill_conf` as a SkillMatchIndex (building one for plain dicts)."""
+    if isinstance(user_skill_conf, SkillMatchIndex):
+        return user_skill_conf
+    return SkillMatchIndex(user_skill_conf)
 
 
 def build_skill_conf_map_from_rows(rows: Iterable[dict]) -> Dict[str, float]:
@@ -56,7 +140,7 @@ def build_skill_conf_map_from_request(skills: Iterable[dict]) -> Dict[str, float
 
 def compute_role_readiness(
     role_requirements: dict,
-    user_skill_conf: Dict[str, float],
+    user_skill_conf: UserSkills,
     *,
     phases: Tuple[str, ...] = ('foundation', 'core', 'advanced', 'projects'),
     complete_threshold: float = 0.5,
@@ -70,12 +154,13 @@ def compute_role_readiness(
     Returns counts + readiness_score in [0, 100].
     """
 
+    index = as_match_index(user_skill_conf)
     complete = weak = missing = 0
 
     for phase in phases:
         skills = role_requirements.get(phase, []) or []
         for required_skill in skills:
-            c = _find_matching_confidence(str(required_skill), user_skill_conf)
+            c = index.lookup(str(required_skill))
             if c is None:
                 missing += 1
             elif c < complete_threshold:
@@ -97,19 +182,20 @@ def compute_role_readiness(
 
 def compute_core_fit(
     role_requirements: dict,
-    user_skill_conf: Dict[str, float],
+    user_skill_conf: UserSkills,
     *,
     phases: Tuple[str, ...] = ('foundation', 'core'),
     complete_threshold: float = 0.5,
 ) -> Dict[str, float]:
     """Compute fit as % of core skills satisfied (confidence >= threshold)."""
 
+    index = as_match_index(user_skill_conf)
     matched = total = 0
     for phase in phases:
         skills = role_requirements.get(phase, []) or []
         for required_skill in skills:
             total += 1
-            c = _find_matching_confidence(str(required_skill), user_skill_conf)
+            c = index.lookup(str(required_skill))
             if c is not None and c >= complete_threshold:
                 matched += 1
 
@@ -0,0 +1,215 @@
+"""In-process cache of the reference tables (roles, ontology, courses).
+
+The tables are loaded once into an immutable snapshot that every request
+shares. Changes are detected cheaply with ``PRAGMA data_version`` on a
+dedicated connection, confirmed against a trigger-maintained version row,
+and the snapshot is rebuilt and swapped in atomically.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from app.database import apply_schema, create_connection, ensure_schema
+from app.services.resume_analysis.course_index import CourseIndex
+from app.services.resume_analysis.ontology_matcher import OntologyMatcher
+from app.services.resume_analysis.role_resolver import RoleResolver
+
+
+
+@dataclass(frozen=True)
+class ReferenceData:
+    """Immutable snapshot of the reference tables."""
+
+    version: str
+    # role -> {'sector': str, phase -> tuple of skills}
+    roles: Mapping[str, Mapping[str, object]]
+    ontology: Tuple[str, ...]
+    # Content hash of `ontology`; unchanged by writes to the other tables
+    ontology_version: str
+    # skill -> tuple of {'platform', 'title', 'url'}
+    courses: Mapping[str, Tuple[Mapping[str, str], ...]]
+    course_index: CourseIndex
+    matcher: OntologyMatcher
+    role_resolver: RoleResolver
+
+
+def _existing_tables(conn) -> set:
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+    return {row[0] for row in rows}
+
+
+def _read_version(conn) -> str:
+    row = conn.execute('SELECT version FROM reference_data_version WHERE id = 1').fetchone()
+    schema_version = conn.execute('PRAGMA schema_version').fetchone()[0]
+    # schema_version catches tables that were dropped and re-created (which
+    # also drops their triggers) by the populate scripts.
+    return f"{row[0] if row else 0}.{schema_version}"
+
+
+def _load_roles_table(conn) -> Mapping[str, Mapping[str, object]]:
+    roles_data: Dict[str, Dict[str, object]] = {}
+    rows = conn.execute('SELECT role_name, category, skill, sector FROM roles ORDER BY id').fetchall()
+
+    for row in rows:
+        role = row['role_name']
+        category = row['category']
+        if role not in roles_data:
+            roles_data[role] = {'sector': row['sector']}
+        roles_data[role].setdefault(category, []).append(row['skill'])
+
+    return MappingProxyType({
+        role: MappingProxyType({
+            key: (tuple(value) if isinstance(value, list) else value)
+            for key, value in reqs.items()
+        })
+        for role, reqs in roles_data.items()
+    })
+
+
+def _load_ontology_table(conn) -> Tuple[str, ...]:
+    rows = conn.execute('SELECT skill FROM ontology ORDER BY id').fetchall()
+    return tuple(row['skill'] for row in rows)
+
+
+def _required_skills(roles: Mapping[str, Mapping[str, object]]) -> List[str]:
+    """Every skill listed in any phase of any role."""
+    return [
+        skill
+        for reqs in roles.values()
+        for value in reqs.values()
+        if isinstance(value, tuple)
+        for skill in value
+    ]
+
+
+def _ontology_version(ontology: Tuple[str, ...]) -> str:
+    return hashlib.sha256('\n'.join(ontology).encode('utf-8')).hexdigest()[:16]
+
+
+def _load_courses_table(conn) -> Mapping[str, Tuple[Mapping[str, str], ...]]:
+    courses_data: Dict[str, List[Mapping[str, str]]] = {}
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(courses)').fetchall()}
+    sector = 'sector' if 'sector' in columns else 'NULL AS sector'
+    rows = conn.execute(f'SELECT skill, platform, title, url, {sector} FROM courses ORDER BY id').fetchall()
+
+    for row in rows:
+        course = MappingProxyType({
+            'platform': row['platform'],
+            'title': row['title'],
+            'url': row['url'],
+            'sector': row['sector'],
+        })
+        courses_data.setdefault(row['skill'], []).append(course)
+
+    return MappingProxyType({skill: tuple(courses) for skill, courses in courses_data.items()})
+
+
+class ReferenceDataStore:
+    """Holds the current `ReferenceData` snapshot and refreshes it on change."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._conn = None
+        self._data_version: Optional[int] = None
+        self._snapshot: Optional[ReferenceData] = None
+
+    def _connection(self):
+        if self._conn is None:
+            # The version row and its triggers come with app/schema.sql
+            ensure_schema()
+            self._conn = create_connection()
+            self._data_version = None
+        return self._conn
+
+    def _build_snapshot(self, conn, version: str) -> ReferenceData:
+        tables = _existing_tables(conn)
+        roles = _load_roles_table(conn) if 'roles' in tables else MappingProxyType({})
+        ontology = _load_ontology_table(conn) if 'ontology' in tables else ()
+        courses = _load_courses_table(conn) if 'courses' in tables else MappingProxyType({})
+        ontology_version = _ontology_version(ontology)
+        # Writes to roles or courses keep the compiled automaton
+        previous = self._snapshot
+        if previous is not None and previous.ontology_version == ontology_version:
+            matcher = previous.matcher
+        else:
+            matcher = OntologyMatcher(ontology)
+        return ReferenceData(
+            version=version,
+            roles=roles,
+            ontology=ontology,
+            ontology_version=ontology_version,
+            courses=courses,
+            course_index=CourseIndex(courses, prefetch=_required_skills(roles)),
+            matcher=matcher,
+            role_resolver=RoleResolver(roles.keys()),
+        )
+
+    def get(self) -> ReferenceData:
+        with self._lock:
+            conn = self._connection()
+
+            # data_version only changes when another connection commits,
+            # so the common case is a single cheap pragma.
+            data_version = conn.execute('PRAGMA data_version').fetchone()[0]
+            if self._snapshot is not None and data_version == self._data_version:
+                return self._snapshot
+
+            version = _read_version(conn)
+            if self._snapshot is not None and version != self._snapshot.version:
+                if version.split('.')[1] != self._snapshot.version.split('.')[1]:
+                    # Tables may have been re-created without their triggers
+                    apply_schema(conn)
+
+            if self._snapshot is None or version != self._snapshot.version:
+                # Read version and tables inside one transaction so the
+                # snapshot never mixes rows from two different writes.
+                conn.execute('BEGIN')
+                try:
+                    version = _read_version(conn)
+                    snapshot = self._build_snapshot(conn, version)
+                finally:
+                    conn.commit()
+                self._snapshot = snapshot
+            self._data_version = data_version
+            return self._snapshot
+
+    def peek(self) -> Optional[ReferenceData]:
+        """The last loaded snapshot, or None; never touches the database."""
+        return self._snapshot
+
+    def reset_after_fork(self) -> None:
+        # Never reuse the parent's SQLite connection in a forked child
+        self._lock = threading.Lock()
+        self._conn = None
+        self._data_version = None
+
+    def invalidate(self) -> None:
+        """Force a reload on the next access."""
+        with self._lock:
+            self._snapshot = None
+            self._data_version = None
+
+
+_store = ReferenceDataStore()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_store.reset_after_fork)
+
+
+def get_reference_data() -> ReferenceData:
+    """Return the current reference-data snapshot (reloaded only when the tables change)."""
+    return _store.get()
+
+
+def peek_reference_data() -> Optional[ReferenceData]:
+    """The last loaded snapshot, without checking the database for changes."""
+    return _store.peek()
+
+
+def invalidate_reference_data() -> None:
+    _store.invalidate()
@@ -0,0 +1,168 @@
+"""Content-addressed cache of resume extraction results.
+
+Entries are keyed by the SHA-256 of the uploaded bytes, the file type and
+the ontology version, so an identical re-upload (or /extract followed by
+/analyze) skips text extraction, skill extraction and scoring. Entries live
+in the `resume_cache` table and are evicted least-recently-used once the
+entry or byte budget is exceeded.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+from app.database import ensure_schema, get_db_connection
+from app.services.reference_data import get_reference_data
+from app.services.resume_analysis.extractor import DocumentSource
+from app.services.resume_analysis.models import models_signature
+
+# Bump when extraction/scoring output changes so old entries stop matching
+CACHE_FORMAT = 1
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+
+def _cache_enabled() -> bool:
+    return os.getenv('RESUME_CACHE_ENABLED', 'true').strip().lower() not in ('0', 'false', 'no')
+
+
+def _max_entries() -> int:
+    try:
+        return int(os.getenv('RESUME_CACHE_MAX_ENTRIES', '1000'))
+    except Exception:
+        return 1000
+
+
+def _max_bytes() -> int:
+    try:
+        return int(os.getenv('RESUME_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+    except Exception:
+        return 64 * 1024 * 1024
+
+
+def _count(name: str, n: int = 1) -> None:
+    with _stats_lock:
+        _stats[name] += n
+
+
+def content_digest(source: DocumentSource) -> str:
+    """SHA-256 of the document, read incrementally for file-like sources."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(source).hexdigest()
+    digest = hashlib.sha256()
+    source.seek(0)
+    for block in iter(lambda: source.read(1024 * 1024), b''):
+        digest.update(block)
+    source.seek(0)
+    return digest.hexdigest()
+
+
+def cache_key(content: DocumentSource, filename: str, content_hash: Optional[str] = None) -> str:
+    """Key for `content`; changes whenever the ontology or the enabled NLP models change."""
+    content_hash = content_hash or content_digest(content)
+    extension = os.path.splitext(filename or '')[1].lower()
+    version = f"{CACHE_FORMAT}.{get_reference_data().ontology_version}.{models_signature()}"
+    return f"{content_hash}:{extension}:{version}"
+
+
+def get_cached_analysis(key: str) -> Optional[Dict]:
+    """Return the cached analysis for `key`, or None."""
+    if not _cache_enabled():
+        return None
+    ensure_schema()
+    conn = get_db_connection(private=True)
+    try:
+        row = conn.execute('SELECT * FROM resume_cache WHERE cache_key = ?', (key,)).fetchone()
+        if row is None:
+            _count('misses')
+            return None
+        conn.execute('UPDATE resume_cache SET last_used_at = ? WHERE cache_key = ?', (time.time(), key))
+        conn.commit()
+    finally:
+        conn.close()
+
+    _count('hits')
+    return {
+        "raw_text": zlib.decompress(row['raw_text']).decode('utf-8'),
+        "normalized_text": zlib.decompress(row['normalized_text']).decode('utf-8'),
+        "extracted_skills": json.loads(row['extracted_skills']),
+        "skills": json.loads(row['skills']),
+    }
+
+
+def store_analysis(key: str, analysis: Dict) -> None:
+    """Cache `analysis` (raw_text, normalized_text, extracted_skills, skills) under `key`."""
+    if not _cache_enabled():
+        return
+    ensure_schema()
+    raw_blob = zlib.compress(analysis['raw_text'].encode('utf-8'))
+    normalized_blob = zlib.compress(analysis['normalized_text'].encode('utf-8'))
+    extracted = json.dumps(analysis['extracted_skills'])
+    skills = json.dumps(analysis['skills'])
+    size = len(raw_blob) + len(normalized_blob) + len(extracted) + len(skills)
+
+    conn = get_db_connection(private=True)
+    try:
+        conn.execute("""
+            INSERT OR REPLACE INTO resume_cache
+                (cache_key, raw_text, normalized_text, extracted_skills, skills, size_bytes, last_used_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (key, raw_blob, normalized_blob, extracted, skills, size, time.time()))
+        evicted = _evict(conn)
+        conn.commit()
+    finally:
+        conn.close()
+
+    _count('stores')
+    if evicted:
+        _count('evictions', evicted)
+
+
+def _evict(conn) -> int:
+    entries, total_bytes = conn.execute(
+        'SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM resume_cache'
+    ).fetchone()
+    max_entries = _max_entries()
+    max_bytes = _max_bytes()
+    if entries <= max_entries and total_bytes <= max_bytes:
+        return 0
+
+    evicted = 0
+    rows = conn.execute('SELECT cache_key, size_bytes FROM resume_cache ORDER BY last_used_at').fetchall()
+    doomed = []
+    for row in rows:
+        if entries <= max_entries and total_bytes <= max_bytes:
+            break
+        doomed.append((row['cache_key'],))
+        entries -= 1
+        total_bytes -= row['size_bytes']
+        evicted += 1
+    conn.executemany('DELETE FROM resume_cache WHERE cache_key = ?', doomed)
+    return evicted
+
+
+def resume_cache_stats() -> Dict:
+    with _stats_lock:
+        stats = dict(_stats)
+    if not _cache_enabled():
+        return {**stats, 'enabled': False}
+    ensure_schema()
+    conn = get_db_connection(private=True)
+    try:
+        entries, total_bytes = conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM resume_cache'
+        ).fetchone()
+    finally:
+        conn.close()
+    return {
+        **stats,
+        'enabled': True,
+        'entries': entries,
+        'bytes': total_bytes,
+        'max_entries': _max_entries(),
+        'max_bytes': _max_bytes(),
+    }
@@ -0,0 +1,88 @@
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from app.models.schemas import Course
+from app.services.resume_analysis.ontology_matcher import FirstContainmentIndex
+
+
+def _cache_size() -> int:
+    try:
+        return int(os.getenv('COURSE_INDEX_CACHE_SIZE', '4096'))
+    except Exception:
+        return 4096
+
+
+class CourseIndex:
+    """Course lookup for roadmap skills, built once per reference-data version.
+
+    A skill gets the courses stored under its lowercased name, or else those
+    of the first course skill (in table order) that contains it or is
+    contained in it. Results are tuples of shared, frozen `Course` records.
+    Lookups for `prefetch` names (the role requirements) are resolved up
+    front; anything else is memoized on first use.
+
+    `courses_for` and `course_for_sector` serve exact-name lookups (the
+    pathway tree and gap analysis) from the same records.
+    """
+
+    def __init__(
+        self,
+        courses_data: Mapping[str, Iterable[Mapping[str, str]]],
+        prefetch: Iterable[str] = (),
+    ):
+        self._records: Dict[str, Tuple[Course, ...]] = {
+            skill: tuple(
+                Course(platform=course['platform'], title=course['title'], url=course['url'])
+                for course in courses
+            )
+            for skill, courses in courses_data.items()
+        }
+        self._containment = FirstContainmentIndex(self._records.keys())
+
+        # Stripped, lowercased course skill -> (course, sector) in table order
+        self._by_key: Dict[str, List[Tuple[Course, Optional[str]]]] = {}
+        for skill, records in self._records.items():
+            sectors = [course.get('sector') for course in courses_data[skill]]
+            self._by_key.setdefault(skill.strip().lower(), []).extend(zip(records, sectors))
+
+        self._resolved: Dict[str, Optional[Tuple[Course, ...]]] = {}
+        for name in prefetch:
+            skill_lower = name.lower()
+            if skill_lower not in self._resolved:
+                self._resolved[skill_lower] = self._resolve(skill_lower)
+        self._resolve_cached = lru_cache(maxsize=_cache_size())(self._resolve)
+
+    def _resolve(self, skill_lower: str) -> Optional[Tuple[Course, ...]]:
+        records = self._records.get(skill_lower)
+        if records is not None:
+            return records
+        key = self._containment.first(skill_lower)
+        return self._records[key] if key is not None else None
+
+    def lookup(self, skill_name: str) -> Optional[Tuple[Course, ...]]:
+        """Courses for a skill, or None when no course skill matches."""
+        skill_lower = skill_name.lower()
+        try:
+            return self._resolved[skill_lower]
+        except KeyError:
+            return self._resolve_cached(skill_lower)
+
+    def _exact(self, skill_name: str) -> List[Tuple[Course, Optional[str]]]:
+        return self._by_key.get(str(skill_name or '').strip().lower(), [])
+
+    def courses_for(self, skill_name: str, limit: int = 2) -> Tuple[Course, ...]:
+        """The first `limit` courses stored under exactly this skill name (case and surrounding space ignored)."""
+        return tuple(course for course, _sector in self._exact(skill_name)[:limit])
+
+    def course_for_sector(self, skill_name: str, sector: Optional[str]) -> Optional[Course]:
+        """First course for exactly this skill that suits `sector`, else its first course.
+
+        A course suits every sector when its own sector is unset or "Technology".
+        """
+        candidates = self._exact(skill_name)
+        sector_lower = sector.lower() if sector is not None else None
+        for course, course_sector in candidates:
+            if course_sector is None or course_sector == 'Technology' or course_sector.lower() == sector_lower:
+                return course
+        return candidates[0][0] if candidates else None
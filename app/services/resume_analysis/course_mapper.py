@@ -1,52 +1,37 @@
-import json
-import os
-from typing import List, Dict
-from app.models.schemas import RoadmapPhase, RoadmapSkill, Course
+from typing import Dict, Iterable, List
+from app.models.schemas import RoadmapPhase
 
-from app.database import get_db_connection
+from app.services.reference_data import get_reference_data
 
-def _load_courses() -> Dict:
-    conn = get_db_connection()
-    courses_data = {}
-    try:
-        # Structure: skill -> list of course dicts
-        rows = conn.execute('SELECT skill, platform, title, url FROM courses').fetchall()
-        
-        for row in rows:
-            skill = row['skill']
-            course = {
-                "platform": row['platform'],
-                "title": row['title'],
-                "url": row['url']
-            }
-            
-            if skill not in courses_data:
-                courses_data[skill] = []
-            courses_data[skill].append(course)
-            
-    finally:
-        conn.close()
-    return courses_data
+def skill_key(skill: str) -> str:
+    """Normalized skill name that exact course lookups match on."""
+    return str(skill or '').strip().lower()
+
+def get_courses_for_skills(skills: Iterable[str], limit: int = 2) -> Dict[str, List[Dict[str, str]]]:
+    """Up to `limit` courses stored under exactly each skill's name.
+
+    Returns skill_key -> list of {platform, title, url}; skills without
+    courses map to an empty list. Served from the reference-data
+    CourseIndex, like every other course lookup.
+    """
+    course_index = get_reference_data().course_index
+    result: Dict[str, List[Dict[str, str]]] = {}
+    for skill in skills:
+        key = skill_key(skill)
+        if key and key not in result:
+            result[key] = [
+                {'platform': course.platform, 'title': course.title, 'url': course.url}
+                for course in course_index.courses_for(key, limit)
+            ]
+    return result
 
 def map_courses_to_skills(roadmap_phases: List[RoadmapPhase]) -> List[RoadmapPhase]:
-    courses_data = _load_courses()
+    course_index = get_reference_data().course_index
     
     for phase in roadmap_phases:
         for skill in phase.skills:
-            skill_lower = skill.name.lower()
-            if skill_lower in courses_data:
-                course_list = courses_data[skill_lower]
-                skill.courses = [
-                    Course(platform=course["platform"], title=course["title"], url=course["url"])
-                    for course in course_list
-                ]
-            else:
-                for key, course_list in courses_data.items():
-                    if key in skill_lower or skill_lower in key:
-                        skill.courses = [
-                            Course(platform=course["platform"], title=course["title"], url=course["url"])
-                            for course in course_list
-                        ]
-                        break
+            courses = course_index.lookup(skill.name)
+            if courses is not None:
+                skill.courses = list(courses)
     
     return roadmap_phases
@@ -1,8 +1,115 @@
+import os
+import shutil
+import tempfile
+import time
+from contextlib import closing, contextmanager
 import pdfplumber
 from docx import Document
 from io import BytesIO
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Union
 
-def extract_text(content: bytes, filename: str) -> str:
+try:
+    import pypdfium2 as pdfium
+    pdfium_available = True
+except Exception:
+    pdfium_available = False
+
+PDF_BACKENDS = ('pdfplumber', 'pdfium')
+
+# Share of the PDF time budget layout analysis may use before the remaining
+# pages fall back to the pypdfium2 text layer
+_LAYOUT_BUDGET_SHARE = 0.75
+
+# Set in resume pool workers by the pool initializer (see mark_pool_worker)
+_in_pool_worker = False
+
+# Raw bytes, or a seekable binary file such as the upload's spooled temp file.
+# File-like sources are read in place instead of being copied into memory.
+DocumentSource = Union[bytes, bytearray, memoryview, BinaryIO]
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def _pdf_max_pages() -> int:
+    return _env_int('PDF_MAX_PAGES', 100)
+
+
+def _pdf_max_chars() -> int:
+    return _env_int('PDF_MAX_CHARS', 500000)
+
+
+def _pdf_time_budget() -> float:
+    try:
+        return float(os.getenv('PDF_TIME_BUDGET_SECONDS', '20'))
+    except Exception:
+        return 20.0
+
+
+def _pdf_parallel_min_pages() -> int:
+    return _env_int('PDF_PARALLEL_MIN_PAGES', 24)
+
+
+def _pdf_backend() -> str:
+    backend = os.getenv('PDF_BACKEND', 'pdfplumber').strip().lower()
+    if backend == 'pdfium' and not pdfium_available:
+        return 'pdfplumber'
+    return backend if backend in PDF_BACKENDS else 'pdfplumber'
+
+
+def _is_bytes(source: DocumentSource) -> bool:
+    return isinstance(source, (bytes, bytearray, memoryview))
+
+
+def _open_input(source: Union[DocumentSource, str]):
+    """A path, or a readable stream positioned at the start of `source`."""
+    if isinstance(source, str):
+        return source
+    if _is_bytes(source):
+        return BytesIO(source)
+    source.seek(0)
+    return source
+
+
+def _pdfium_input(source: Union[DocumentSource, str]):
+    if isinstance(source, (bytes, str)):
+        return source
+    if _is_bytes(source):
+        return bytes(source)
+    source.seek(0)
+    return source
+
+
+@contextmanager
+def _document_path(content: DocumentSource) -> Iterator[str]:
+    """A path on disk holding `content`, for worker processes to open.
+
+    Files that already live on disk (an upload spooled by the job queue)
+    are used as they are; anything else is copied to a temporary file for
+    the duration of the block.
+    """
+    name = getattr(content, 'name', None)
+    if isinstance(name, str) and os.path.isfile(name):
+        yield name
+        return
+    fd, path = tempfile.mkstemp(suffix='.pdf')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            if _is_bytes(content):
+                f.write(content)
+            else:
+                content.seek(0)
+                shutil.copyfileobj(content, f)
+        yield path
+    finally:
+        os.remove(path)
+
+
+def extract_text(content: DocumentSource, filename: str) -> str:
     if filename.lower().endswith('.pdf'):
         return extract_pdf(content)
     elif filename.lower().endswith('.docx'):
@@ -10,17 +117,193 @@ def extract_text(content: bytes, filename: str) -> str:
     else:
         raise ValueError("Unsupported file format")
 
-def extract_pdf(content: bytes) -> str:
+
+def _open_pdf(content: Union[DocumentSource, str], backend: str):
+    if backend == 'pdfium':
+        return pdfium.PdfDocument(_pdfium_input(content))
+    return pdfplumber.open(_open_input(content))
+
+
+def _page_count(pdf) -> int:
+    return len(pdf.pages) if isinstance(pdf, pdfplumber.PDF) else len(pdf)
+
+
+def _past(deadline: Optional[float]) -> bool:
+    return deadline is not None and time.monotonic() > deadline
+
+
+def _pdfplumber_pages(pdf, start: int, stop: int) -> Iterator[str]:
+    for page in pdf.pages[start:stop]:
+        try:
+            yield page.extract_text() or ''
+        finally:
+            # Drop the page's parsed layout objects as soon as we are done
+            # (Page.close() only exists in newer pdfplumber releases)
+            close = getattr(page, 'close', None) or getattr(page, 'flush_cache', None)
+            if close is not None:
+                close()
+
+
+def _pdfium_pages(pdf, start: int, stop: int, deadline: Optional[float]) -> Iterator[str]:
+    for index in range(start, min(stop, len(pdf))):
+        if _past(deadline):
+            return
+        page = pdf[index]
+        textpage = page.get_textpage()
+        try:
+            text = textpage.get_text_range()
+        finally:
+            textpage.close()
+            page.close()
+        yield text.replace('\r\n', '\n').replace('\r', '\n').strip()
+
+
+def _iter_open_pdf(
+    pdf,
+    content: Union[DocumentSource, str],
+    start: int,
+    stop: int,
+    deadline: Optional[float],
+) -> Iterator[str]:
+    """iter_pdf_pages over a document `_open_pdf` already opened."""
+    if not isinstance(pdf, pdfplumber.PDF):
+        yield from _pdfium_pages(pdf, start, stop, deadline)
+        return
+
+    # Layout analysis gets the first part of the budget, so the text-layer
+    # fallback still has time left for the pages it did not reach
+    layout_deadline = deadline
+    if deadline is not None and pdfium_available:
+        now = time.monotonic()
+        layout_deadline = now + max(0.0, deadline - now) * _LAYOUT_BUDGET_SHARE
+
+    index = start
+    pages = _pdfplumber_pages(pdf, start, stop)
+    try:
+        for text in pages:
+            yield text
+            index += 1
+            if _past(layout_deadline):
+                break
+        else:
+            return
+    finally:
+        pages.close()
+
+    if pdfium_available and index < stop and not _past(deadline):
+        fallback = pdfium.PdfDocument(_pdfium_input(content))
+        try:
+            yield from _pdfium_pages(fallback, index, stop, deadline)
+        finally:
+            fallback.close()
+
+
+def iter_pdf_pages(
+    content: Union[DocumentSource, str],
+    start: int = 0,
+    stop: Optional[int] = None,
+    backend: Optional[str] = None,
+    deadline: Optional[float] = None,
+) -> Iterator[str]:
+    """Yield the text of pages [start, stop) one page at a time.
+
+    `content` may also be a path. Layout analysis (pdfplumber) is used for
+    the first three quarters of the time left before `deadline` (a
+    time.monotonic() value); the remaining pages are then read from the
+    text layer only (pypdfium2) until the deadline. Without pypdfium2,
+    layout analysis runs until the deadline and later pages are skipped.
+    """
+    stop = _pdf_max_pages() if stop is None else stop
+    pdf = _open_pdf(content, backend or _pdf_backend())
+    try:
+        yield from _iter_open_pdf(pdf, content, start, stop, deadline)
+    finally:
+        pdf.close()
+
+
+def _extract_pdf_range(path: str, start: int, stop: int, backend: str, deadline_seconds: float) -> List[str]:
+    deadline = time.monotonic() + deadline_seconds
+    return list(iter_pdf_pages(path, start, stop, backend, deadline))
+
+
+def mark_pool_worker() -> None:
+    """ProcessPoolExecutor initializer for the resume worker pool.
+
+    A worker that submitted page ranges to its own pool would wait on
+    futures that only it could run, so workers extract pages inline.
+    """
+    global _in_pool_worker
+    _in_pool_worker = True
+
+
+def _parallel_pdf_pages(content: DocumentSource, page_count: int, backend: str) -> Optional[List[str]]:
+    """Split a long PDF into page ranges across the resume worker pool."""
+    if _in_pool_worker:
+        # Already inside a pool worker; pools cannot nest
+        return None
+    # Imported here: the pipeline module imports this one
+    from app.services.resume_analysis.pipeline import get_process_pool
+    pool = get_process_pool()
+    if pool is None:
+        return None
+
+    workers = max(1, getattr(pool, '_max_workers', 1))
+    per_range = -(-page_count // workers)
+    # Workers open the document from disk rather than receiving its bytes
+    with _document_path(content) as path:
+        futures = [
+            pool.submit(_extract_pdf_range, path, start, min(start + per_range, page_count),
+                        backend, _pdf_time_budget())
+            for start in range(0, page_count, per_range)
+        ]
+        pages: List[str] = []
+        for future in futures:
+            pages.extend(future.result())
+    return pages
+
+
+def _join_pages(pages: Iterable[str], max_chars: int) -> str:
     text_parts = []
-    with pdfplumber.open(BytesIO(content)) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text_parts.append(page_text)
+    total_chars = 0
+    for page_text in pages:
+        if not page_text:
+            continue
+        if total_chars + len(page_text) > max_chars:
+            if max_chars > total_chars:
+                text_parts.append(page_text[:max_chars - total_chars])
+            break
+        text_parts.append(page_text)
+        total_chars += len(page_text) + 1
     return "\n".join(text_parts)
 
-def extract_docx(content: bytes) -> str:
-    doc = Document(BytesIO(content))
+
+def extract_pdf(content: DocumentSource) -> str:
+    """Text of a PDF within the configured page, time and character budgets.
+
+    PDF_MAX_PAGES, PDF_TIME_BUDGET_SECONDS and PDF_MAX_CHARS bound the work
+    a single upload can cause; long documents (PDF_PARALLEL_MIN_PAGES and
+    up) are split into page ranges across the resume worker pool.
+    """
+    max_chars = _pdf_max_chars()
+    backend = _pdf_backend()
+
+    # One open serves both the page count and, when not split, the pages
+    pdf = _open_pdf(content, backend)
+    try:
+        page_count = min(_page_count(pdf), _pdf_max_pages())
+        if page_count >= _pdf_parallel_min_pages():
+            pages = _parallel_pdf_pages(content, page_count, backend)
+            if pages is not None:
+                return _join_pages(pages, max_chars)
+        deadline = time.monotonic() + _pdf_time_budget()
+        with closing(_iter_open_pdf(pdf, content, 0, page_count, deadline)) as pages:
+            return _join_pages(pages, max_chars)
+    finally:
+        pdf.close()
+
+
+def extract_docx(content: DocumentSource) -> str:
+    doc = Document(_open_input(content))
     text_parts = []
     for paragraph in doc.paragraphs:
         if paragraph.text.strip():
@@ -0,0 +1,419 @@
+"""Asynchronous resume analysis jobs.
+
+`/api/resume/analyze` can hand an upload off to this queue instead of
+running the pipeline inside the request. The upload is spooled to disk, a
+`resume_jobs` row records its state, and a background dispatcher runs queued
+jobs on a small thread pool (which in turn uses the resume process pool for
+the CPU-heavy extraction). Clients poll `/api/resume/jobs/<job_id>`. The
+dispatcher starts with the first submit or status poll, so jobs queued
+before a restart are picked up again.
+
+A running job records its owner (host:pid) and a heartbeat the owner keeps
+refreshing. Only jobs whose heartbeat has gone stale, or whose owner on this
+host has exited, are put back in the queue; a run only records its outcome
+if the job is still the one it claimed.
+"""
+import hashlib
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+from app.database import create_connection, ensure_schema, get_db_connection
+from app.services.reference_data import get_reference_data
+from app.services.resume_analysis.extractor import DocumentSource
+from app.services.resume_analysis.models import models_signature
+from app.services.resume_analysis.pipeline import (
+    analyze_document_file,
+    build_roadmap_response,
+    get_process_pool,
+)
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_SUCCEEDED = 'succeeded'
+STATUS_FAILED = 'failed'
+
+# Jobs in these states are reused when the same file/role is submitted again
+_REUSABLE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING, STATUS_SUCCEEDED)
+
+# _claim_next outcomes
+CLAIM_OK = 'claimed'
+CLAIM_EMPTY = 'empty'  # nothing queued
+CLAIM_LOST = 'lost'  # another dispatcher claimed it first
+
+
+def _job_workers() -> int:
+    try:
+        return max(1, int(os.getenv('RESUME_JOB_WORKERS', '2')))
+    except Exception:
+        return 2
+
+
+def _stale_seconds() -> int:
+    try:
+        return int(os.getenv('RESUME_JOB_STALE_SECONDS', '600'))
+    except Exception:
+        return 600
+
+
+def _heartbeat_seconds() -> float:
+    # Several beats fit in the stale window, so one slow beat is harmless
+    return max(1.0, _stale_seconds() / 4)
+
+
+def _owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _owner_alive(owner: Optional[str]) -> bool:
+    """False only when `owner` is a process on this host that has exited."""
+    host, _, pid = (owner or '').rpartition(':')
+    if host != socket.gethostname() or not pid.isdigit():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+def _spool_dir() -> str:
+    path = os.getenv('RESUME_JOB_SPOOL_DIR', '').strip()
+    if not path:
+        path = os.path.join(tempfile.gettempdir(), 'skillgenome_resume_jobs')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _analysis_version() -> str:
+    """Changes whenever a finished job's result could: roles, courses, ontology or NLP models."""
+    return f"{get_reference_data().version}.{models_signature()}"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _seconds_between(start: Optional[str], end: Optional[str]) -> Optional[float]:
+    if not start or not end:
+        return None
+    try:
+        return (datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds()
+    except ValueError:
+        return None
+
+
+def _row_to_job(row) -> Dict:
+    job = {
+        "job_id": row["job_id"],
+        "status": row["status"],
+        "filename": row["filename"],
+        "target_role": row["target_role"],
+        "created_at": row["created_at"],
+        "started_at": row["started_at"],
+        "finished_at": row["finished_at"],
+    }
+    if row["timings"]:
+        job["timings"] = json.loads(row["timings"])
+    if row["status"] == STATUS_SUCCEEDED and row["result"]:
+        job["result"] = json.loads(row["result"])
+    if row["status"] == STATUS_FAILED:
+        job["error"] = row["error"]
+    return job
+
+
+class ResumeJobQueue:
+    """SQLite-backed job queue with an in-process dispatcher."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[threading.Semaphore] = None
+        # job_id -> started_at for the jobs this process is running
+        self._running: Dict[str, str] = {}
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._dispatcher is not None and self._dispatcher.is_alive():
+                return
+            ensure_schema()
+            workers = _job_workers()
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='resume-job')
+            self._slots = threading.Semaphore(workers)
+            self._stop = threading.Event()
+            self._dispatcher = threading.Thread(
+                target=self._dispatch_loop, name='resume-job-dispatcher', daemon=True
+            )
+            self._dispatcher.start()
+
+    def shutdown(self) -> None:
+        """Stop the dispatcher and wait for running jobs; the next submit or get restarts it."""
+        with self._lock:
+            dispatcher, executor = self._dispatcher, self._executor
+            self._dispatcher = self._executor = None
+            self._stop.set()
+        self._wakeup.set()
+        if dispatcher is not None:
+            dispatcher.join()
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _spool(self, content: DocumentSource, job_id: str) -> Tuple[str, str]:
+        """Write `content` to the spool directory, hashing it on the way.
+
+        Returns (payload path, sha256). File-like sources are copied in
+        blocks so the upload is never held in memory as a whole.
+        """
+        payload_path = os.path.join(_spool_dir(), job_id)
+        digest = hashlib.sha256()
+        with open(payload_path, 'wb') as f:
+            if isinstance(content, (bytes, bytearray, memoryview)):
+                digest.update(content)
+                f.write(content)
+            else:
+                content.seek(0)
+                for block in iter(lambda: content.read(1024 * 1024), b''):
+                    digest.update(block)
+                    f.write(block)
+        return payload_path, digest.hexdigest()
+
+    def submit(self, content: DocumentSource, filename: str, target_role: str) -> Dict:
+        """Queue `content` for analysis, or return the existing job for the same file and role."""
+        self._start()
+        job_id = str(uuid.uuid4())
+        payload_path, content_hash = self._spool(content, job_id)
+
+        analysis_version = _analysis_version()
+
+        # Commits on its own, so not on the request's shared connection
+        conn = get_db_connection(private=True)
+        try:
+            # The write lock makes check-then-insert atomic, so concurrent
+            # identical uploads (from any thread or process) share one job
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                placeholders = ','.join('?' * len(_REUSABLE_STATUSES))
+                existing = conn.execute(f"""
+                    SELECT * FROM resume_jobs
+                    WHERE content_hash = ? AND target_role = ? AND analysis_version = ?
+                      AND status IN ({placeholders})
+                    ORDER BY created_at DESC LIMIT 1
+                """, (content_hash, target_role, analysis_version, *_REUSABLE_STATUSES)).fetchone()
+                if existing:
+                    conn.rollback()
+                    os.remove(payload_path)
+                    return _row_to_job(existing)
+
+                created_at = _now()
+                conn.execute("""
+                    INSERT INTO resume_jobs
+                        (job_id, content_hash, filename, target_role, analysis_version,
+                         status, payload_path, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (job_id, content_hash, filename, target_role, analysis_version,
+                      STATUS_QUEUED, payload_path, created_at))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                if os.path.exists(payload_path):
+                    os.remove(payload_path)
+                raise
+        finally:
+            conn.close()
+
+        self._wakeup.set()
+        return {
+            "job_id": job_id,
+            "status": STATUS_QUEUED,
+            "filename": filename,
+            "target_role": target_role,
+            "created_at": created_at,
+            "started_at": None,
+            "finished_at": None,
+        }
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        self._start()
+        conn = get_db_connection()
+        try:
+            row = conn.execute('SELECT * FROM resume_jobs WHERE job_id = ?', (job_id,)).fetchone()
+        finally:
+            conn.close()
+        return _row_to_job(row) if row else None
+
+    def _heartbeat(self, conn) -> None:
+        with self._lock:
+            running = list(self._running.items())
+        if not running:
+            return
+        now = _now()
+        conn.executemany("""
+            UPDATE resume_jobs SET heartbeat_at = ?
+            WHERE job_id = ? AND status = ? AND started_at = ?
+        """, [(now, job_id, STATUS_RUNNING, started_at) for job_id, started_at in running])
+        conn.commit()
+
+    def _requeue_stale(self, conn) -> None:
+        cutoff = (datetime.now(timezone.utc) - timedelta(seconds=_stale_seconds())).isoformat()
+        with self._lock:
+            ours = set(self._running)
+        rows = conn.execute("""
+            SELECT job_id, owner, started_at, heartbeat_at FROM resume_jobs WHERE status = ?
+        """, (STATUS_RUNNING,)).fetchall()
+        stale = [
+            (STATUS_QUEUED, row['job_id'], STATUS_RUNNING, row['started_at'])
+            for row in rows
+            if row['job_id'] not in ours
+            and ((row['heartbeat_at'] or row['started_at'] or '') < cutoff or not _owner_alive(row['owner']))
+        ]
+        if not stale:
+            return
+        # Guarded on started_at: a job re-claimed in the meantime is left alone
+        conn.executemany("""
+            UPDATE resume_jobs SET status = ?, started_at = NULL, owner = NULL, heartbeat_at = NULL
+            WHERE job_id = ? AND status = ? AND started_at IS ?
+        """, stale)
+        conn.commit()
+
+    def _claim_next(self, conn) -> Tuple[str, Optional[Dict]]:
+        """(CLAIM_OK, job), or (CLAIM_EMPTY / CLAIM_LOST, None)."""
+        row = conn.execute("""
+            SELECT job_id FROM resume_jobs WHERE status = ?
+            ORDER BY created_at LIMIT 1
+        """, (STATUS_QUEUED,)).fetchone()
+        if not row:
+            return CLAIM_EMPTY, None
+        # Guarded update so a job is only ever claimed by one dispatcher
+        now = _now()
+        claimed = conn.execute("""
+            UPDATE resume_jobs SET status = ?, started_at = ?, owner = ?, heartbeat_at = ?
+            WHERE job_id = ? AND status = ?
+        """, (STATUS_RUNNING, now, _owner(), now, row['job_id'], STATUS_QUEUED))
+        conn.commit()
+        if claimed.rowcount != 1:
+            return CLAIM_LOST, None
+        job = dict(conn.execute('SELECT * FROM resume_jobs WHERE job_id = ?', (row['job_id'],)).fetchone())
+        with self._lock:
+            self._running[job['job_id']] = job['started_at']
+        return CLAIM_OK, job
+
+    def _dispatch_loop(self) -> None:
+        stop = self._stop
+        conn = create_connection()
+        last_stale_check = last_heartbeat = 0.0
+        while not stop.is_set():
+            try:
+                # Beats keep going while every slot is busy: the slot wait
+                # below times out
+                if time.monotonic() - last_heartbeat > _heartbeat_seconds():
+                    self._heartbeat(conn)
+                    last_heartbeat = time.monotonic()
+                if time.monotonic() - last_stale_check > 60:
+                    self._requeue_stale(conn)
+                    last_stale_check = time.monotonic()
+
+                if not self._slots.acquire(timeout=5):
+                    continue
+                outcome, job = self._claim_next(conn)
+                if outcome == CLAIM_EMPTY:
+                    self._slots.release()
+                    self._wakeup.wait(timeout=5)
+                    self._wakeup.clear()
+                    continue
+                if outcome == CLAIM_LOST:
+                    self._slots.release()
+                    continue
+                self._executor.submit(self._run_job, job)
+            except Exception as e:
+                print(f"Resume job dispatcher error: {e}")
+                stop.wait(1)
+        conn.close()
+
+    def _run_job(self, job: Dict) -> None:
+        timings: Dict[str, float] = {}
+        queue_wait = _seconds_between(job['created_at'], job['started_at'])
+        if queue_wait is not None:
+            timings['queue_wait'] = round(queue_wait, 4)
+
+        status, result, error = STATUS_FAILED, None, None
+        try:
+            # Workers read the spooled payload themselves
+            pool = get_process_pool()
+            if pool is None:
+                analysis = analyze_document_file(job['payload_path'], job['filename'])
+            else:
+                analysis = pool.submit(analyze_document_file, job['payload_path'], job['filename']).result()
+            timings.update(analysis.get('timings', {}))
+
+            if 'error' in analysis:
+                error = analysis['error']
+            else:
+                started = time.perf_counter()
+                roadmap = build_roadmap_response(analysis['skills'], job['target_role'])
+                timings['roadmap'] = round(time.perf_counter() - started, 4)
+                result = {"skills": analysis['skills'], "roadmap": roadmap}
+                status = STATUS_SUCCEEDED
+        except Exception as e:
+            error = str(e)
+        finally:
+            try:
+                self._finish(job, status, result, error, timings)
+            finally:
+                with self._lock:
+                    self._running.pop(job['job_id'], None)
+                self._slots.release()
+
+    def _finish(self, job: Dict, status: str, result: Optional[Dict], error: Optional[str],
+                timings: Dict[str, float]) -> None:
+        conn = get_db_connection()
+        try:
+            # Only if this run still owns the job: one that was requeued
+            # (and maybe re-run) meanwhile keeps the newer run's state
+            updated = conn.execute("""
+                UPDATE resume_jobs
+                SET status = ?, result = ?, error = ?, timings = ?, finished_at = ?, payload_path = NULL
+                WHERE job_id = ? AND status = ? AND started_at = ?
+            """, (
+                status,
+                json.dumps(result) if result is not None else None,
+                error,
+                json.dumps(timings),
+                _now(),
+                job['job_id'],
+                STATUS_RUNNING,
+                job['started_at'],
+            )).rowcount
+            conn.commit()
+        finally:
+            conn.close()
+
+        if updated != 1:
+            print(f"Resume job {job['job_id']} was requeued while running; result discarded")
+            return
+        try:
+            os.remove(job['payload_path'])
+        except OSError:
+            pass
+
+
+_queue = ResumeJobQueue()
+
+
+def submit_resume_job(content: DocumentSource, filename: str, target_role: str) -> Dict:
+    return _queue.submit(content, filename, target_role)
+
+
+def get_resume_job(job_id: str) -> Optional[Dict]:
+    return _queue.get(job_id)
@@ -0,0 +1,174 @@
+"""Loading and lifecycle of the optional NLP models (spaCy, KeyBERT).
+
+NLP_MODELS_MODE selects when models are loaded:
+  lazy      - on first use (default)
+  preload   - at application startup, before the resume worker pool forks,
+              so workers inherit the loaded models instead of loading their own
+  disabled  - never; extraction uses the ontology matcher only
+NLP_MODELS limits which models are used (default "spacy,keybert").
+
+The libraries are only imported when a model is actually loaded, so
+importing this module (and the app) stays cheap.
+"""
+import importlib.util
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Optional
+
+try:
+    import psutil
+    psutil_available = True
+except Exception:
+    psutil_available = False
+
+MODEL_NAMES = ('spacy', 'keybert')
+
+# The skill extractor only needs noun_chunks (parser + tagger)
+SPACY_EXCLUDE = ['ner', 'lemmatizer']
+
+
+def _models_mode() -> str:
+    mode = os.getenv('NLP_MODELS_MODE', 'lazy').strip().lower()
+    return mode if mode in ('lazy', 'preload', 'disabled') else 'lazy'
+
+
+def _enabled_models() -> set:
+    value = os.getenv('NLP_MODELS', ','.join(MODEL_NAMES))
+    return {name.strip().lower() for name in value.split(',') if name.strip()}
+
+
+def _spacy_model_name() -> str:
+    return os.getenv('SPACY_MODEL', 'en_core_web_sm')
+
+
+def _keybert_model_name() -> Optional[str]:
+    return os.getenv('KEYBERT_MODEL', '').strip() or None
+
+
+@lru_cache(maxsize=None)
+def _module_available(name: str) -> bool:
+    try:
+        return importlib.util.find_spec(name) is not None
+    except Exception:
+        return False
+
+
+def _rss_bytes() -> Optional[int]:
+    if psutil_available:
+        try:
+            return psutil.Process().memory_info().rss
+        except Exception:
+            return None
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except Exception:
+        return None
+
+
+def _load_spacy():
+    import spacy
+    return spacy.load(_spacy_model_name(), exclude=SPACY_EXCLUDE)
+
+
+def _load_keybert():
+    from keybert import KeyBERT
+    model_name = _keybert_model_name()
+    return KeyBERT(model=model_name) if model_name else KeyBERT()
+
+
+_LOADERS = {
+    'spacy': (_load_spacy, 'spacy'),
+    'keybert': (_load_keybert, 'keybert'),
+}
+
+
+class ModelManager:
+    """Loads each model at most once per process and records load stats."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models: Dict[str, object] = {}
+        self._stats: Dict[str, Dict] = {}
+
+    def is_enabled(self, name: str) -> bool:
+        return _models_mode() != 'disabled' and name in _enabled_models()
+
+    def is_available(self, name: str) -> bool:
+        """Enabled and installed (does not import or load anything)."""
+        return self.is_enabled(name) and _module_available(_LOADERS[name][1])
+
+    def get(self, name: str):
+        """Return the loaded model, loading it now if needed; None if unusable."""
+        if name in self._models:
+            return self._models[name]
+        if not self.is_available(name):
+            return None
+
+        with self._lock:
+            if name in self._models:
+                return self._models[name]
+            loader = _LOADERS[name][0]
+            rss_before = _rss_bytes()
+            started = time.perf_counter()
+            try:
+                model = loader()
+                error = None
+            except Exception as e:
+                model = None
+                error = str(e)
+            rss_after = _rss_bytes()
+
+            # Failures are remembered too, so a broken install is not retried per request
+            self._models[name] = model
+            self._stats[name] = {
+                'loaded': model is not None,
+                'load_seconds': round(time.perf_counter() - started, 3),
+                'rss_delta_bytes': (
+                    rss_after - rss_before if rss_before is not None and rss_after is not None else None
+                ),
+                'error': error,
+            }
+            return model
+
+    def preload(self) -> None:
+        for name in MODEL_NAMES:
+            self.get(name)
+
+    def stats(self) -> Dict:
+        models = {}
+        for name in MODEL_NAMES:
+            models[name] = {
+                'enabled': self.is_enabled(name),
+                'available': self.is_available(name),
+                **self._stats.get(name, {'loaded': False}),
+            }
+        return {'mode': _models_mode(), 'rss_bytes': _rss_bytes(), 'models': models}
+
+
+_manager = ModelManager()
+
+
+def get_spacy_model():
+    return _manager.get('spacy')
+
+
+def get_keybert_model():
+    return _manager.get('keybert')
+
+
+def models_signature() -> str:
+    """Which models extraction will use; part of the resume cache key."""
+    return ''.join(str(int(_manager.is_available(name))) for name in MODEL_NAMES)
+
+
+def preload_models_if_configured() -> None:
+    """Load all models now when NLP_MODELS_MODE=preload."""
+    if _models_mode() == 'preload':
+        _manager.preload()
+
+
+def model_stats() -> Dict:
+    return _manager.stats()
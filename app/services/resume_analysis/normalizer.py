@@ -1,7 +1,41 @@
 import re
+from dataclasses import dataclass
+
+# Characters kept besides word characters and whitespace
+_KEEP = '+#.'
+
+# ASCII characters removed by normalization, as a str.translate table
+_STRIP_ASCII = {
+    code: None
+    for code in range(128)
+    if not (chr(code).isalnum() or chr(code) == '_' or chr(code).isspace() or chr(code) in _KEEP)
+}
+# Same rule for arbitrary Unicode text
+_STRIP_PATTERN = re.compile(r'[^\w\s+#.]')
+
+
+def _normalize_lower(text_lower: str) -> str:
+    if text_lower.isascii():
+        stripped = text_lower.translate(_STRIP_ASCII)
+    else:
+        stripped = _STRIP_PATTERN.sub('', text_lower)
+    # str.split() splits on exactly the characters matched by \s
+    return ' '.join(stripped.split())
+
 
 def normalize_text(text: str) -> str:
-    text = text.lower()
-    text = re.sub(r'[^\w\s+#.]', '', text)
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+    return _normalize_lower(text.lower())
+
+
+@dataclass(frozen=True)
+class PreparedText:
+    """A resume's text in the forms the pipeline needs, each computed once."""
+
+    raw: str
+    lower: str
+    normalized: str
+
+
+def prepare_text(raw_text: str) -> PreparedText:
+    lower = raw_text.lower()
+    return PreparedText(raw=raw_text, lower=lower, normalized=_normalize_lower(lower))
@@ -0,0 +1,241 @@
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Characters that count as part of a word when checking match boundaries.
+# '+' and '#' are included so "c" does not match inside "c++" or "c#".
+_WORD_EXTRA = frozenset('_+#')
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch in _WORD_EXTRA
+
+
+class OntologyMatcher:
+    """Aho-Corasick automaton over the lowercased ontology skills.
+
+    Built once per ontology snapshot; `find_skills` then reports every
+    ontology skill present in a text in a single left-to-right pass, so the
+    cost depends on the text length rather than the number of skills.
+    """
+
+    def __init__(self, skills: Iterable[str], word_boundaries: bool = True):
+        self.word_boundaries = word_boundaries
+        self.skills: List[str] = []
+
+        # Trie: per-node transition dict, failure link and output pattern ids
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        # pattern id -> (text, is_skill)
+        self._patterns: List[Tuple[str, bool]] = []
+        self._pattern_ids: Dict[str, int] = {}
+
+        # Multi-word skills also match when all of their words appear
+        # somewhere in the text (not necessarily adjacent).
+        self._multiword: List[Tuple[str, Tuple[int, ...]]] = []
+
+        seen: Set[str] = set()
+        for skill in skills:
+            skill_lower = (skill or '').strip().lower()
+            if not skill_lower or skill_lower in seen:
+                continue
+            seen.add(skill_lower)
+            self.skills.append(skill_lower)
+            self._add_pattern(skill_lower, is_skill=True)
+
+            words = skill_lower.split()
+            if len(words) > 1:
+                word_ids = tuple(self._add_pattern(word, is_skill=False) for word in words)
+                self._multiword.append((skill_lower, word_ids))
+
+        self._build_failure_links()
+
+        # substring -> skills containing it, built on first use
+        self._containing: Optional[Dict[str, Tuple[str, ...]]] = None
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def _add_pattern(self, pattern: str, is_skill: bool) -> int:
+        pattern_id = self._pattern_ids.get(pattern)
+        if pattern_id is not None:
+            if is_skill and not self._patterns[pattern_id][1]:
+                self._patterns[pattern_id] = (pattern, True)
+            return pattern_id
+
+        pattern_id = len(self._patterns)
+        self._patterns.append((pattern, is_skill))
+        self._pattern_ids[pattern] = pattern_id
+
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[node][ch] = nxt
+            node = nxt
+        self._out[node].append(pattern_id)
+        return pattern_id
+
+    def _build_failure_links(self) -> None:
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                candidate = self._goto[fail].get(ch, 0)
+                self._fail[child] = candidate if candidate != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def iter_matches(self, text: str, word_boundaries: Optional[bool] = None):
+        """Yield (start, end, pattern) for every pattern occurrence in `text`.
+
+        `text` is expected to already be lowercased. `word_boundaries`
+        overrides the matcher's default for this call.
+        """
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        patterns = self._patterns
+        check_bounds = self.word_boundaries if word_boundaries is None else word_boundaries
+        text_len = len(text)
+
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            end = i + 1
+            for pattern_id in out[node]:
+                pattern = patterns[pattern_id][0]
+                start = end - len(pattern)
+                if check_bounds:
+                    if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(pattern[0]):
+                        continue
+                    if end < text_len and _is_word_char(text[end]) and _is_word_char(pattern[-1]):
+                        continue
+                yield start, end, pattern_id
+
+    def find_skills(self, text: str) -> Set[str]:
+        """Return the set of ontology skills found in `text`."""
+        found_ids: Set[int] = set()
+        for _start, _end, pattern_id in self.iter_matches(text):
+            found_ids.add(pattern_id)
+
+        patterns = self._patterns
+        found = {patterns[pid][0] for pid in found_ids if patterns[pid][1]}
+        for skill, word_ids in self._multiword:
+            if skill not in found and all(wid in found_ids for wid in word_ids):
+                found.add(skill)
+        return found
+
+    def _containing_index(self) -> Dict[str, Tuple[str, ...]]:
+        if self._containing is None:
+            containing: Dict[str, List[str]] = {}
+            for skill in self.skills:
+                substrings = {
+                    skill[i:j]
+                    for i in range(len(skill))
+                    for j in range(i + 1, len(skill) + 1)
+                }
+                for sub in substrings:
+                    containing.setdefault(sub, []).append(skill)
+            self._containing = {sub: tuple(skills) for sub, skills in containing.items()}
+        return self._containing
+
+    def find_related(self, phrase: str) -> Set[str]:
+        """Skills that occur in `phrase` or that contain it, as plain substrings.
+
+        Same result as checking `skill in phrase or phrase in skill` for every
+        skill, with `phrase` lowercased and stripped.
+        """
+        if not phrase:
+            return set(self.skills)
+        related = self.find_contained(phrase)
+        related.update(self._containing_index().get(phrase, ()))
+        return related
+
+    def find_contained(self, text: str) -> Set[str]:
+        """Skills occurring anywhere in `text` as plain substrings (no word boundaries)."""
+        patterns = self._patterns
+        return {
+            patterns[pattern_id][0]
+            for _start, _end, pattern_id in self.iter_matches(text, word_boundaries=False)
+            if patterns[pattern_id][1]
+        }
+
+
+# Separates names in FirstContainmentIndex's search text; never part of a query
+_SEPARATOR = '\x00'
+
+
+class FirstContainmentIndex:
+    """Finds the first name, in order, that contains a query or is contained in it.
+
+    Equivalent to scanning `names` for `query in name or name in query`, but
+    "query in name" is a single str.find over all names joined in order and
+    "name in query" runs the Aho-Corasick automaton over the query.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names: List[str] = list(names)
+
+        self._search_text = _SEPARATOR.join(self.names)
+        self._offsets: List[int] = []
+        offset = 0
+        for name in self.names:
+            self._offsets.append(offset)
+            offset += len(name) + 1
+
+        self._first_index: Dict[str, int] = {}
+        for index, name in enumerate(self.names):
+            self._first_index.setdefault(name, index)
+        # The automaton lowercases and strips its patterns; other names keep a linear check
+        self._irregular = [
+            index for index, name in enumerate(self.names)
+            if not name or name != name.strip().lower() or _SEPARATOR in name
+        ]
+        irregular = set(self._irregular)
+        self._matcher = OntologyMatcher(
+            (name for index, name in enumerate(self.names) if index not in irregular),
+            word_boundaries=False,
+        )
+
+    def first_index(self, query: str) -> Optional[int]:
+        best: Optional[int] = None
+
+        if query and _SEPARATOR not in query:
+            pos = self._search_text.find(query)
+            if pos != -1:
+                best = bisect_right(self._offsets, pos) - 1
+        elif not query and self.names:
+            best = 0
+
+        for name in self._matcher.find_contained(query):
+            index = self._first_index[name]
+            if best is None or index < best:
+                best = index
+
+        for index in self._irregular:
+            if best is not None and index >= best:
+                break
+            name = self.names[index]
+            if query in name or name in query:
+                best = index
+
+        return best
+
+    def first(self, query: str) -> Optional[str]:
+        index = self.first_index(query)
+        return self.names[index] if index is not None else None
@@ -0,0 +1,485 @@
+"""Resume analysis pipeline and the process pool that runs it in bulk.
+
+`analyze_document` runs extract_text -> normalize_text -> extract_skills ->
+score_skills for one file (or returns the cached result for an identical
+upload) and is safe to execute in a worker process.
+`expand_uploads` spools a batch's files (and the members of any .zip) to
+disk under size budgets, and `iter_analyze_documents` fans the spooled
+files out across the pool and yields each file's result as soon as it
+finishes.
+"""
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from app.models.schemas import Skill
+from app.services.resume_analysis.cache import cache_key, get_cached_analysis, store_analysis
+from app.services.resume_analysis.course_mapper import map_courses_to_skills
+from app.services.resume_analysis.extractor import DocumentSource, extract_text, mark_pool_worker
+from app.services.resume_analysis.models import preload_models_if_configured
+from app.services.resume_analysis.normalizer import PreparedText, prepare_text
+from app.services.resume_analysis.skill_extractor import extract_skills, extract_skills_batch
+from app.services.resume_analysis.roadmap import generate_roadmap
+from app.services.resume_analysis.response_cache import cached_response
+from app.services.resume_analysis.scorer import score_skills
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx')
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _resume_workers() -> int:
+    try:
+        return int(os.getenv('RESUME_WORKERS', str(os.cpu_count() or 1)))
+    except Exception:
+        return os.cpu_count() or 1
+
+
+def _batch_max_files() -> int:
+    try:
+        return int(os.getenv('RESUME_BATCH_MAX_FILES', '500'))
+    except Exception:
+        return 500
+
+
+def _batch_chunk_size() -> int:
+    try:
+        return int(os.getenv('RESUME_BATCH_CHUNK_SIZE', '8'))
+    except Exception:
+        return 8
+
+
+def _max_file_bytes() -> int:
+    try:
+        return int(os.getenv('RESUME_MAX_FILE_BYTES', str(16 * 1024 * 1024)))
+    except Exception:
+        return 16 * 1024 * 1024
+
+
+def _batch_max_bytes() -> int:
+    # Total bytes a batch may spool to disk, zip members inflated
+    try:
+        return int(os.getenv('RESUME_BATCH_MAX_BYTES', str(256 * 1024 * 1024)))
+    except Exception:
+        return 256 * 1024 * 1024
+
+
+def _zip_max_ratio() -> int:
+    # Largest inflated/compressed size ratio accepted for a zip member
+    try:
+        return int(os.getenv('RESUME_ZIP_MAX_RATIO', '100'))
+    except Exception:
+        return 100
+
+
+_SPOOL_CHUNK_BYTES = 1024 * 1024
+
+
+def is_supported_file(filename: str) -> bool:
+    return bool(filename) and filename.lower().endswith(SUPPORTED_EXTENSIONS)
+
+
+def _prepare(content: DocumentSource, filename: str,
+             timings: Dict[str, float]) -> Tuple[str, Optional[Dict], Optional[PreparedText]]:
+    """Cache lookup, then text extraction on a miss.
+
+    Returns (cache key, cached analysis or None, prepared text or None).
+    """
+    started = time.perf_counter()
+    key = cache_key(content, filename)
+    cached = get_cached_analysis(key)
+    timings['cache_lookup'] = time.perf_counter() - started
+    if cached is not None:
+        return key, {**cached, "cached": True}, None
+
+    started = time.perf_counter()
+    raw_text = extract_text(content, filename)
+    timings['extract_text'] = time.perf_counter() - started
+
+    # Lowercased and normalized once; extraction and scoring both reuse it
+    started = time.perf_counter()
+    text = prepare_text(raw_text)
+    timings['normalize_text'] = time.perf_counter() - started
+    return key, None, text
+
+
+def _finish(key: str, text: PreparedText, skills_list: List[str], timings: Dict[str, float]) -> Dict:
+    started = time.perf_counter()
+    scored_skills = score_skills(skills_list, text.raw, text.lower)
+    timings['score_skills'] = time.perf_counter() - started
+
+    analysis = {
+        "raw_text": text.raw,
+        "normalized_text": text.normalized,
+        "extracted_skills": skills_list,
+        "skills": [
+            {"name": skill.name, "confidence": skill.confidence}
+            for skill in scored_skills
+        ],
+    }
+    try:
+        store_analysis(key, analysis)
+    except Exception as e:
+        # A cache write failure must never fail the analysis itself
+        print(f"Resume cache store failed: {e}")
+    return {**analysis, "cached": False}
+
+
+def run_analysis(content: DocumentSource, filename: str, timings: Optional[Dict[str, float]] = None) -> Dict:
+    """Extract and score one resume, going through the resume cache.
+
+    `content` may be bytes or a seekable file (e.g. the upload's spooled
+    stream), which is then read in place rather than copied.
+
+    Returns raw_text, normalized_text, extracted_skills, skills and cached;
+    extraction errors propagate.
+    """
+    timings = timings if timings is not None else {}
+    key, cached, text = _prepare(content, filename, timings)
+    if cached is not None:
+        return cached
+
+    started = time.perf_counter()
+    skills_list = extract_skills(text.normalized, text.raw)
+    timings['extract_skills'] = time.perf_counter() - started
+
+    return _finish(key, text, skills_list, timings)
+
+
+def _document_result(filename: str, analysis: Dict, timings: Dict[str, float]) -> Dict:
+    return {
+        "filename": filename,
+        "extracted_skills": analysis["extracted_skills"],
+        "skills": analysis["skills"],
+        "cached": analysis["cached"],
+        "timings": {k: round(v, 4) for k, v in timings.items()},
+    }
+
+
+def _error_result(filename: str, error: Exception, timings: Dict[str, float]) -> Dict:
+    return {
+        "filename": filename,
+        "error": str(error),
+        "timings": {k: round(v, 4) for k, v in timings.items()},
+    }
+
+
+def analyze_document(content: DocumentSource, filename: str) -> Dict:
+    """Run the full extraction + scoring pipeline for one resume.
+
+    Never raises: failures are reported in the returned dict so one bad file
+    does not abort a batch.
+    """
+    timings: Dict[str, float] = {}
+    try:
+        analysis = run_analysis(content, filename, timings)
+    except Exception as e:
+        return _error_result(filename, e, timings)
+    return _document_result(filename, analysis, timings)
+
+
+def analyze_document_file(path: str, filename: str) -> Dict:
+    """`analyze_document` for a resume stored on disk.
+
+    Lets pool workers read a spooled upload themselves instead of having
+    its bytes pickled across the process boundary.
+    """
+    try:
+        with open(path, 'rb') as f:
+            return analyze_document(f, filename)
+    except OSError as e:
+        return _error_result(filename, e, {})
+
+
+def analyze_documents(documents: Sequence[Tuple[str, bytes]]) -> List[Dict]:
+    """`analyze_document` for several (filename, content) pairs.
+
+    Skill extraction for the cache misses runs as one batch so the NLP
+    models see all documents together; its time is split evenly across
+    them in the reported timings.
+    """
+    results: List[Optional[Dict]] = [None] * len(documents)
+    timings_by_doc: List[Dict[str, float]] = [{} for _ in documents]
+    pending = []  # (position, key, prepared text)
+
+    for i, (filename, content) in enumerate(documents):
+        timings = timings_by_doc[i]
+        try:
+            key, cached, text = _prepare(content, filename, timings)
+        except Exception as e:
+            results[i] = _error_result(filename, e, timings)
+            continue
+        if cached is not None:
+            results[i] = _document_result(filename, cached, timings)
+        else:
+            pending.append((i, key, text))
+
+    if pending:
+        started = time.perf_counter()
+        try:
+            batch_skills = extract_skills_batch([(text.normalized, text.raw) for _, _, text in pending])
+        except Exception:
+            batch_skills = None
+        share = (time.perf_counter() - started) / len(pending)
+
+        for n, (i, key, text) in enumerate(pending):
+            filename = documents[i][0]
+            timings = timings_by_doc[i]
+            try:
+                if batch_skills is None:
+                    started = time.perf_counter()
+                    skills_list = extract_skills(text.normalized, text.raw)
+                    timings['extract_skills'] = share + time.perf_counter() - started
+                else:
+                    skills_list = batch_skills[n]
+                    timings['extract_skills'] = share
+                analysis = _finish(key, text, skills_list, timings)
+            except Exception as e:
+                results[i] = _error_result(filename, e, timings)
+                continue
+            results[i] = _document_result(filename, analysis, timings)
+
+    return results
+
+
+def build_roadmap_response(final_skills: List[Dict], target_role: str) -> List[Dict]:
+    """Roadmap (with courses) for scored skills, in the /analyze response shape.
+
+    Served from the response cache for skill sets with the same roadmap
+    fingerprint; the result is shared and must not be modified.
+    """
+    skills = [Skill(name=s["name"], confidence=s["confidence"]) for s in final_skills]
+    return cached_response("roadmap", skills, target_role, lambda: _roadmap_response(skills, target_role))
+
+
+def _roadmap_response(skills: List[Skill], target_role: str) -> List[Dict]:
+    roadmap_phases = generate_roadmap(skills, target_role)
+    roadmap_with_courses = map_courses_to_skills(roadmap_phases)
+
+    return [
+        {
+            "phase": phase.phase,
+            "skills": [
+                {
+                    "name": skill.name,
+                    "courses": [
+                        {
+                            "platform": course.platform,
+                            "title": course.title,
+                            "url": course.url
+                        }
+                        for course in skill.courses
+                    ]
+                }
+                for skill in phase.skills
+            ]
+        }
+        for phase in roadmap_with_courses
+    ]
+
+
+def _pool_context():
+    # fork lets workers inherit already-imported modules and loaded models
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the shared worker pool, or None when RESUME_WORKERS=0."""
+    global _pool
+    workers = _resume_workers()
+    if workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # Load models before forking so every worker shares them
+            preload_models_if_configured()
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=_pool_context(), initializer=mark_pool_worker
+            )
+        return _pool
+
+
+def shutdown_process_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _chunk_documents(documents: List[Tuple[str, str]], workers: int) -> List[List[Tuple[int, str, str]]]:
+    # Small batches are still spread over every worker
+    per_worker = -(-len(documents) // max(workers, 1))
+    size = max(1, min(_batch_chunk_size(), per_worker))
+    indexed = [(index, filename, path) for index, (filename, path) in enumerate(documents)]
+    return [indexed[i:i + size] for i in range(0, len(indexed), size)]
+
+
+def _analyze_chunk(chunk: List[Tuple[int, str, str]]) -> List[Dict]:
+    """Analyze spooled documents; only their paths cross the process boundary."""
+    results: List[Dict] = []
+    opened = []
+    try:
+        for index, filename, path in chunk:
+            try:
+                opened.append((index, filename, open(path, 'rb')))
+            except OSError as e:
+                results.append({"index": index, **_error_result(filename, e, {})})
+        analyzed = analyze_documents([(filename, f) for _, filename, f in opened])
+        results.extend({"index": index, **result} for (index, _, _), result in zip(opened, analyzed))
+    finally:
+        for _, _, f in opened:
+            f.close()
+    return results
+
+
+def iter_analyze_documents(documents: Iterable[Tuple[str, str]]) -> Iterator[Dict]:
+    """Analyze (filename, path) pairs from `expand_uploads`, yielding results as they complete.
+
+    Documents are handed to workers in small chunks so skill extraction can
+    batch them. Each result carries the document's position in the batch
+    as `index`.
+    """
+    documents = list(documents)
+    pool = get_process_pool()
+
+    if pool is None:
+        for chunk in _chunk_documents(documents, 1):
+            yield from _analyze_chunk(chunk)
+        return
+
+    futures = {
+        pool.submit(_analyze_chunk, chunk): chunk
+        for chunk in _chunk_documents(documents, _resume_workers())
+    }
+    for future in as_completed(futures):
+        try:
+            results = future.result()
+        except Exception as e:
+            # e.g. a worker process died
+            results = [
+                {"index": index, "filename": filename, "error": str(e)}
+                for index, filename, _ in futures[future]
+            ]
+        yield from results
+
+
+class _SpoolLimitExceeded(Exception):
+    pass
+
+
+def _spool(source: BinaryIO, spool_dir: str, limit: int) -> Tuple[str, int]:
+    """Copy `source` to a new file in `spool_dir` in chunks; returns (path, size).
+
+    Raises _SpoolLimitExceeded, removing the partial file, as soon as more
+    than `limit` bytes have been read, whatever the source claimed its size
+    to be.
+    """
+    fd, path = tempfile.mkstemp(dir=spool_dir)
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = source.read(min(_SPOOL_CHUNK_BYTES, limit - size + 1))
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > limit:
+                    raise _SpoolLimitExceeded()
+                out.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path, size
+
+
+def expand_uploads(uploads: Iterable[Tuple[str, Union[bytes, BinaryIO]]],
+                   spool_dir: str) -> Tuple[List[Tuple[str, str]], List[Dict]]:
+    """Spool uploaded files and the members of .zip archives into `spool_dir`.
+
+    `uploads` are (filename, stream) pairs; a .zip stream must be seekable.
+    Every file is copied in chunks under three budgets: RESUME_MAX_FILE_BYTES
+    per file, RESUME_BATCH_MAX_BYTES for the whole batch, and
+    RESUME_ZIP_MAX_RATIO for each zip member's inflated/compressed ratio,
+    so an archive cannot inflate past them whatever its headers claim.
+
+    Returns (documents, rejected): documents are (filename, path) pairs for
+    `iter_analyze_documents`, rejected lists {filename, error}. The caller
+    owns `spool_dir` and removes it when done.
+    """
+    documents: List[Tuple[str, str]] = []
+    rejected: List[Dict] = []
+    max_files = _batch_max_files()
+    max_bytes = _max_file_bytes()
+    max_ratio = _zip_max_ratio()
+    remaining = _batch_max_bytes()
+
+    def add(filename: str, source: BinaryIO, limit: int, limit_error: str):
+        nonlocal remaining
+        if len(documents) >= max_files:
+            rejected.append({"filename": filename, "error": f"Batch limit of {max_files} files reached"})
+            return
+        if remaining <= 0:
+            rejected.append({"filename": filename, "error": "Batch size limit reached"})
+            return
+        if limit > remaining:
+            limit, limit_error = remaining, "Batch size limit reached"
+        try:
+            path, size = _spool(source, spool_dir, limit)
+        except _SpoolLimitExceeded:
+            rejected.append({"filename": filename, "error": limit_error})
+            return
+        remaining -= size
+        documents.append((filename, path))
+
+    for filename, content in uploads:
+        if isinstance(content, (bytes, bytearray)):
+            content = BytesIO(content)
+        lower = (filename or '').lower()
+        if lower.endswith('.zip'):
+            try:
+                with zipfile.ZipFile(content) as archive:
+                    for info in archive.infolist():
+                        name = info.filename
+                        base = os.path.basename(name)
+                        if info.is_dir() or not base or base.startswith('.') or '__MACOSX' in name:
+                            continue
+                        if not is_supported_file(base):
+                            rejected.append({"filename": name, "error": "File must be PDF or DOCX"})
+                            continue
+                        if info.file_size > max_bytes:
+                            rejected.append({"filename": name, "error": "File too large"})
+                            continue
+                        # The declared sizes are only a first check; _spool
+                        # enforces the same limits on the bytes actually inflated
+                        ratio_limit = max_ratio * max(info.compress_size, 1)
+                        if info.file_size > ratio_limit:
+                            rejected.append({"filename": name, "error": "Compression ratio too high"})
+                            continue
+                        if ratio_limit < max_bytes:
+                            limit, limit_error = ratio_limit, "Compression ratio too high"
+                        else:
+                            limit, limit_error = max_bytes, "File too large"
+                        try:
+                            with archive.open(info) as member:
+                                add(name, member, limit, limit_error)
+                        except (zipfile.BadZipFile, RuntimeError, NotImplementedError, OSError) as e:
+                            # corrupt or encrypted member
+                            rejected.append({"filename": name, "error": f"Could not read archive member: {e}"})
+            except zipfile.BadZipFile:
+                rejected.append({"filename": filename, "error": "Invalid zip archive"})
+        elif is_supported_file(lower):
+            add(filename, content, max_bytes, "File too large")
+        else:
+            rejected.append({"filename": filename, "error": "File must be PDF, DOCX or ZIP"})
+
+    return documents, rejected
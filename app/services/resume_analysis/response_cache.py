@@ -0,0 +1,64 @@
+"""Response-level cache for roadmap-derived payloads.
+
+`/api/recommendations` and `/api/resume/analyze` (with `skills_with_scores`)
+turn a skill list into a roadmap with courses and videos. That payload only
+depends on the target role and on `roadmap_fingerprint` (which required
+skills clear the roadmap thresholds, plus the reference data version), so
+users with near-identical skill sets share one entry. A change to roles or
+courses bumps the reference data version; the first lookup that sees the new
+version drops every entry built against the old one.
+
+Cached payloads are shared between requests and must be treated as
+read-only.
+"""
+import os
+from typing import Any, Callable, Dict, Hashable, List, TypeVar
+
+from app.models.schemas import Skill
+from app.services.memo import LRUCache
+from app.services.resume_analysis.roadmap import roadmap_fingerprint
+
+T = TypeVar('T')
+
+
+def _cache_size() -> int:
+    try:
+        return int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '1024'))
+    except Exception:
+        return 1024
+
+
+def _cache_ttl() -> float:
+    try:
+        return float(os.getenv('RESPONSE_CACHE_TTL_SECONDS', '900'))
+    except Exception:
+        return 900.0
+
+
+_cache = LRUCache(maxsize=_cache_size(), ttl=_cache_ttl() or None)
+# Reference data version the cached entries were built against
+_cache_version = None
+
+
+def _drop_stale_entries(version) -> None:
+    global _cache_version
+    if version != _cache_version:
+        _cache.clear()
+        _cache_version = version
+
+
+def cached_response(kind: str, skills: List[Skill], target_role: str, build: Callable[[], T]) -> T:
+    """Return the cached `kind` payload for these skills and role, building it on a miss."""
+    fingerprint = roadmap_fingerprint(skills, target_role)
+    # The fingerprint leads with the reference data version
+    _drop_stale_entries(fingerprint[0])
+    key: Hashable = (kind, target_role, fingerprint)
+    value: Any = _cache.get(key)
+    if value is None:
+        value = build()
+        _cache.set(key, value)
+    return value
+
+
+def response_cache_stats() -> Dict:
+    return _cache.stats()
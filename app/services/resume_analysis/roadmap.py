@@ -1,99 +1,110 @@
-import json
 import os
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Tuple
 from app.models.schemas import Skill, RoadmapPhase, RoadmapSkill
 
-from app.database import get_db_connection
-from typing import Dict, List
+from app.services.memo import LRUCache
+from app.services.reference_data import get_reference_data
 
 def _load_roles() -> Dict:
-    conn = get_db_connection()
-    roles_data = {}
-    try:
-        # Structure: role -> {sector: sector_name, category -> list of skills}
-        rows = conn.execute('SELECT role_name, category, skill, sector FROM roles').fetchall()
-        
-        for row in rows:
-            role = row['role_name']
-            category = row['category']
-            skill = row['skill']
-            # sqlite3.Row doesn't have .get(), use dictionary access
-            try:
-                sector = row['sector']
-            except (IndexError, KeyError, TypeError):
-                sector = 'Technology'
-            
-            if role not in roles_data:
-                roles_data[role] = {'sector': sector}
-            if category not in roles_data[role]:
-                roles_data[role][category] = []
-                
-            roles_data[role][category].append(skill)
-            
-    finally:
-        conn.close()
-    return roles_data
+    # Structure: role -> {sector: sector_name, category -> tuple of skills}
+    return get_reference_data().roles
 
 from app.services.resume_analysis.utils import match_role
 
-def _get_user_skills(scored_skills: List[Skill], threshold: float = 0.3) -> Set[str]:
-    return {skill.name.lower() for skill in scored_skills if skill.confidence >= threshold}
+# Phase order of the generated roadmap
+PHASES = ("foundation", "core", "advanced", "projects")
+KNOWN_THRESHOLD = 0.3      # below this a skill counts as missing
+PROFICIENT_THRESHOLD = 0.6  # at or above this a known skill needs no work
 
-def generate_roadmap(scored_skills: List[Skill], target_role: str) -> List[RoadmapPhase]:
-    roles_data = _load_roles()
-    
+def _roadmap_cache_size() -> int:
+    try:
+        return int(os.getenv('ROADMAP_CACHE_SIZE', '2048'))
+    except Exception:
+        return 2048
+
+# (reference version, role, proficient required skills) -> ((phase, (skill, ...)), ...)
+_plan_cache = LRUCache(maxsize=_roadmap_cache_size())
+
+def _proficient_skills(scored_skills: List[Skill]) -> Set[str]:
+    """Skills the roadmap can skip.
+
+    A skill is skipped when some entry for it reaches KNOWN_THRESHOLD and
+    its first entry reaches PROFICIENT_THRESHOLD.
+    """
+    known = set()
+    first_confidence: Dict[str, float] = {}
+    for skill in scored_skills:
+        name = skill.name.lower()
+        first_confidence.setdefault(name, skill.confidence)
+        if skill.confidence >= KNOWN_THRESHOLD:
+            known.add(name)
+    return {name for name in known if first_confidence[name] >= PROFICIENT_THRESHOLD}
+
+def _role_requirements(roles_data: Dict, target_role: str):
     matched_role_name = match_role(target_role, roles_data)
     
     if matched_role_name:
-        role_requirements = roles_data[matched_role_name]
-    else:
-        # Fallback to software engineer if possible, otherwise use first role
-        if 'software engineer' in roles_data:
-            role_requirements = roles_data['software engineer']
-        else:
-            role_requirements = roles_data[list(roles_data.keys())[0]]
-    
-    user_skills = _get_user_skills(scored_skills)
-    
-    foundation_skills = []
-    core_skills = []
-    advanced_skills = []
-    project_skills = []
+        return matched_role_name, roles_data[matched_role_name]
+    # Fallback to software engineer if possible, otherwise use first role
+    if 'software engineer' in roles_data:
+        return 'software engineer', roles_data['software engineer']
+    first_role = list(roles_data.keys())[0]
+    return first_role, roles_data[first_role]
+
+def _plan_phases(role_requirements, proficient: Set[str]) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    plan = []
+    for phase_name in PHASES:
+        skills = tuple(
+            skill for skill in role_requirements.get(phase_name, ())
+            if skill.lower() not in proficient
+        )
+        if skills:
+            plan.append((phase_name, skills))
+    return tuple(plan)
+
+def _plan_key(scored_skills: List[Skill], target_role: str):
+    # One snapshot for both the role lookup and the version in the key
+    ref = get_reference_data()
+    role_name, role_requirements = _role_requirements(ref.roles, target_role)
     
-    for phase_name, required_skills in role_requirements.items():
-        for skill in required_skills:
-            skill_lower = skill.lower()
-            if skill_lower not in user_skills:
-                skill_obj = RoadmapSkill(name=skill, courses=[])
-                if phase_name == "foundation":
-                    foundation_skills.append(skill_obj)
-                elif phase_name == "core":
-                    core_skills.append(skill_obj)
-                elif phase_name == "advanced":
-                    advanced_skills.append(skill_obj)
-                elif phase_name == "projects":
-                    project_skills.append(skill_obj)
-            else:
-                user_skill = next((s for s in scored_skills if s.name.lower() == skill_lower), None)
-                if user_skill and user_skill.confidence < 0.6:
-                    skill_obj = RoadmapSkill(name=skill, courses=[])
-                    if phase_name == "foundation":
-                        foundation_skills.append(skill_obj)
-                    elif phase_name == "core":
-                        core_skills.append(skill_obj)
-                    elif phase_name == "advanced":
-                        advanced_skills.append(skill_obj)
-                    elif phase_name == "projects":
-                        project_skills.append(skill_obj)
+    proficient = _proficient_skills(scored_skills)
+    required = {
+        skill.lower()
+        for phase_name in PHASES
+        for skill in role_requirements.get(phase_name, ())
+    }
+    return (ref.version, role_name, frozenset(proficient & required)), role_requirements, proficient
+
+def roadmap_fingerprint(scored_skills: List[Skill], target_role: str) -> Tuple:
+    """Hashable key that determines generate_roadmap's output.
+
+    (reference data version, resolved role, required skills the user is
+    proficient in): confidences only matter relative to the roadmap
+    thresholds, and only for skills the role asks for.
+    """
+    return _plan_key(scored_skills, target_role)[0]
+
+def generate_roadmap(scored_skills: List[Skill], target_role: str) -> List[RoadmapPhase]:
+    """Missing or weak skills of the target role, grouped by phase.
+
+    The phase plan depends only on the role and on which of its required
+    skills the user is already proficient in, so it is cached under that key.
+    """
+    cache_key, role_requirements, proficient = _plan_key(scored_skills, target_role)
     
-    roadmap = []
-    if foundation_skills:
-        roadmap.append(RoadmapPhase(phase="foundation", skills=foundation_skills))
-    if core_skills:
-        roadmap.append(RoadmapPhase(phase="core", skills=core_skills))
-    if advanced_skills:
-        roadmap.append(RoadmapPhase(phase="advanced", skills=advanced_skills))
-    if project_skills:
-        roadmap.append(RoadmapPhase(phase="projects", skills=project_skills))
+    plan = _plan_cache.get(cache_key)
+    if plan is None:
+        plan = _plan_phases(role_requirements, proficient)
+        _plan_cache.set(cache_key, plan)
     
-    return roadmap
+    # Fresh models every call: map_courses_to_skills fills in their courses
+    return [
+        RoadmapPhase.model_construct(
+            phase=phase_name,
+            skills=[RoadmapSkill.model_construct(name=skill, courses=[]) for skill in skills],
+        )
+        for phase_name, skills in plan
+    ]
+
+def roadmap_cache_stats() -> Dict:
+    return _plan_cache.stats()
@@ -0,0 +1,75 @@
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from app.services.resume_analysis.ontology_matcher import FirstContainmentIndex
+
+# Common abbreviations in job titles, applied in order ('ml dev' -> 'machine learning developer')
+ROLE_ALIASES = (
+    ('dev', 'developer'),
+    ('ml', 'machine learning'),
+    ('fe', 'frontend'),
+    ('be', 'backend'),
+)
+
+_ALIAS_PATTERNS = tuple((re.compile(rf'\b{short}\b'), long) for short, long in ROLE_ALIASES)
+
+
+def _cache_size() -> int:
+    try:
+        return int(os.getenv('ROLE_RESOLVER_CACHE_SIZE', '4096'))
+    except Exception:
+        return 4096
+
+
+def expand_role_aliases(title_lower: str) -> str:
+    for pattern, long in _ALIAS_PATTERNS:
+        title_lower = pattern.sub(long, title_lower)
+    return title_lower
+
+
+class RoleResolver:
+    """Resolves free-text job titles to canonical role names.
+
+    Same rules and precedence as a linear scan over the roles in order:
+    exact (case-insensitive) name, then the first role that contains the
+    title or is contained in it, then the same containment check after
+    expanding abbreviations. Built once per roles snapshot; resolved titles
+    are memoized.
+    """
+
+    def __init__(self, role_names: Iterable[str]):
+        self.role_names: List[str] = list(role_names)
+        lowered = [role.lower() for role in self.role_names]
+
+        self._exact: Dict[str, str] = {}
+        for role, role_lower in zip(self.role_names, lowered):
+            self._exact.setdefault(role_lower, role)
+
+        self._containment = FirstContainmentIndex(lowered)
+
+        self.resolve = lru_cache(maxsize=_cache_size())(self._resolve)
+
+    def _contains_match(self, title_lower: str) -> Optional[str]:
+        index = self._containment.first_index(title_lower)
+        return self.role_names[index] if index is not None else None
+
+    def _resolve(self, target_role: str) -> Optional[str]:
+        if not target_role:
+            return None
+
+        target_lower = target_role.lower().strip()
+
+        role = self._exact.get(target_lower)
+        if role is not None:
+            return role
+
+        role = self._contains_match(target_lower)
+        if role is not None:
+            return role
+
+        augmented_target = expand_role_aliases(target_lower)
+        if augmented_target != target_lower:
+            return self._contains_match(augmented_target)
+        return None
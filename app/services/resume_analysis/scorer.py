@@ -1,75 +1,190 @@
 import re
-from typing import List, Dict
+from bisect import bisect_left
+from typing import List, Dict, Optional, Tuple
 from app.models.schemas import Skill
+from app.services.resume_analysis.ontology_matcher import OntologyMatcher
 
 ACTION_VERBS = {"built", "developed", "implemented", "designed", "created", "architected"}
 
-def _detect_section(text: str, section_name: str) -> bool:
-    patterns = [
-        rf"\b{section_name}\b",
-        rf"{section_name}:",
-        rf"{section_name}\s*:",
-    ]
-    for pattern in patterns:
-        if re.search(pattern, text, re.IGNORECASE):
+# (section names, weight) in priority order; a "skill" heading weighs the
+# same as no heading at all, so it needs no lookup.
+SECTION_WEIGHTS = ((("experience", "work"), 3.0), (("project",), 2.0))
+SECTION_WINDOW = 200
+ACTION_VERB_WINDOW = 50
+
+_WORD_CHAR = re.compile(r"\w")
+_COLON_AFTER = re.compile(r"\s*:")
+
+
+def _find_all(text: str, needle: str) -> List[int]:
+    positions = []
+    pos = text.find(needle)
+    while pos != -1:
+        positions.append(pos)
+        pos = text.find(needle, pos + 1)
+    return positions
+
+
+class _SectionOccurrences:
+    """Every occurrence of one section name, for window queries.
+
+    A heading is found in a window of text when it has word boundaries
+    there (the window edges count as boundaries) or a following colon.
+    """
+
+    def __init__(self, text_lower: str, name: str):
+        self.length = len(name)
+        self.positions: List[int] = []
+        # (left is word char, right is word char, end of "name\s*:" or None)
+        self.flags: List[Tuple[bool, bool, Optional[int]]] = []
+        # Occurrences that match in any window that contains them
+        self.strong: List[int] = []
+
+        end_limit = len(text_lower)
+        for pos in _find_all(text_lower, name):
+            end = pos + self.length
+            left_word = pos > 0 and _WORD_CHAR.match(text_lower, pos - 1) is not None
+            right_word = end < end_limit and _WORD_CHAR.match(text_lower, end) is not None
+            colon = _COLON_AFTER.match(text_lower, end)
+            self.positions.append(pos)
+            self.flags.append((left_word, right_word, colon.end() if colon else None))
+            if not left_word and not right_word:
+                self.strong.append(pos)
+
+    def in_window(self, start: int, end: int) -> bool:
+        last_start = end - self.length
+        i = bisect_left(self.strong, start)
+        if i < len(self.strong) and self.strong[i] <= last_start:
             return True
-    return False
 
-def _get_section_weight(text: str, skill: str, skill_pos: int) -> float:
-    text_lower = text.lower()
-    skill_lower = skill.lower()
-    
-    start_pos = max(0, skill_pos - 200)
-    end_pos = min(len(text), skill_pos + 200)
-    context = text_lower[start_pos:end_pos]
-    
-    if _detect_section(context, "experience") or _detect_section(context, "work"):
-        return 3.0
-    elif _detect_section(context, "project"):
-        return 2.0
-    elif _detect_section(context, "skill"):
+        i = bisect_left(self.positions, start)
+        while i < len(self.positions) and self.positions[i] <= last_start:
+            pos = self.positions[i]
+            left_word, right_word, colon_end = self.flags[i]
+            if colon_end is not None and colon_end <= end:
+                return True
+            if (pos == start or not left_word) and (pos + self.length == end or not right_word):
+                return True
+            i += 1
+        return False
+
+
+class _ResumeIndex:
+    """Section-heading and action-verb positions of one resume."""
+
+    def __init__(self, text_lower: str):
+        self.text_len = len(text_lower)
+        # Case-insensitive heading matches also accept dotless i for "i"
+        headings = text_lower.replace("\u0131", "i")
+        self.sections = [
+            ([_SectionOccurrences(headings, name) for name in names], weight)
+            for names, weight in SECTION_WEIGHTS
+        ]
+        self.verbs = [(_find_all(text_lower, verb), len(verb)) for verb in ACTION_VERBS]
+
+    def section_weight(self, pos: int) -> float:
+        start = max(0, pos - SECTION_WINDOW)
+        end = min(self.text_len, pos + SECTION_WINDOW)
+        for occurrences, weight in self.sections:
+            if any(occ.in_window(start, end) for occ in occurrences):
+                return weight
         return 1.0
-    return 1.0
 
-def _has_action_verb_nearby(text: str, skill: str, skill_pos: int) -> bool:
-    start_pos = max(0, skill_pos - 50)
-    end_pos = min(len(text), skill_pos + 50)
-    context = text[start_pos:end_pos].lower()
-    
-    for verb in ACTION_VERBS:
-        if verb in context:
-            return True
-    return False
+    def has_action_verb(self, pos: int) -> bool:
+        start = max(0, pos - ACTION_VERB_WINDOW)
+        end = min(self.text_len, pos + ACTION_VERB_WINDOW)
+        for positions, length in self.verbs:
+            i = bisect_left(positions, start)
+            if i < len(positions) and positions[i] + length <= end:
+                return True
+        return False
 
-def score_skills(skills_list: List[str], raw_text: str) -> List[Skill]:
-    text_lower = raw_text.lower()
+
+def _count_non_overlapping(positions: List[int], length: int) -> int:
+    # Same result as str.count for the occurrences in `positions`
+    count = 0
+    next_free = 0
+    for pos in positions:
+        if pos >= next_free:
+            count += 1
+            next_free = pos + max(length, 1)
+    return count
+
+
+def _skill_positions(skills_list: List[str], text_lower: str) -> Dict[str, List[int]]:
+    """Start offsets of every occurrence of each lowercased skill, overlaps included.
+
+    One Aho-Corasick pass over the text finds all skills at once. The
+    matcher strips its patterns, so skills with surrounding whitespace
+    keep only the stripped matches that the whitespace also surrounds.
+    """
+    skills_lower = {skill.lower() for skill in skills_list}
+    matcher = OntologyMatcher(skills_lower, word_boundaries=False)
+    found: Dict[str, List[int]] = {}
+    for start, end, pattern_id in matcher.iter_matches(text_lower):
+        found.setdefault(text_lower[start:end], []).append(start)
+
+    positions: Dict[str, List[int]] = {}
+    for skill_lower in skills_lower:
+        stripped = skill_lower.strip()
+        if not stripped:
+            # Blank skills are never produced by the extractor; str.find
+            # semantics still apply ('' occurs at every offset)
+            positions[skill_lower] = _find_all(text_lower, skill_lower)
+            continue
+        lead = skill_lower.index(stripped)
+        starts = found.get(stripped, [])
+        if len(stripped) != len(skill_lower):
+            starts = [
+                pos - lead for pos in starts
+                if pos >= lead and text_lower.startswith(skill_lower, pos - lead)
+            ]
+        positions[skill_lower] = starts
+    return positions
+
+
+def _score_skills_indexed(skills_list: List[str], text_lower: str) -> Dict[str, float]:
+    index = _ResumeIndex(text_lower)
+    skill_positions = _skill_positions(skills_list, text_lower)
     skill_scores: Dict[str, float] = {}
-    
+    section_weights: Dict[int, float] = {}
+    action_bonuses: Dict[int, float] = {}
+
     for skill in skills_list:
         skill_lower = skill.lower()
-        count = text_lower.count(skill_lower)
-        
-        if count == 0:
+        positions = skill_positions[skill_lower]
+        if not positions:
             continue
-        
-        base_score = count * 0.1
-        
-        positions = []
-        start = 0
-        while True:
-            pos = text_lower.find(skill_lower, start)
-            if pos == -1:
-                break
-            positions.append(pos)
-            start = pos + 1
-        
+
+        base_score = _count_non_overlapping(positions, len(skill_lower)) * 0.1
+
         total_weighted_score = 0.0
         for pos in positions:
-            section_weight = _get_section_weight(raw_text, skill, pos)
-            action_bonus = 0.2 if _has_action_verb_nearby(raw_text, skill, pos) else 0.0
+            section_weight = section_weights.get(pos)
+            if section_weight is None:
+                section_weight = section_weights[pos] = index.section_weight(pos)
+            action_bonus = action_bonuses.get(pos)
+            if action_bonus is None:
+                action_bonus = action_bonuses[pos] = 0.2 if index.has_action_verb(pos) else 0.0
             total_weighted_score += (base_score * section_weight) + action_bonus
-        
+
         skill_scores[skill] = total_weighted_score
+
+    return skill_scores
+
+
+def score_skills(skills_list: List[str], raw_text: str, text_lower: Optional[str] = None) -> List[Skill]:
+    """Score skills by how often, where (section) and how (action verbs) they appear.
+
+    Skill occurrences come from one matcher pass, and section headings and
+    action verbs are located once per resume; each occurrence is then
+    scored with bisect lookups instead of re-scanning a window of text
+    around it. Pass `text_lower` when the lowercased text is already at
+    hand (see normalizer.prepare_text).
+    """
+    if text_lower is None:
+        text_lower = raw_text.lower()
+    skill_scores = _score_skills_indexed(skills_list, text_lower)
     
     if not skill_scores:
         return []
@@ -1,96 +1,101 @@
-import json
 import os
-from typing import List, Set
+from typing import List, Sequence, Set, Tuple
 
-nlp = None
-kw_model = None
-spacy_available = False
-
-try:
-    import spacy
-    spacy_available = True
-except Exception:
-    spacy_available = False
-
-try:
-    from keybert import KeyBERT
-    keybert_available = True
-except Exception:
-    keybert_available = False
+from app.services.resume_analysis.models import get_keybert_model, get_spacy_model
 
 def _load_nlp():
-    global nlp
-    if nlp is None and spacy_available:
-        try:
-            nlp = spacy.load("en_core_web_sm")
-        except Exception:
-            nlp = None
-    return nlp
+    return get_spacy_model()
 
 def _load_keybert():
-    global kw_model
-    if kw_model is None and keybert_available:
-        try:
-            kw_model = KeyBERT()
-        except Exception:
-            kw_model = None
-    return kw_model
+    return get_keybert_model()
 
-from app.database import get_db_connection
+from app.services.reference_data import get_reference_data
 
-def _load_ontology() -> List[str]:
-    conn = get_db_connection()
-    ontology_skills = []
+def _spacy_batch_size() -> int:
     try:
-        rows = conn.execute('SELECT skill FROM ontology').fetchall()
-        ontology_skills = [row['skill'] for row in rows]
-    finally:
-        conn.close()
-    return ontology_skills
+        return int(os.getenv('SPACY_BATCH_SIZE', '16'))
+    except Exception:
+        return 16
 
-def extract_skills(normalized_text: str, raw_text: str) -> List[str]:
-    skills_set: Set[str] = set()
-    
-    ontology_skills = _load_ontology()
-    ontology_lower = [s.lower() for s in ontology_skills]
-    
-    for skill in ontology_lower:
-        if skill in normalized_text:
-            skills_set.add(skill)
-        words = skill.split()
-        if len(words) > 1:
-            if all(word in normalized_text for word in words):
-                skills_set.add(skill)
+def _spacy_n_process() -> int:
+    # >1 makes spaCy start its own worker processes; keep 1 inside the
+    # resume process pool, whose workers already run in parallel.
+    try:
+        return int(os.getenv('SPACY_N_PROCESS', '1'))
+    except Exception:
+        return 1
+
+def _chunk_skills(matcher, doc) -> Set[str]:
+    found: Set[str] = set()
+    for chunk in doc.noun_chunks:
+        chunk_text = chunk.text.lower().strip()
+        if len(chunk_text) > 2 and len(chunk_text) < 50:
+            found |= matcher.find_related(chunk_text)
+    return found
+
+def _keyword_skills(matcher, keywords) -> Set[str]:
+    found: Set[str] = set()
+    for keyword, _ in keywords:
+        found |= matcher.find_related(keyword.lower().strip())
+    return found
+
+def _extract_keywords(kw_model, raw_texts: List[str]) -> List[list]:
+    keywords = kw_model.extract_keywords(
+        raw_texts,
+        keyphrase_ngram_range=(1, 2),
+        stop_words='english',
+        top_n=30
+    )
+    # KeyBERT returns a flat list for a single document
+    if len(raw_texts) == 1 and (not keywords or isinstance(keywords[0], tuple)):
+        keywords = [keywords]
+    return keywords
+
+def extract_skills_batch(documents: Sequence[Tuple[str, str]]) -> List[List[str]]:
+    """Extract skills for many (normalized_text, raw_text) pairs at once.
+
+    spaCy parses the documents with nlp.pipe and KeyBERT embeds them in one
+    batch; noun chunks and keywords are matched through the ontology
+    automaton instead of being compared with every skill.
+    """
+    if not documents:
+        return []
+    matcher = get_reference_data().matcher
+    raw_texts = [raw_text for _, raw_text in documents]
+    skill_sets: List[Set[str]] = [matcher.find_skills(normalized) for normalized, _ in documents]
     
     nlp_model = _load_nlp()
     if nlp_model is not None:
         try:
-            doc = nlp_model(raw_text)
-            for chunk in doc.noun_chunks:
-                chunk_text = chunk.text.lower().strip()
-                if len(chunk_text) > 2 and len(chunk_text) < 50:
-                    for skill in ontology_lower:
-                        if skill in chunk_text or chunk_text in skill:
-                            skills_set.add(skill)
+            docs = nlp_model.pipe(raw_texts, batch_size=_spacy_batch_size(), n_process=_spacy_n_process())
+            for skills_set, doc in zip(skill_sets, docs):
+                skills_set |= _chunk_skills(matcher, doc)
         except Exception:
-            pass
+            # Retry one by one so a single bad document only loses its own chunks
+            for skills_set, raw_text in zip(skill_sets, raw_texts):
+                try:
+                    skills_set |= _chunk_skills(matcher, nlp_model(raw_text))
+                except Exception:
+                    pass
     
     kw_model = _load_keybert()
     if kw_model is not None:
         try:
-            keywords = kw_model.extract_keywords(
-                raw_text,
-                keyphrase_ngram_range=(1, 2),
-                stop_words='english',
-                top_n=30
-            )
-            
-            for keyword, _ in keywords:
-                keyword_lower = keyword.lower().strip()
-                for skill in ontology_lower:
-                    if skill in keyword_lower or keyword_lower in skill:
-                        skills_set.add(skill)
+            batch_keywords = _extract_keywords(kw_model, raw_texts)
         except Exception:
-            pass
+            batch_keywords = []
+            for raw_text in raw_texts:
+                try:
+                    batch_keywords.append(_extract_keywords(kw_model, [raw_text])[0])
+                except Exception:
+                    batch_keywords.append([])
+        for skills_set, keywords in zip(skill_sets, batch_keywords):
+            try:
+                skills_set |= _keyword_skills(matcher, keywords)
+            except Exception:
+                pass
     
-    return list(skills_set)
+    return [list(skills_set) for skills_set in skill_sets]
+
+def extract_skills(normalized_text: str, raw_text: str) -> List[str]:
+    return extract_skills_batch([(normalized_text, raw_text)])[0]
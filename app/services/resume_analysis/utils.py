@@ -1,12 +1,25 @@
 
-from typing import Dict, Optional, List
-import re
+from typing import Dict, Optional
+
+from app.services.reference_data import peek_reference_data
+from app.services.resume_analysis.role_resolver import expand_role_aliases
 
 def match_role(target_role: str, roles_data: Dict) -> Optional[str]:
     """
     Find the best matching role from roles_data using fuzzy matching.
     Returns the canonical role name or None if no match is found.
+
+    For the current reference roles (what _load_roles() returns) this uses
+    the snapshot's prebuilt, memoized RoleResolver. That resolver only
+    knows the roles it was built from, so it is used when `roles_data` is
+    that very mapping. Any other mapping, such as a caller-built dict or
+    the roles of a snapshot that has since been replaced, gets the linear
+    scan below. The result is the same either way; only the speed differs.
     """
+    ref = peek_reference_data()
+    if ref is not None and roles_data is ref.roles:
+        return ref.role_resolver.resolve(target_role)
+
     if not target_role:
         return None
         
@@ -25,16 +38,7 @@ def match_role(target_role: str, roles_data: Dict) -> Optional[str]:
             return role
             
     # 3. Handle common variations (e.g., 'dev' -> 'developer')
-    variations = {
-        'dev': 'developer',
-        'ml': 'machine learning',
-        'fe': 'frontend',
-        'be': 'backend'
-    }
-    
-    augmented_target = target_lower
-    for short, long in variations.items():
-        augmented_target = re.sub(rf'\b{short}\b', long, augmented_target)
+    augmented_target = expand_role_aliases(target_lower)
         
     if augmented_target != target_lower:
         for role in available_roles:
@@ -0,0 +1,281 @@
+"""Vectorized role-fit ranking for the "which jobs can you get" suggestions.
+
+Role requirements are compiled once per reference-data version into
+role x skill count matrices (one per phase), together with a substring
+index over the required-skill vocabulary. Scoring a user maps each of
+their skills to the vocabulary columns it satisfies (memoized per skill),
+then takes a couple of matrix-vector products, instead of a Python loop
+over every role and requirement.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from app.services.memo import LRUCache
+from app.services.reference_data import get_reference_data
+from app.services.readiness import UserSkills, as_match_index, compute_core_fit, compute_role_readiness
+
+try:
+    import numpy as np
+    numpy_available = True
+except Exception:
+    numpy_available = False
+
+try:
+    from scipy import sparse
+    scipy_available = True
+except Exception:
+    scipy_available = False
+
+
+FIT_PHASES: Tuple[str, ...] = ('foundation', 'core')
+READINESS_PHASES: Tuple[str, ...] = ('foundation', 'core', 'advanced', 'projects')
+
+# Vocabulary substrings up to this length are indexed; longer user skills scan
+_MAX_INDEXED_SUBSTRING = 48
+_SKILL_COLUMNS_CACHE_SIZE = 8192
+
+
+def _skill_key(skill) -> str:
+    return str(skill).strip().lower()
+
+
+class RoleFitEngine:
+    """Scores a user's skills against every role at once.
+
+    `fit_weights` optionally weights the fit phases (e.g. foundation
+    skills counting more than core ones); with the default of 1.0 per phase
+    the scores equal `compute_core_fit` / `compute_role_readiness`.
+    """
+
+    def __init__(
+        self,
+        roles_data: Mapping[str, Mapping[str, object]],
+        *,
+        fit_weights: Optional[Dict[str, float]] = None,
+        complete_threshold: float = 0.5,
+    ):
+        self.roles_data = roles_data
+        self.role_names: List[str] = list(roles_data.keys())
+        self.complete_threshold = complete_threshold
+        self.fit_weights = {phase: 1.0 for phase in FIT_PHASES}
+        self.fit_weights.update(fit_weights or {})
+
+        self.vocabulary: List[str] = []
+        self._vocab_index: Dict[str, int] = {}
+        # (role_idx, skill_idx, phase) for every listed requirement
+        entries: List[Tuple[int, int, str]] = []
+        for r, role_name in enumerate(self.role_names):
+            reqs = roles_data[role_name]
+            for phase in READINESS_PHASES:
+                for skill in reqs.get(phase, []) or []:
+                    key = _skill_key(skill)
+                    col = self._vocab_index.get(key)
+                    if col is None:
+                        col = len(self.vocabulary)
+                        self._vocab_index[key] = col
+                        self.vocabulary.append(key)
+                    entries.append((r, col, phase))
+
+        self._entries = entries
+        if numpy_available:
+            self._build_matrices()
+            self._build_vocabulary_index()
+
+    def _matrix(self, phases: Tuple[str, ...], weights: Optional[Dict[str, float]] = None):
+        shape = (len(self.role_names), len(self.vocabulary))
+        rows, cols, data = [], [], []
+        for r, c, phase in self._entries:
+            if phase in phases:
+                rows.append(r)
+                cols.append(c)
+                data.append(weights[phase] if weights else 1.0)
+
+        if scipy_available:
+            # Duplicate (row, col) entries are summed, matching repeated requirements
+            return sparse.csr_matrix((data, (rows, cols)), shape=shape, dtype=np.float64)
+
+        dense = np.zeros(shape, dtype=np.float64)
+        np.add.at(dense, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)), data)
+        return dense
+
+    def _build_matrices(self) -> None:
+        self._fit_counts = self._matrix(FIT_PHASES)
+        if all(self.fit_weights[phase] == 1.0 for phase in FIT_PHASES):
+            self._fit_weighted = self._fit_counts
+        else:
+            self._fit_weighted = self._matrix(FIT_PHASES, self.fit_weights)
+        self._readiness_counts = self._matrix(READINESS_PHASES)
+
+        self._fit_totals = np.asarray(self._fit_counts.sum(axis=1)).ravel()
+        self._fit_weight_totals = np.asarray(self._fit_weighted.sum(axis=1)).ravel()
+        self._readiness_totals = np.asarray(self._readiness_counts.sum(axis=1)).ravel()
+
+    def _build_vocabulary_index(self) -> None:
+        # substring -> columns whose key contains it, stored as slices of
+        # one flat array (a dict of small arrays costs far more memory)
+        containing: Dict[str, List[int]] = {}
+        for col, key in enumerate(self.vocabulary):
+            n = len(key)
+            subs = {
+                key[start:end]
+                for start in range(n)
+                for end in range(start + 1, min(n, start + _MAX_INDEXED_SUBSTRING) + 1)
+            }
+            for sub in subs:
+                containing.setdefault(sub, []).append(col)
+
+        self._substring_slices: Dict[str, Tuple[int, int]] = {}
+        flat: List[int] = []
+        for sub, cols in containing.items():
+            self._substring_slices[sub] = (len(flat), len(flat) + len(cols))
+            flat.extend(cols)
+        self._substring_cols = np.asarray(flat, dtype=np.intp)
+
+        self._key_lengths = sorted({len(key) for key in self.vocabulary if key})
+        self._long_keys = [
+            (col, key) for col, key in enumerate(self.vocabulary) if len(key) > _MAX_INDEXED_SUBSTRING
+        ]
+        self._nonempty_cols = np.asarray([col for col, key in enumerate(self.vocabulary) if key], dtype=np.intp)
+        self._empty_cols = np.asarray([col for col, key in enumerate(self.vocabulary) if not key], dtype=np.intp)
+        self._skill_columns = LRUCache(maxsize=_SKILL_COLUMNS_CACHE_SIZE)
+
+    def _containment_columns(self, user_skill: str):
+        """Columns whose key contains `user_skill` or is contained in it."""
+        cols = self._skill_columns.get(user_skill)
+        if cols is not None:
+            return cols
+
+        if not user_skill:
+            cols = self._nonempty_cols
+        else:
+            found = set()
+            # key contains user_skill
+            if len(user_skill) <= _MAX_INDEXED_SUBSTRING:
+                span = self._substring_slices.get(user_skill)
+                if span is not None:
+                    found.update(self._substring_cols[span[0]:span[1]].tolist())
+            else:
+                found.update(col for col, key in self._long_keys if user_skill in key)
+            # user_skill contains key
+            vocab_index = self._vocab_index
+            n = len(user_skill)
+            for length in self._key_lengths:
+                if length > n:
+                    break
+                for start in range(n - length + 1):
+                    col = vocab_index.get(user_skill[start:start + length])
+                    if col is not None:
+                        found.add(col)
+            cols = np.asarray(sorted(found), dtype=np.intp)
+
+        self._skill_columns.set(user_skill, cols)
+        return cols
+
+    def _complete_vector(self, index):
+        """1.0 for each vocabulary skill the user has at or above the threshold.
+
+        Same result as `index.lookup` per column: an exact match wins,
+        otherwise the first user skill (in index order) that contains or is
+        contained in the requirement.
+        """
+        user_skills = index.skills
+        confidence = np.full(len(self.vocabulary), np.nan)
+        for user_skill, conf in user_skills.items():
+            cols = self._containment_columns(user_skill)
+            if len(cols):
+                unset = cols[np.isnan(confidence[cols])]
+                confidence[unset] = conf
+        vocab_index = self._vocab_index
+        for user_skill, conf in user_skills.items():
+            col = vocab_index.get(user_skill)
+            if col is not None:
+                confidence[col] = conf
+        # Blank requirements never match
+        confidence[self._empty_cols] = np.nan
+
+        with np.errstate(invalid='ignore'):
+            return (confidence >= self.complete_threshold).astype(np.float64)
+
+    def top_roles(self, user_skill_conf: UserSkills, k: int = 5) -> List[Dict[str, object]]:
+        """Return the `k` best-fitting roles with fit and projected readiness."""
+        index = as_match_index(user_skill_conf)
+        if not numpy_available:
+            return self._top_roles_python(index, k)
+        if not self.role_names:
+            return []
+
+        complete = self._complete_vector(index)
+        matched = np.asarray(self._fit_counts @ complete).ravel()
+        if self._fit_weighted is self._fit_counts:
+            weighted = matched
+        else:
+            weighted = np.asarray(self._fit_weighted @ complete).ravel()
+        ready = np.asarray(self._readiness_counts @ complete).ravel()
+
+        eligible = self._fit_totals > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fit = np.where(eligible, weighted / self._fit_weight_totals * 100, -1.0)
+
+        # Scores are rounded with Python's round(), as in compute_core_fit,
+        # and ranked on the rounded value (stable, so ties keep roles-table
+        # order). Only roles within 0.01 of the k-th best unrounded score can
+        # round into the top k, and each distinct score is rounded once.
+        n_eligible = int(eligible.sum())
+        if k <= 0 or n_eligible == 0:
+            return []
+        top = min(k, n_eligible)
+        kth = -np.partition(-fit, top - 1)[top - 1]
+        candidates = np.flatnonzero(eligible & (fit >= kth - 0.01))
+        values, inverse = np.unique(fit[candidates], return_inverse=True)
+        rounded = np.asarray([round(float(v), 2) for v in values])[inverse]
+        ranked = np.lexsort((candidates, -rounded))[:top]
+        scored = [(float(rounded[i]), int(candidates[i])) for i in ranked]
+
+        results: List[Dict[str, object]] = []
+        for fit_score, r in scored:
+            readiness_total = int(self._readiness_totals[r])
+            results.append({
+                'role': self.role_names[r],
+                'fit_score': fit_score,
+                'matched_required': int(matched[r]),
+                'total_required': int(self._fit_totals[r]),
+                'projected_readiness_score': (
+                    round((int(ready[r]) / readiness_total) * 100, 2) if readiness_total > 0 else 0.0
+                ),
+            })
+        return results
+
+    def _top_roles_python(self, index, k: int) -> List[Dict[str, object]]:
+        suggested: List[Dict[str, object]] = []
+        for role_name, reqs in self.roles_data.items():
+            core_fit = compute_core_fit(reqs, index, complete_threshold=self.complete_threshold)
+            if core_fit['total_required'] <= 0:
+                continue
+            projected = compute_role_readiness(reqs, index, complete_threshold=self.complete_threshold)
+            suggested.append({
+                'role': role_name,
+                'fit_score': core_fit['fit_score'],
+                'matched_required': core_fit['matched_required'],
+                'total_required': core_fit['total_required'],
+                'projected_readiness_score': projected['readiness_score'],
+            })
+        suggested.sort(key=lambda r: r['fit_score'], reverse=True)
+        return suggested[:k]
+
+
+_engine_lock = threading.Lock()
+_engine: Optional[RoleFitEngine] = None
+_engine_version: Optional[str] = None
+
+
+def get_role_fit_engine() -> RoleFitEngine:
+    """Return the engine for the current reference data, rebuilding it on change."""
+    global _engine, _engine_version
+    ref = get_reference_data()
+    with _engine_lock:
+        if _engine is None or _engine_version != ref.version:
+            _engine = RoleFitEngine(ref.roles)
+            _engine_version = ref.version
+        return _engine
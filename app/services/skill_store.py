@@ -0,0 +1,201 @@
+"""Set-based writes to `user_skills`.
+
+Incoming skills are staged into a temporary table with `executemany` and
+merged with one UPDATE and one INSERT ... SELECT, instead of an UPDATE plus
+a conditional INSERT per skill. A skill matches an existing row on
+(skill_name, sector_context), with NULL contexts matching each other. The
+merge gives the same result as applying the skills one at a time in order:
+a skill listed twice is inserted once and then updated by its later
+entries.
+"""
+import json
+from itertools import islice
+from typing import Dict, Iterable, List, Tuple
+
+STATUS_INSERTED = 'inserted'
+STATUS_UPDATED = 'updated'
+STATUS_INVALID = 'invalid'
+
+_STAGE_CHUNK_SIZE = 1000
+
+
+class InvalidSkill(ValueError):
+    pass
+
+
+def skill_row(skill) -> Tuple:
+    """(skill_name, sector_context, confidence, source, acquired_date, evidence) for a request skill."""
+    if skill is None:
+        raise InvalidSkill('invalid JSON')
+    if not isinstance(skill, dict):
+        raise InvalidSkill('skill must be an object')
+
+    skill_name = skill.get('skill_name')
+    if skill_name is None:
+        raise InvalidSkill('skill_name is required')
+    if not isinstance(skill_name, str):
+        raise InvalidSkill('skill_name must be a string')
+
+    confidence = skill.get('confidence', 0.5)
+    if confidence is not None:
+        try:
+            confidence = float(confidence)
+        except (TypeError, ValueError):
+            raise InvalidSkill('confidence must be a number')
+        if not 0.0 <= confidence <= 1.0:
+            raise InvalidSkill('confidence must be between 0 and 1')
+
+    return (
+        skill_name,
+        skill.get('sector_context'),
+        confidence,
+        skill.get('source', 'manual'),
+        skill.get('acquired_date'),
+        json.dumps(skill.get('evidence', [])),
+    )
+
+
+def _create_stage(conn) -> None:
+    conn.execute('DROP TABLE IF EXISTS temp.skill_stage')
+    conn.execute("""
+        CREATE TEMP TABLE skill_stage (
+            seq INTEGER PRIMARY KEY,
+            skill_name TEXT NOT NULL,
+            sector_context TEXT,
+            confidence REAL,
+            source TEXT,
+            acquired_date TEXT,
+            evidence TEXT,
+            status TEXT
+        )
+    """)
+    conn.execute('CREATE INDEX temp.idx_skill_stage_key ON skill_stage(skill_name, sector_context, seq)')
+
+
+def _stage(conn, skills: Iterable, invalid: List[Dict]) -> int:
+    """Insert valid skills into the stage in chunks; returns the number of skills seen."""
+    count = 0
+
+    def rows():
+        nonlocal count
+        for index, skill in enumerate(skills):
+            count = index + 1
+            try:
+                yield (index, *skill_row(skill))
+            except InvalidSkill as e:
+                invalid.append({
+                    'index': index,
+                    'skill_name': skill.get('skill_name') if isinstance(skill, dict) else None,
+                    'status': STATUS_INVALID,
+                    'error': str(e),
+                })
+
+    staged = rows()
+    while True:
+        chunk = list(islice(staged, _STAGE_CHUNK_SIZE))
+        if not chunk:
+            break
+        conn.executemany("""
+            INSERT INTO skill_stage
+                (seq, skill_name, sector_context, confidence, source, acquired_date, evidence)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, chunk)
+    return count
+
+
+def upsert_user_skills(conn, user_id: str, skills: Iterable) -> Dict:
+    """Insert or update `skills` for `user_id` on `conn`; the caller commits.
+
+    `skills` may be any iterable (e.g. a parsed NDJSON stream); it is
+    consumed once. Invalid entries are skipped. Returns counts plus a
+    per-entry `results` list, ordered by position in the input.
+    """
+    invalid: List[Dict] = []
+    _create_stage(conn)
+    try:
+        total = _stage(conn, skills, invalid)
+
+        # Outcomes first: an entry updates if its key already exists or
+        # appeared earlier in the batch
+        conn.execute("""
+            UPDATE skill_stage SET status = CASE
+                WHEN EXISTS (
+                    SELECT 1 FROM user_skills u
+                    WHERE u.user_id = ? AND u.skill_name = skill_stage.skill_name
+                      AND u.sector_context IS skill_stage.sector_context
+                ) OR EXISTS (
+                    SELECT 1 FROM skill_stage p
+                    WHERE p.skill_name = skill_stage.skill_name
+                      AND p.sector_context IS skill_stage.sector_context
+                      AND p.seq < skill_stage.seq
+                ) THEN ? ELSE ? END
+        """, (user_id, STATUS_UPDATED, STATUS_INSERTED))
+
+        # Existing rows take the last staged values for their key
+        conn.execute("""
+            UPDATE user_skills SET (confidence, source, evidence) = (
+                SELECT s.confidence, s.source, s.evidence FROM skill_stage s
+                WHERE s.skill_name = user_skills.skill_name
+                  AND s.sector_context IS user_skills.sector_context
+                ORDER BY s.seq DESC LIMIT 1
+            )
+            WHERE user_id = ? AND EXISTS (
+                SELECT 1 FROM skill_stage s
+                WHERE s.skill_name = user_skills.skill_name
+                  AND s.sector_context IS user_skills.sector_context
+            )
+        """, (user_id,))
+
+        # New keys: acquired_date from the first entry, the rest from the last
+        conn.execute("""
+            INSERT INTO user_skills
+                (user_id, skill_name, sector_context, confidence, source, acquired_date, evidence)
+            SELECT ?, f.skill_name, f.sector_context, l.confidence, l.source, f.acquired_date, l.evidence
+            FROM skill_stage f
+            JOIN skill_stage l ON l.seq = (
+                SELECT MAX(x.seq) FROM skill_stage x
+                WHERE x.skill_name = f.skill_name AND x.sector_context IS f.sector_context
+            )
+            WHERE f.status = ?
+            ORDER BY f.seq
+        """, (user_id, STATUS_INSERTED))
+
+        results = [
+            {
+                'index': row['seq'],
+                'skill_name': row['skill_name'],
+                'sector_context': row['sector_context'],
+                'status': row['status'],
+            }
+            for row in conn.execute('SELECT seq, skill_name, sector_context, status FROM skill_stage ORDER BY seq')
+        ]
+    finally:
+        conn.execute('DROP TABLE IF EXISTS temp.skill_stage')
+
+    if invalid:
+        results = sorted(results + invalid, key=lambda r: r['index'])
+    inserted = sum(1 for r in results if r['status'] == STATUS_INSERTED)
+    updated = sum(1 for r in results if r['status'] == STATUS_UPDATED)
+    return {
+        'total': total,
+        'inserted': inserted,
+        'updated': updated,
+        'invalid': len(invalid),
+        'results': results,
+    }
+
+
+def iter_ndjson(stream) -> Iterable:
+    """Yield one parsed object per non-blank line of a binary NDJSON stream.
+
+    Lines that are not valid JSON are yielded as None, so they keep their
+    position and are reported as invalid.
+    """
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
@@ -0,0 +1,169 @@
+"""Materialized readiness for each user's target role.
+
+Readiness, core fit and per-phase status are stored in `user_readiness`
+and re-materialized by every endpoint that writes a user's skills or target
+role, right after its write commits. Profile reads are then a single keyed
+row fetch. Triggers on `user_skills` and `users` drop the row inside the
+writing transaction itself, so a write that is not followed by a refresh
+(another code path, a failed refresh) still never leaves a stale row behind;
+rows computed against older reference data are treated as stale too. Either
+way the next read recomputes it.
+"""
+import json
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.database import ensure_schema
+from app.services.readiness import (
+    SkillMatchIndex,
+    build_skill_conf_map_from_rows,
+    compute_core_fit,
+    compute_role_readiness,
+)
+from app.services.reference_data import get_reference_data
+from app.services.resume_analysis.utils import match_role
+
+PHASES = ('foundation', 'core', 'advanced', 'projects')
+COMPLETE_THRESHOLD = 0.5
+
+
+def _resolve_role(target_role: str, roles_data) -> str:
+    matched_role = match_role(target_role, roles_data) or target_role
+    if matched_role not in roles_data and 'software engineer' in roles_data:
+        matched_role = 'software engineer'
+    return matched_role
+
+
+def _phase_status(role_requirements, index: SkillMatchIndex) -> Dict[str, Dict[str, int]]:
+    phases = {}
+    for phase in PHASES:
+        counts = {'complete': 0, 'weak': 0, 'missing': 0}
+        for required_skill in role_requirements.get(phase, []) or []:
+            c = index.lookup(str(required_skill))
+            if c is None:
+                counts['missing'] += 1
+            elif c < COMPLETE_THRESHOLD:
+                counts['weak'] += 1
+            else:
+                counts['complete'] += 1
+        phases[phase] = counts
+    return phases
+
+
+def _row_to_readiness(row) -> Dict:
+    return {
+        'skills_total': row['skills_total'],
+        'skills_complete': row['skills_complete'],
+        'skills_weak': row['skills_weak'],
+        'skills_missing': row['skills_missing'],
+        'readiness_score': row['readiness_score'],
+        'target_role': row['matched_role'],
+        'core_fit': {
+            'fit_score': row['fit_score'],
+            'matched_required': row['matched_required'],
+            'total_required': row['total_required'],
+        },
+        'phases': json.loads(row['phase_status']),
+    }
+
+
+def refresh_user_readiness(conn, user_id: str) -> Optional[Dict]:
+    """Recompute and store the readiness row for `user_id`, in its own transaction.
+
+    Call it after the triggering write has been committed. Returns the
+    stored record, or None when the user does not exist.
+    """
+    ensure_schema()
+    # Before taking the write lock: a snapshot reload may need to write too
+    ref = get_reference_data()
+
+    # Skills are read and the row written under one write lock, so a
+    # concurrent skill write cannot slip in between and be overwritten
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        record = _refresh(conn, ref, user_id)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return record
+
+
+def after_skills_write(conn, user_id: str) -> None:
+    """Refresh `user_id`'s readiness after a committed write to their skills or target role.
+
+    A failed refresh does not fail the write: the row was already dropped by
+    the triggers, so the next read recomputes it.
+    """
+    try:
+        refresh_user_readiness(conn, user_id)
+    except Exception as e:
+        print(f"Readiness refresh failed for user {user_id}: {e}")
+
+
+def _refresh(conn, ref, user_id: str) -> Optional[Dict]:
+    user = conn.execute('SELECT target_role FROM users WHERE user_id = ?', (user_id,)).fetchone()
+    if not user:
+        conn.execute('DELETE FROM user_readiness WHERE user_id = ?', (user_id,))
+        return None
+
+    # Same row order as the profile's skill list: it decides which skill a
+    # fuzzy requirement match picks
+    rows = conn.execute("""
+        SELECT skill_name, confidence
+        FROM user_skills WHERE user_id = ?
+        ORDER BY confidence DESC
+    """, (user_id,)).fetchall()
+
+    target_role = (user['target_role'] or 'software engineer').strip()
+    matched_role = _resolve_role(target_role, ref.roles)
+    role_requirements = ref.roles.get(matched_role, {})
+
+    index = SkillMatchIndex(build_skill_conf_map_from_rows(dict(row) for row in rows))
+    readiness = compute_role_readiness(role_requirements, index, complete_threshold=COMPLETE_THRESHOLD)
+    core_fit = compute_core_fit(role_requirements, index, complete_threshold=COMPLETE_THRESHOLD)
+    phases = _phase_status(role_requirements, index)
+
+    conn.execute("""
+        INSERT INTO user_readiness
+            (user_id, target_role, matched_role, reference_version,
+             skills_total, skills_complete, skills_weak, skills_missing, readiness_score,
+             fit_score, matched_required, total_required, phase_status, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(user_id) DO UPDATE SET
+            target_role = excluded.target_role,
+            matched_role = excluded.matched_role,
+            reference_version = excluded.reference_version,
+            skills_total = excluded.skills_total,
+            skills_complete = excluded.skills_complete,
+            skills_weak = excluded.skills_weak,
+            skills_missing = excluded.skills_missing,
+            readiness_score = excluded.readiness_score,
+            fit_score = excluded.fit_score,
+            matched_required = excluded.matched_required,
+            total_required = excluded.total_required,
+            phase_status = excluded.phase_status,
+            updated_at = excluded.updated_at
+    """, (
+        user_id, target_role, matched_role, ref.version,
+        readiness['skills_total'], readiness['skills_complete'], readiness['skills_weak'],
+        readiness['skills_missing'], readiness['readiness_score'],
+        core_fit['fit_score'], core_fit['matched_required'], core_fit['total_required'],
+        json.dumps(phases), datetime.now().isoformat(),
+    ))
+
+    return {
+        **readiness,
+        'target_role': matched_role,
+        'core_fit': core_fit,
+        'phases': phases,
+    }
+
+
+def get_user_readiness(conn, user_id: str) -> Optional[Dict]:
+    """Materialized readiness for `user_id`, recomputed when missing or stale."""
+    ensure_schema()
+    row = conn.execute('SELECT * FROM user_readiness WHERE user_id = ?', (user_id,)).fetchone()
+    if row and row['reference_version'] == get_reference_data().version:
+        return _row_to_readiness(row)
+    return refresh_user_readiness(conn, user_id)
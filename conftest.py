@@ -0,0 +1,48 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+
+import pytest
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def pytest_configure(config):
+    """Point the app at a scratch copy of skillgenome.db, so tests never write the committed file."""
+    if os.getenv('SKILLGENOME_DB_PATH'):
+        return
+    scratch = tempfile.mkdtemp(prefix='skillgenome-tests-')
+    path = os.path.join(scratch, 'skillgenome.db')
+    committed = os.path.join(_ROOT, 'skillgenome.db')
+    if os.path.exists(committed):
+        shutil.copyfile(committed, path)
+    os.environ['SKILLGENOME_DB_PATH'] = path
+    config._skillgenome_scratch = scratch
+
+
+def pytest_unconfigure(config):
+    scratch = getattr(config, '_skillgenome_scratch', None)
+    if scratch:
+        os.environ.pop('SKILLGENOME_DB_PATH', None)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+@pytest.fixture
+def make_db():
+    """Factory for in-memory databases with app/schema.sql and users u1 and u2."""
+    connections = []
+
+    def factory():
+        conn = sqlite3.connect(':memory:')
+        conn.row_factory = sqlite3.Row
+        with open('app/schema.sql', encoding='utf-8') as f:
+            conn.executescript(f.read())
+        conn.execute("INSERT INTO users (user_id, username, email) VALUES "
+                     "('u1', 'one', 'one@example.com'), ('u2', 'two', 'two@example.com')")
+        connections.append(conn)
+        return conn
+
+    yield factory
+    for conn in connections:
+        conn.close()
@@ -10,6 +10,7 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from app.main import app
+from app.database import ensure_schema
 from app.init_db import init_database
 
 def start_server():
@@ -27,6 +28,7 @@ def start_server():
         init_database()
     else:
         print("\nDatabase found")
+    ensure_schema()
     
     print("\nStarting Flask Server...")
     print("=" * 70)
@@ -0,0 +1,111 @@
+import random
+import sqlite3
+
+import pytest
+
+from app.services.resume_analysis.course_index import CourseIndex
+from app.services.resume_analysis.ontology_matcher import FirstContainmentIndex
+
+
+def reference_first(names, query):
+    """First name containing the query, or contained in it."""
+    for name in names:
+        if query in name or name in query:
+            return name
+    return None
+
+
+NAMES = ['machine learning', 'python', 'sql', 'c', 'react native', 'react', 'Go ', 'data\x00base', '']
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('python', 'python'),
+    ('python 3', 'python'),                 # name in query
+    ('learning', 'machine learning'),       # query in name
+    ('postgresql', 'sql'),                  # earlier than 'c'
+    ('native', 'react native'),
+    ('go', ''),                             # 'Go ' keeps its case and space
+    ('Go lang', 'Go '),
+    ('rust', ''),                           # '' is contained in every query
+    ('', 'machine learning'),
+    ('data', 'data\x00base'),
+])
+def test_first_containment_table(query, expected):
+    assert reference_first(NAMES, query) == expected
+    assert FirstContainmentIndex(NAMES).first(query) == expected
+
+
+def test_first_containment_matches_reference_on_random_inputs():
+    rng = random.Random(7)
+    alphabet = 'abcd '
+    for _ in range(300):
+        names = [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 5))) for _ in range(rng.randint(0, 10))]
+        index = FirstContainmentIndex(names)
+        for _ in range(20):
+            query = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 7)))
+            assert index.first(query) == reference_first(names, query), (query, names)
+
+
+COURSES = [
+    ('Python', 'Coursera', 'Python for Everybody', 'https://example.com/py1', None),
+    ('python', 'edX', 'Python in Healthcare', 'https://example.com/py2', 'Healthcare'),
+    (' Python ', 'Udemy', 'Python Bootcamp', 'https://example.com/py3', 'Technology'),
+    ('SQL', 'Udemy', 'SQL for Farmers', 'https://example.com/sql1', 'Agriculture'),
+    ('SQL', 'Coursera', 'SQL for Clinicians', 'https://example.com/sql2', 'healthcare'),
+    ('Docker', 'Udemy', 'Docker Basics', 'https://example.com/docker', 'Urban'),
+]
+
+
+@pytest.fixture
+def courses_db():
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE courses (id INTEGER PRIMARY KEY AUTOINCREMENT, skill TEXT, platform TEXT, '
+                 'title TEXT, url TEXT, sector TEXT)')
+    conn.executemany('INSERT INTO courses (skill, platform, title, url, sector) VALUES (?, ?, ?, ?, ?)', COURSES)
+    yield conn
+    conn.close()
+
+
+def course_index():
+    courses_data = {}
+    for skill, platform, title, url, sector in COURSES:
+        courses_data.setdefault(skill, []).append({'platform': platform, 'title': title, 'url': url, 'sector': sector})
+    return CourseIndex(courses_data)
+
+
+def reference_courses_for(conn, skill, limit):
+    """Courses for a skill straight from SQL, oldest first."""
+    rows = conn.execute('SELECT platform, title, url FROM courses WHERE LOWER(TRIM(skill)) = LOWER(TRIM(?)) '
+                        'ORDER BY id LIMIT ?', (skill, limit)).fetchall()
+    return [tuple(row) for row in rows]
+
+
+def reference_course_for_sector(conn, skill, sector):
+    """Sector match, untagged or Technology course, else any course for the skill."""
+    row = conn.execute("SELECT platform, title, url FROM courses WHERE LOWER(TRIM(skill)) = LOWER(TRIM(?)) "
+                       "AND (LOWER(sector) = LOWER(?) OR sector IS NULL OR sector = 'Technology') ORDER BY id LIMIT 1",
+                       (skill, sector)).fetchone()
+    if row is None:
+        row = conn.execute('SELECT platform, title, url FROM courses WHERE LOWER(TRIM(skill)) = LOWER(TRIM(?)) '
+                           'ORDER BY id LIMIT 1', (skill,)).fetchone()
+    return tuple(row) if row else None
+
+
+@pytest.mark.parametrize('skill', ['python', 'PYTHON ', 'sql', 'docker', 'rust', 'pyth'])
+@pytest.mark.parametrize('limit', [1, 2, 5])
+def test_courses_for_matches_pathway_query(courses_db, skill, limit):
+    found = [(c.platform, c.title, c.url) for c in course_index().courses_for(skill, limit)]
+    assert found == reference_courses_for(courses_db, skill, limit)
+
+
+@pytest.mark.parametrize('skill', ['sql', 'SQL', 'docker', 'rust'])
+@pytest.mark.parametrize('sector', ['Healthcare', 'HEALTHCARE', 'Agriculture', 'Urban', 'Finance', None])
+def test_course_for_sector_matches_gap_analysis_queries(courses_db, skill, sector):
+    course = course_index().course_for_sector(skill, sector)
+    found = (course.platform, course.title, course.url) if course else None
+    assert found == reference_course_for_sector(courses_db, skill, sector)
+
+
+def test_untagged_and_technology_courses_suit_every_sector(courses_db):
+    course = course_index().course_for_sector('python', 'Agriculture')
+    assert course.title == 'Python for Everybody'
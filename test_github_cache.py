@@ -0,0 +1,215 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from app import database
+from app.integrations import github, github_cache
+
+REPOS = [
+    {"name": "alpha", "language": "Python", "html_url": "https://github.com/octo/alpha",
+     "updated_at": "2024-01-01T00:00:00Z", "languages_url": None},
+    {"name": "beta", "language": "Go", "html_url": "https://github.com/octo/beta",
+     "updated_at": "2024-01-02T00:00:00Z", "languages_url": None},
+]
+
+# 250 repos for "many", one hour apart, most recently updated first
+_NEWEST = datetime(2024, 6, 1, tzinfo=timezone.utc)
+MANY_REPOS = [
+    {"name": f"repo{i}", "language": "Python", "html_url": f"https://github.com/many/repo{i}",
+     "updated_at": (_NEWEST - timedelta(hours=i)).strftime("%Y-%m-%dT%H:%M:%SZ"), "languages_url": None}
+    for i in range(250)
+]
+
+
+class StubGitHub(BaseHTTPRequestHandler):
+    """Serves /users/<name>/repos with an ETag and honours If-None-Match.
+
+    "many" is paginated 100 per page with a Link header, like GitHub.
+    """
+
+    protocol_version = "HTTP/1.1"
+    requests_seen = []
+
+    def do_GET(self):
+        if_none_match = self.headers.get("If-None-Match")
+        self.requests_seen.append((self.path, if_none_match))
+
+        if self.path.startswith("/users/many/repos"):
+            self._send_page()
+        elif self.path.startswith("/users/garbled/repos"):
+            self._send(200, b"<html>not json</html>")
+        elif not self.path.startswith("/users/octo/repos"):
+            self._send(404, b'{"message": "Not Found"}')
+        elif if_none_match == '"v1"':
+            self._send(304, b"")
+        else:
+            self._send(200, json.dumps(REPOS).encode(), {"ETag": '"v1"'})
+
+    def _send_page(self):
+        page = int(parse_qs(urlparse(self.path).query).get("page", ["1"])[0])
+        body = json.dumps(MANY_REPOS[(page - 1) * 100:page * 100]).encode()
+        headers = {}
+        if page * 100 < len(MANY_REPOS):
+            next_url = f"http://{self.headers['Host']}/users/many/repos?per_page=100&sort=updated&page={page + 1}"
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        self._send(200, body, headers)
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    StubGitHub.requests_seen = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGitHub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def github_env(tmp_path, monkeypatch, stub_server):
+    db_path = tmp_path / "github_cache.db"
+    with open("app/schema.sql", encoding="utf-8") as f:
+        schema = f.read()
+    conn = sqlite3.connect(db_path)
+    conn.executescript(schema)
+    conn.close()
+
+    monkeypatch.setenv("SKILLGENOME_DB_PATH", str(db_path))
+    monkeypatch.setenv("GITHUB_API_URL", f"http://127.0.0.1:{stub_server.server_address[1]}")
+    monkeypatch.setenv("GITHUB_CACHE_ENABLED", "true")
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    # Fresh pool so no connection to another database is reused
+    monkeypatch.setattr(database, "_pool", database.ConnectionPool())
+    monkeypatch.setattr(github, "_rate_limit", {"remaining": None, "reset": None})
+    return db_path
+
+
+def test_fresh_entry_is_served_without_a_request(github_env, monkeypatch):
+    monkeypatch.setenv("GITHUB_CACHE_TTL_SECONDS", "600")
+
+    first, err = github.fetch_user_repos("octo")
+    second, err2 = github.fetch_user_repos("octo")
+
+    assert err is None and err2 is None
+    assert first == second == REPOS
+    assert len(StubGitHub.requests_seen) == 1
+
+
+def test_stale_entry_is_revalidated_with_etag(github_env, monkeypatch):
+    monkeypatch.setenv("GITHUB_CACHE_TTL_SECONDS", "0")
+
+    first, _ = github.fetch_user_repos("octo")
+    second, err = github.fetch_user_repos("octo")
+
+    assert err is None
+    assert second == first == REPOS
+    assert [inm for _, inm in StubGitHub.requests_seen] == [None, '"v1"']
+
+
+def test_cache_is_persistent(github_env, monkeypatch):
+    monkeypatch.setenv("GITHUB_CACHE_TTL_SECONDS", "600")
+    github.fetch_user_repos("octo")
+
+    # A new process would start with an empty pool; the entry is in the database
+    monkeypatch.setattr(database, "_pool", database.ConnectionPool())
+    repos, err = github.fetch_user_repos("octo")
+
+    assert err is None and repos == REPOS
+    assert len(StubGitHub.requests_seen) == 1
+
+
+def test_lru_eviction_respects_entry_budget(github_env, monkeypatch):
+    monkeypatch.setenv("GITHUB_CACHE_MAX_ENTRIES", "1")
+
+    github_cache.store("k1", b"[1]", None, None)
+    github_cache.store("k2", b"[2]", None, None)
+
+    assert github_cache.lookup("k1") is None
+    assert github_cache.lookup("k2")["body"] == b"[2]"
+
+
+def test_errors_are_not_cached(github_env, monkeypatch):
+    monkeypatch.setenv("GITHUB_CACHE_TTL_SECONDS", "600")
+
+    for _ in range(2):
+        repos, err = github.fetch_user_repos("nobody")
+        assert repos is None and err == {"error": "GitHub user not found"}
+
+    assert len(StubGitHub.requests_seen) == 2
+
+
+def test_pages_are_followed_through_link_headers(github_env, monkeypatch):
+    monkeypatch.setenv("GITHUB_CACHE_TTL_SECONDS", "600")
+
+    repos, err = github.fetch_user_repos("many")
+
+    assert err is None and repos == MANY_REPOS
+    assert len(StubGitHub.requests_seen) == 3
+
+    # Served from the cache, Link headers included
+    repos, err = github.fetch_user_repos("many")
+    assert repos == MANY_REPOS
+    assert len(StubGitHub.requests_seen) == 3
+
+
+def test_pagination_stops_at_the_project_limit(github_env):
+    data = github.import_github_profile("many", project_limit=10)
+
+    assert [p["name"] for p in data["projects"]] == [f"repo{i}" for i in range(10)]
+    assert data["total_repos"] == 100
+    assert len(StubGitHub.requests_seen) == 1
+
+    # The first page is still cached; only the second is requested
+    repos, _ = github.fetch_user_repos("many", limit=150)
+    assert len(repos) == 150
+    assert [path for path, _ in StubGitHub.requests_seen][1:] == [
+        "/users/many/repos?per_page=100&sort=updated&page=2"
+    ]
+
+
+def test_incremental_listing_stops_at_the_last_sync(github_env):
+    since = MANY_REPOS[119]["updated_at"]
+
+    data = github.import_github_profile("many", project_limit=1000, since=since)
+
+    assert [p["name"] for p in data["projects"]] == [f"repo{i}" for i in range(120)]
+    assert data["incremental"] is True
+    assert len(StubGitHub.requests_seen) == 2
+
+
+def test_connection_errors_keep_the_error_shape(github_env, monkeypatch):
+    # Nothing listens on the port of a server that has been closed
+    closed = ThreadingHTTPServer(("127.0.0.1", 0), StubGitHub)
+    port = closed.server_address[1]
+    closed.server_close()
+    monkeypatch.setenv("GITHUB_API_URL", f"http://127.0.0.1:{port}")
+
+    repos, err = github.fetch_user_repos("octo")
+    data = github.import_github_profile("octo")
+
+    assert repos is None and err["error"].startswith("GitHub API request failed")
+    assert data["error"].startswith("GitHub API request failed") and data["projects"] == []
+
+
+def test_non_json_pages_are_reported_as_unexpected(github_env):
+    repos, err = github.fetch_user_repos("garbled")
+
+    assert repos is None and err == {"error": "GitHub API returned unexpected response"}
@@ -0,0 +1,140 @@
+import pytest
+
+from app.services.import_writer import ImportWriter
+
+SKILL_COLUMNS = 'skill_name, sector_context, confidence, source, evidence'
+
+
+@pytest.fixture
+def import_db(make_db):
+    def factory(existing_skills=()):
+        conn = make_db()
+        conn.executemany(f'INSERT INTO user_skills (user_id, {SKILL_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)',
+                         existing_skills)
+        return conn
+    return factory
+
+
+def skills_table(conn, user_id='u1'):
+    return [tuple(row) for row in conn.execute(
+        f'SELECT {SKILL_COLUMNS} FROM user_skills WHERE user_id = ? ORDER BY id', (user_id,)
+    )]
+
+
+LINKEDIN_PYTHON = ('u1', 'Python', None, 0.5, 'linkedin', '["old"]')
+
+
+# (existing rows, refresh_skills, skills to add, expected u1 rows, expected counts)
+SKILL_CASES = {
+    'new skills are inserted': (
+        [], True,
+        [('Python', None, 0.8, 'linkedin', ['a']), ('Go', 'GitHub', 0.6, 'github', ['repo'])],
+        [('Python', None, 0.8, 'linkedin', '["a"]'), ('Go', 'GitHub', 0.6, 'github', '["repo"]')],
+        {'inserted': 2, 'updated': 0, 'skipped': 0},
+    ),
+    'same source, NULL context: refreshed, not duplicated': (
+        [LINKEDIN_PYTHON], True,
+        [('Python', None, 0.9, 'linkedin', ['new'])],
+        [('Python', None, 0.9, 'linkedin', '["new"]')],
+        {'inserted': 0, 'updated': 1, 'skipped': 0},
+    ),
+    'same source, with context: refreshed': (
+        [('u1', 'Go', 'GitHub', 0.3, 'github', '[]')], True,
+        [('Go', 'GitHub', 0.7, 'github', ['repo'])],
+        [('Go', 'GitHub', 0.7, 'github', '["repo"]')],
+        {'inserted': 0, 'updated': 1, 'skipped': 0},
+    ),
+    'unchanged values: skipped': (
+        [LINKEDIN_PYTHON], True,
+        [('Python', None, 0.5, 'linkedin', ['old'])],
+        [('Python', None, 0.5, 'linkedin', '["old"]')],
+        {'inserted': 0, 'updated': 0, 'skipped': 1},
+    ),
+    'other source, NULL context: left alone': (
+        [('u1', 'Python', None, 0.2, 'manual', '[]')], True,
+        [('Python', None, 0.9, 'linkedin', ['a'])],
+        [('Python', None, 0.2, 'manual', '[]')],
+        {'inserted': 0, 'updated': 0, 'skipped': 1},
+    ),
+    'no refresh: existing pairs left alone': (
+        [LINKEDIN_PYTHON], False,
+        [('Python', None, 0.9, 'linkedin', ['new']), ('Go', None, 0.4, 'linkedin', [])],
+        [('Python', None, 0.5, 'linkedin', '["old"]'), ('Go', None, 0.4, 'linkedin', '[]')],
+        {'inserted': 1, 'updated': 0, 'skipped': 1},
+    ),
+    'repeats within the import: first entry wins': (
+        [], True,
+        [('Python', None, 0.8, 'linkedin', []), ('Python', None, 0.1, 'linkedin', []),
+         ('Python', 'Data', 0.6, 'linkedin', [])],
+        [('Python', None, 0.8, 'linkedin', '[]'), ('Python', 'Data', 0.6, 'linkedin', '[]')],
+        {'inserted': 2, 'updated': 0, 'skipped': 1},
+    ),
+    'other users are not matched': (
+        [('u2', 'Python', None, 0.5, 'linkedin', '[]')], True,
+        [('Python', None, 0.9, 'linkedin', [])],
+        [('Python', None, 0.9, 'linkedin', '[]')],
+        {'inserted': 1, 'updated': 0, 'skipped': 0},
+    ),
+    'invalid rows are skipped': (
+        [], True,
+        [('', None, 0.5, 'linkedin', []), ('Python', None, 1.5, 'linkedin', []), ('Go', None, None, 'linkedin', [])],
+        [('Go', None, None, 'linkedin', '[]')],
+        {'inserted': 1, 'updated': 0, 'skipped': 2},
+    ),
+    'duplicates left by earlier imports are all refreshed': (
+        [LINKEDIN_PYTHON, LINKEDIN_PYTHON], True,
+        [('Python', None, 0.9, 'linkedin', [])],
+        [('Python', None, 0.9, 'linkedin', '[]'), ('Python', None, 0.9, 'linkedin', '[]')],
+        {'inserted': 0, 'updated': 2, 'skipped': 0},
+    ),
+}
+
+
+@pytest.mark.parametrize('existing, refresh, added, expected_rows, expected_counts',
+                         list(SKILL_CASES.values()), ids=list(SKILL_CASES))
+def test_skills(import_db, existing, refresh, added, expected_rows, expected_counts):
+    conn = import_db(existing)
+    others_before = skills_table(conn, 'u2')
+    writer = ImportWriter('u1', refresh_skills=refresh)
+    for skill_name, context, confidence, source, evidence in added:
+        writer.add_skill(skill_name, context, confidence, source, evidence)
+
+    written = writer.write(conn)
+
+    assert skills_table(conn) == expected_rows
+    assert skills_table(conn, 'u2') == others_before
+    assert written['skills'] == expected_counts
+
+
+def test_courses_are_deduplicated_per_name_and_platform(import_db):
+    conn = import_db()
+    conn.execute("INSERT INTO user_courses (user_id, course_name, platform) VALUES ('u1', 'ML', 'Coursera')")
+    writer = ImportWriter('u1')
+    writer.add_course('ML', 'Coursera', None, None, [], None)      # already there
+    writer.add_course('ML', 'edX', None, None, [], None)           # other platform
+    writer.add_course('Stats', None, None, None, [], None)
+    writer.add_course('Stats', None, None, None, [], None)         # NULL platform matches NULL
+    writer.add_course('', 'edX', None, None, [], None)             # invalid
+
+    written = writer.write(conn)
+
+    rows = conn.execute("SELECT course_name, platform FROM user_courses WHERE user_id = 'u1' ORDER BY id")
+    assert [tuple(r) for r in rows] == [('ML', 'Coursera'), ('ML', 'edX'), ('Stats', None)]
+    assert written['courses'] == {'inserted': 2, 'updated': 0, 'skipped': 3}
+
+
+def test_projects_are_deduplicated_per_url(import_db):
+    conn = import_db()
+    writer = ImportWriter('u1')
+    writer.add_project('alpha', None, None, [], 'https://github.com/u/alpha', None)
+    writer.add_project('alpha again', None, None, [], 'https://github.com/u/alpha', None)
+    writer.add_project('no url', None, None, [], '', None)
+    writer.write(conn)
+
+    second = ImportWriter('u1')
+    second.add_project('alpha', None, None, [], 'https://github.com/u/alpha', None)
+    written = second.write(conn)
+
+    rows = conn.execute("SELECT project_name FROM user_projects WHERE user_id = 'u1'")
+    assert [r[0] for r in rows] == ['alpha']
+    assert written['projects'] == {'inserted': 0, 'updated': 0, 'skipped': 1}
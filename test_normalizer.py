@@ -0,0 +1,71 @@
+import random
+import re
+
+import pytest
+
+from app.services.resume_analysis.normalizer import normalize_text, prepare_text
+from app.services.resume_analysis.ontology_matcher import OntologyMatcher
+from app.services.resume_analysis.scorer import _skill_positions
+
+
+def reference_normalize(text):
+    """Lowercase, drop punctuation other than + # ., collapse whitespace."""
+    text = text.lower()
+    text = re.sub(r'[^\w\s+#.]', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('Python, SQL & C++!', 'python sql c++'),
+    ('  Node.js\t\n C#  (5 yrs) ', 'node.js c# 5 yrs'),
+    ('snake_case — em dash', 'snake_case em dash'),
+    ('Café  NAÏVE résumé', 'café naïve résumé'),   # Unicode letters kept, NBSP is whitespace
+    ('İstanbul', 'istanbul'),                       # lowercasing adds U+0307, which is stripped
+    ('', ''),
+])
+def test_normalize_table(text, expected):
+    assert reference_normalize(text) == expected
+    assert normalize_text(text) == expected
+
+
+def test_normalize_matches_reference_on_random_text():
+    rng = random.Random(23)
+    alphabet = 'aZ9_ +#.,;:!?()-/\\\'"\t\n\r\x0b\x0c  éÜİı€—'
+    for _ in range(2000):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert normalize_text(text) == reference_normalize(text), repr(text)
+
+
+def test_prepared_text_holds_each_form():
+    prepared = prepare_text('Led the SQL migration; wrote C++ tools.')
+
+    assert prepared.raw == 'Led the SQL migration; wrote C++ tools.'
+    assert prepared.lower == prepared.raw.lower()
+    assert prepared.normalized == normalize_text(prepared.raw)
+
+
+SKILLS = ['python', 'sql', 'c++', 'c#', 'node.js', 'machine learning', 'go']
+
+
+@pytest.mark.parametrize('raw', [
+    'Python and SQL; C++/C# and Node.js. Machine Learning with Go, python again.',
+    'SQLite is not sql?  NODE.JS',
+    'machine  learning',
+    'İİ python',                # lowercasing lengthens the text: offsets index `lower`
+    '',
+])
+def test_match_offsets_slice_back_to_the_skill(raw):
+    prepared = prepare_text(raw)
+    words = set(SKILLS) | {word for skill in SKILLS for word in skill.split()}
+    same_length = len(raw) == len(prepared.lower)
+
+    for start, end, _ in OntologyMatcher(SKILLS).iter_matches(prepared.lower):
+        assert prepared.lower[start:end] in words
+        if same_length:
+            assert raw[start:end].lower() == prepared.lower[start:end]
+
+    for skill, positions in _skill_positions(SKILLS, prepared.lower).items():
+        assert positions == [m.start() for m in re.finditer(f'(?={re.escape(skill)})', prepared.lower)]
+        for pos in positions:
+            assert prepared.lower[pos:pos + len(skill)] == skill
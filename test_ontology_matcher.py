@@ -0,0 +1,114 @@
+import random
+import sqlite3
+
+import pytest
+
+from app import database
+from app.services import reference_data
+from app.services.resume_analysis.ontology_matcher import OntologyMatcher
+
+
+def is_word_char(ch):
+    return ch.isalnum() or ch in '_+#'
+
+
+def occurs(pattern, text):
+    """`pattern in text`, skipping hits that run into a neighbouring word."""
+    start = text.find(pattern)
+    while start != -1:
+        end = start + len(pattern)
+        joined_before = start > 0 and is_word_char(text[start - 1]) and is_word_char(pattern[0])
+        joined_after = end < len(text) and is_word_char(text[end]) and is_word_char(pattern[-1])
+        if not joined_before and not joined_after:
+            return True
+        start = text.find(pattern, start + 1)
+    return False
+
+
+def reference_find_skills(ontology, text):
+    """Check every skill against the text, and each word of a multi-word skill."""
+    found = set()
+    for skill in ontology:
+        skill = skill.strip().lower()
+        if not skill:
+            continue
+        words = skill.split()
+        if occurs(skill, text) or (len(words) > 1 and all(occurs(word, text) for word in words)):
+            found.add(skill)
+    return found
+
+
+ONTOLOGY = ['Python', 'C', 'C++', 'C#', 'Node.js', 'Machine Learning', 'SQL', 'R', 'Go', 'REST APIs',
+            '.NET', 'data science', 'science', 'python']
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('built apis in python and sql', {'python', 'sql'}),
+    ('c++ and c# developer', {'c++', 'c#'}),                      # no bare "c" inside either
+    ('wrote c, then node.js', {'c', 'node.js'}),
+    ('nodexjs', set()),
+    ('learning about machines; machine vision', {'machine learning'}),   # all words, apart
+    ('rest apis', {'rest apis'}),
+    ('go-to person for golang', {'go'}),
+    ('asp.net core', {'.net'}),
+    ('pythonic sqlite', set()),
+    ('data science', {'data science', 'science'}),
+    ('', set()),
+])
+def test_find_skills_table(text, expected):
+    assert reference_find_skills(ONTOLOGY, text) == expected
+    assert OntologyMatcher(ONTOLOGY).find_skills(text) == expected
+
+
+def test_find_skills_matches_reference_on_random_inputs():
+    rng = random.Random(11)
+    pieces = ['c', 'c++', 'c#', 'node', '.js', 'node.js', 'go', 'sql', 'data', 'science', 'r', 'a', '_']
+    separators = [' ', '', ',', '.', '-', '\n', '+', '#']
+    for _ in range(200):
+        ontology = [' '.join(rng.sample(pieces, rng.randint(1, 2))) for _ in range(rng.randint(1, 12))]
+        matcher = OntologyMatcher(ontology)
+        for _ in range(20):
+            text = ''.join(rng.choice(pieces) + rng.choice(separators) for _ in range(rng.randint(0, 8)))
+            assert matcher.find_skills(text) == reference_find_skills(ontology, text), (text, ontology)
+
+
+def test_find_related_matches_plain_containment():
+    rng = random.Random(5)
+    alphabet = 'ab+ .'
+    for _ in range(200):
+        ontology = [''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(8)]
+        matcher = OntologyMatcher(ontology)
+        skills = {s.strip().lower() for s in ontology if s.strip()}
+        for _ in range(10):
+            phrase = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 6))).strip()
+            assert matcher.find_related(phrase) == {s for s in skills if s in phrase or phrase in s}, phrase
+
+
+@pytest.fixture
+def reference_db(tmp_path, monkeypatch):
+    path = tmp_path / 'reference.db'
+    monkeypatch.setenv('SKILLGENOME_DB_PATH', str(path))
+    monkeypatch.setattr(database, '_schema_applied', False)
+    database.ensure_schema()
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO ontology (skill) VALUES ('Python'), ('SQL')")
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def test_matcher_is_rebuilt_only_when_the_ontology_changes(reference_db):
+    store = reference_data.ReferenceDataStore()
+    first = store.get()
+
+    reference_db.execute("INSERT INTO roles (role_name, category, skill) VALUES ('analyst', 'core', 'SQL')")
+    reference_db.commit()
+    roles_changed = store.get()
+    assert roles_changed.version != first.version
+    assert roles_changed.matcher is first.matcher
+
+    reference_db.execute("INSERT INTO ontology (skill) VALUES ('Go')")
+    reference_db.commit()
+    ontology_changed = store.get()
+    assert ontology_changed.matcher is not first.matcher
+    assert ontology_changed.matcher.find_skills('go and sql') == {'go', 'sql'}
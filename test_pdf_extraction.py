@@ -0,0 +1,132 @@
+import os
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from app.services.resume_analysis import extractor, pipeline
+
+
+def make_pdf(page_texts):
+    """A minimal PDF with one line of Helvetica text per page."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in page_texts:
+        stream = b"BT /F1 12 Tf 72 720 Td (" + text.encode() + b") Tj ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+PAGES = [f"Page {i} Python SQL" for i in range(1, 31)]
+
+
+@pytest.fixture
+def worker_pool(monkeypatch):
+    monkeypatch.setenv("RESUME_WORKERS", "2")
+    monkeypatch.setenv("PDF_PARALLEL_MIN_PAGES", "24")
+    pipeline.shutdown_process_pool()
+    yield pipeline.get_process_pool()
+    pipeline.shutdown_process_pool()
+
+
+def test_long_pdf_is_split_across_the_pool(worker_pool):
+    text = extractor.extract_pdf(make_pdf(PAGES))
+
+    assert text.splitlines() == PAGES
+
+
+def test_long_pdf_inside_a_pool_worker_is_extracted_inline(worker_pool):
+    # Workers must not submit page ranges to the pool they are running in
+    future = worker_pool.submit(extractor.extract_pdf, make_pdf(PAGES))
+
+    assert future.result(timeout=60).splitlines() == PAGES
+
+
+class InlinePool:
+    """Runs submitted calls at once and records their arguments."""
+
+    _max_workers = 2
+
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, fn, *args):
+        path = args[0]
+        self.calls.append((args, os.path.exists(path)))
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+@pytest.fixture
+def inline_pool(monkeypatch):
+    pool = InlinePool()
+    monkeypatch.setenv("PDF_PARALLEL_MIN_PAGES", "24")
+    monkeypatch.setattr(pipeline, "get_process_pool", lambda: pool)
+    return pool
+
+
+def test_page_ranges_are_sent_as_a_path_not_the_document_bytes(inline_pool):
+    text = extractor.extract_pdf(make_pdf(PAGES))
+
+    assert text.splitlines() == PAGES
+    assert len(inline_pool.calls) == 2
+    for args, existed in inline_pool.calls:
+        assert isinstance(args[0], str) and existed
+    # The temporary copy is gone once the ranges are read
+    assert not os.path.exists(inline_pool.calls[0][0][0])
+
+
+def test_a_document_already_on_disk_is_not_copied(inline_pool, tmp_path):
+    path = tmp_path / "cv.pdf"
+    path.write_bytes(make_pdf(PAGES))
+
+    with open(path, "rb") as f:
+        text = extractor.extract_pdf(f)
+
+    assert text.splitlines() == PAGES
+    assert {args[0] for args, _ in inline_pool.calls} == {str(path)}
+
+
+@pytest.mark.skipif(not extractor.pdfium_available, reason="pypdfium2 not installed")
+def test_text_layer_fallback_stops_at_the_deadline():
+    content = make_pdf(PAGES[:5])
+
+    late = list(extractor.iter_pdf_pages(content, 0, 5, "pdfplumber", time.monotonic() - 1))
+    in_time = list(extractor.iter_pdf_pages(content, 0, 5, "pdfplumber", time.monotonic() + 60))
+
+    # The first page is always read; nothing after the deadline
+    assert late == PAGES[:1]
+    assert in_time == PAGES[:5]
+
+
+@pytest.mark.parametrize("backend", ["pdfplumber", "pdfium"])
+def test_short_pdf_is_opened_once(monkeypatch, backend):
+    if backend == "pdfium" and not extractor.pdfium_available:
+        pytest.skip("pypdfium2 not installed")
+    monkeypatch.setenv("PDF_BACKEND", backend)
+    opened = []
+    real_plumber = extractor.pdfplumber.open
+    monkeypatch.setattr(extractor.pdfplumber, "open", lambda *a: opened.append("pdfplumber") or real_plumber(*a))
+    if extractor.pdfium_available:
+        real_pdfium = extractor.pdfium.PdfDocument
+        monkeypatch.setattr(extractor.pdfium, "PdfDocument", lambda *a: opened.append("pdfium") or real_pdfium(*a))
+
+    assert extractor.extract_pdf(make_pdf(PAGES[:3])).splitlines() == PAGES[:3]
+    assert opened == [backend]
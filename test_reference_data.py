@@ -0,0 +1,61 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+from app import database
+from app.services import reference_data
+
+
+def version(conn):
+    return conn.execute('SELECT version FROM reference_data_version').fetchone()[0]
+
+
+def test_schema_triggers_count_every_reference_write(make_db):
+    conn = make_db()
+    assert version(conn) == 0
+
+    conn.execute("INSERT INTO roles (role_name, category, skill) VALUES ('analyst', 'core', 'SQL')")
+    conn.execute("UPDATE roles SET skill = 'Excel'")
+    conn.execute("INSERT INTO courses (skill, platform, title, url) VALUES ('SQL', 'edX', 'SQL 101', 'u')")
+    conn.execute("INSERT INTO ontology (skill) VALUES ('SQL')")
+    conn.execute("DELETE FROM ontology")
+
+    assert version(conn) == 5
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = tmp_path / 'reference.db'
+    monkeypatch.setenv('SKILLGENOME_DB_PATH', str(path))
+    monkeypatch.setattr(database, '_schema_applied', False)
+    return path
+
+
+def test_tables_recreated_by_a_populate_script_get_their_triggers_back(db_path):
+    store = reference_data.ReferenceDataStore()
+    assert store.get().ontology == ()
+
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        DROP TABLE ontology;
+        CREATE TABLE ontology (id INTEGER PRIMARY KEY AUTOINCREMENT, skill TEXT NOT NULL UNIQUE);
+        INSERT INTO ontology (skill) VALUES ('Python');
+    """)
+    assert store.get().ontology == ('Python',)
+
+    conn.execute("INSERT INTO ontology (skill) VALUES ('Go')")
+    conn.commit()
+    assert version(conn) == 1
+    assert store.get().ontology == ('Python', 'Go')
+    conn.close()
+
+
+def test_importing_the_app_does_not_touch_the_database(db_path):
+    env = dict(os.environ, SKILLGENOME_DB_PATH=str(db_path))
+    subprocess.run([sys.executable, '-c', 'import app.main'], check=True, env=env,
+                   cwd=os.path.dirname(os.path.abspath(__file__)))
+
+    assert not db_path.exists()
@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.schemas import Skill
+from app.services import memo
+from app.services.memo import LRUCache
+from app.services.resume_analysis import response_cache, roadmap
+
+
+def test_least_recently_used_entry_goes_at_capacity():
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1      # 'b' is now the oldest
+
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert len(cache) == 2
+    assert cache.stats()['evictions'] == 1
+
+
+def test_overwriting_a_key_does_not_evict():
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.set('a', 10)
+
+    assert (cache.get('a'), cache.get('b')) == (10, 2)
+    assert cache.stats()['evictions'] == 0
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(memo.time, 'monotonic', lambda: now[0])
+    cache = LRUCache(maxsize=4, ttl=10)
+    cache.set('a', 1)
+
+    now[0] += 9.9
+    assert cache.get('a') == 1
+    now[0] += 0.2
+    assert cache.get('a', 'gone') == 'gone'
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['expirations'], stats['size']) == (1, 1, 1, 0)
+
+
+def test_zero_size_caches_nothing():
+    cache = LRUCache(maxsize=0)
+    cache.set('a', 1)
+    assert cache.get('a') is None
+
+
+ROLES = {
+    'data analyst': {'foundation': ('SQL', 'Excel'), 'core': ('Python',)},
+    'software engineer': {'foundation': ('Python', 'Git'), 'core': ('Docker',)},
+}
+
+
+@pytest.fixture
+def reference(monkeypatch):
+    current = SimpleNamespace(version='3.1', roles=ROLES)
+    monkeypatch.setattr(roadmap, 'get_reference_data', lambda: current)
+    monkeypatch.setattr(response_cache, '_cache', LRUCache(maxsize=16))
+    monkeypatch.setattr(response_cache, '_cache_version', None)
+    return current
+
+
+def cached(skills, role, builds):
+    return response_cache.cached_response('test', skills, role, lambda: builds.append(role) or len(builds))
+
+
+def test_near_identical_skill_sets_share_an_entry(reference):
+    builds = []
+    first = cached([Skill(name='SQL', confidence=0.9), Skill(name='Rust', confidence=0.2)], 'data analyst', builds)
+    # Same proficient required skills; confidences and unrelated skills differ
+    second = cached([Skill(name='sql', confidence=0.7), Skill(name='Go', confidence=0.9)], 'data analyst', builds)
+
+    assert first == second == 1
+    assert builds == ['data analyst']
+
+
+def test_role_or_proficiency_changes_miss(reference):
+    builds = []
+    cached([Skill(name='SQL', confidence=0.9)], 'data analyst', builds)
+    cached([Skill(name='SQL', confidence=0.9)], 'software engineer', builds)
+    cached([Skill(name='SQL', confidence=0.5)], 'data analyst', builds)     # no longer proficient
+
+    assert len(builds) == 3
+
+
+def test_entries_are_dropped_once_the_reference_version_changes(reference):
+    builds = []
+    skills = [Skill(name='Python', confidence=0.9)]
+    assert cached(skills, 'data analyst', builds) == 1
+
+    cached([Skill(name='Git', confidence=0.9)], 'software engineer', builds)
+    assert len(response_cache._cache) == 2
+
+    reference.version = '4.1'
+
+    assert cached(skills, 'data analyst', builds) == 3
+    assert len(response_cache._cache) == 1      # both old-version entries were dropped
+    assert cached(skills, 'data analyst', builds) == 3
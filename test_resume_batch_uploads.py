@@ -0,0 +1,75 @@
+import os
+import zipfile
+from io import BytesIO
+
+import pytest
+
+from app.services.resume_analysis import pipeline
+
+
+def make_zip(members, compression=zipfile.ZIP_DEFLATED):
+    buf = BytesIO()
+    with zipfile.ZipFile(buf, 'w', compression) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    buf.seek(0)
+    return buf
+
+
+@pytest.fixture
+def spool_dir(tmp_path):
+    return str(tmp_path)
+
+
+def test_files_and_members_are_spooled_to_disk(spool_dir):
+    archive = make_zip({'a.pdf': os.urandom(2000), 'notes.txt': b'x', 'dir/b.docx': os.urandom(1000)})
+
+    documents, rejected = pipeline.expand_uploads(
+        [('resume.pdf', BytesIO(b'%PDF-1.4 plain upload')), ('batch.zip', archive)], spool_dir
+    )
+
+    assert [name for name, _ in documents] == ['resume.pdf', 'a.pdf', 'dir/b.docx']
+    assert all(os.path.dirname(path) == spool_dir for _, path in documents)
+    with open(documents[0][1], 'rb') as f:
+        assert f.read() == b'%PDF-1.4 plain upload'
+    assert rejected == [{'filename': 'notes.txt', 'error': 'File must be PDF or DOCX'}]
+
+
+def test_highly_compressed_members_are_rejected(spool_dir, monkeypatch):
+    monkeypatch.setenv('RESUME_ZIP_MAX_RATIO', '50')
+    archive = make_zip({'bomb.pdf': b'\0' * (4 * 1024 * 1024), 'ok.pdf': os.urandom(4096)})
+
+    documents, rejected = pipeline.expand_uploads([('batch.zip', archive)], spool_dir)
+
+    assert [name for name, _ in documents] == ['ok.pdf']
+    assert rejected == [{'filename': 'bomb.pdf', 'error': 'Compression ratio too high'}]
+
+
+def test_batch_byte_budget_covers_inflated_members(spool_dir, monkeypatch):
+    monkeypatch.setenv('RESUME_BATCH_MAX_BYTES', str(10000))
+    archive = make_zip({f'r{i}.pdf': os.urandom(4000) for i in range(5)}, compression=zipfile.ZIP_STORED)
+
+    documents, rejected = pipeline.expand_uploads([('batch.zip', archive)], spool_dir)
+
+    assert [name for name, _ in documents] == ['r0.pdf', 'r1.pdf']
+    assert [r['error'] for r in rejected] == ['Batch size limit reached'] * 3
+    # Nothing over budget is left behind
+    assert len(os.listdir(spool_dir)) == 2
+
+
+def test_spool_stops_at_the_limit_whatever_the_source_claims(spool_dir):
+    with pytest.raises(pipeline._SpoolLimitExceeded):
+        pipeline._spool(BytesIO(b'x' * 5000), spool_dir, 4096)
+    assert os.listdir(spool_dir) == []
+
+    path, size = pipeline._spool(BytesIO(b'x' * 4096), spool_dir, 4096)
+    assert size == 4096 and os.path.getsize(path) == 4096
+
+
+def test_oversized_upload_is_rejected(spool_dir, monkeypatch):
+    monkeypatch.setenv('RESUME_MAX_FILE_BYTES', '100')
+
+    documents, rejected = pipeline.expand_uploads([('big.pdf', BytesIO(b'x' * 101))], spool_dir)
+
+    assert documents == []
+    assert rejected == [{'filename': 'big.pdf', 'error': 'File too large'}]
@@ -0,0 +1,96 @@
+import io
+from types import SimpleNamespace
+
+import pytest
+
+from app import database
+from app.services.resume_analysis import cache
+
+ANALYSIS = {
+    'raw_text': 'Python and SQL',
+    'normalized_text': 'python and sql',
+    'extracted_skills': ['python', 'sql'],
+    'skills': [{'name': 'python', 'confidence': 1.0}, {'name': 'sql', 'confidence': 0.8}],
+}
+
+
+@pytest.fixture
+def versions(tmp_path, monkeypatch):
+    monkeypatch.setenv('SKILLGENOME_DB_PATH', str(tmp_path / 'cache.db'))
+    monkeypatch.setenv('RESUME_CACHE_ENABLED', 'true')
+    monkeypatch.setattr(database, '_pool', database.ConnectionPool())
+    monkeypatch.setattr(database, '_schema_applied', False)
+    current = SimpleNamespace(ontology_version='onto-1', models='spacy')
+    monkeypatch.setattr(cache, 'get_reference_data', lambda: current)
+    monkeypatch.setattr(cache, 'models_signature', lambda: current.models)
+    return current
+
+
+def test_stored_analysis_is_returned_for_the_same_content(versions):
+    key = cache.cache_key(b'%PDF resume', 'CV.PDF')
+
+    assert cache.get_cached_analysis(key) is None
+    cache.store_analysis(key, ANALYSIS)
+
+    assert cache.get_cached_analysis(key) == ANALYSIS
+    # A file-like upload of the same bytes hashes to the same key
+    assert cache.cache_key(io.BytesIO(b'%PDF resume'), 'cv.pdf') == key
+
+
+@pytest.mark.parametrize('content, filename', [
+    (b'%PDF other resume', 'cv.pdf'),       # other bytes
+    (b'%PDF resume', 'cv.docx'),            # other file type
+])
+def test_other_content_misses(versions, content, filename):
+    cache.store_analysis(cache.cache_key(b'%PDF resume', 'cv.pdf'), ANALYSIS)
+
+    assert cache.get_cached_analysis(cache.cache_key(content, filename)) is None
+
+
+@pytest.mark.parametrize('change', [
+    lambda current: setattr(current, 'ontology_version', 'onto-2'),
+    lambda current: setattr(current, 'models', 'spacy+keybert'),
+], ids=['ontology', 'models'])
+def test_entries_stop_matching_when_the_ontology_or_models_change(versions, change):
+    key = cache.cache_key(b'%PDF resume', 'cv.pdf')
+    cache.store_analysis(key, ANALYSIS)
+
+    change(versions)
+    new_key = cache.cache_key(b'%PDF resume', 'cv.pdf')
+
+    assert new_key != key
+    assert cache.get_cached_analysis(new_key) is None
+
+
+def test_least_recently_used_entries_are_evicted(versions, monkeypatch):
+    monkeypatch.setenv('RESUME_CACHE_MAX_ENTRIES', '2')
+    keys = [cache.cache_key(f'resume {i}'.encode(), 'cv.pdf') for i in range(3)]
+    cache.store_analysis(keys[0], ANALYSIS)
+    cache.store_analysis(keys[1], ANALYSIS)
+    assert cache.get_cached_analysis(keys[0]) is not None   # now newer than keys[1]
+
+    cache.store_analysis(keys[2], ANALYSIS)
+
+    assert cache.get_cached_analysis(keys[1]) is None
+    assert cache.get_cached_analysis(keys[0]) is not None
+    assert cache.get_cached_analysis(keys[2]) is not None
+    assert cache.resume_cache_stats()['entries'] == 2
+
+
+def test_byte_budget_is_enforced(versions, monkeypatch):
+    key = cache.cache_key(b'big', 'cv.pdf')
+    monkeypatch.setenv('RESUME_CACHE_MAX_BYTES', '10')
+
+    cache.store_analysis(key, ANALYSIS)
+
+    assert cache.get_cached_analysis(key) is None
+
+
+def test_disabled_cache_stores_nothing(versions, monkeypatch):
+    monkeypatch.setenv('RESUME_CACHE_ENABLED', 'false')
+    key = cache.cache_key(b'%PDF resume', 'cv.pdf')
+
+    cache.store_analysis(key, ANALYSIS)
+
+    monkeypatch.setenv('RESUME_CACHE_ENABLED', 'true')
+    assert cache.get_cached_analysis(key) is None
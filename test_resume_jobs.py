@@ -0,0 +1,264 @@
+import io
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from flask import Flask
+
+from app import database
+from app.api import resume
+from app.services import reference_data
+from app.services.resume_analysis import jobs
+
+
+class FakeAnalysis:
+    """Stands in for the pipeline: the payload text is the one skill found.
+
+    Payloads starting with b'unreadable' come back as an extraction error,
+    b'crash' raises. Runs wait for `gate`, so a test can hold a job running.
+    """
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.gate.set()
+        self.calls = []
+
+    def __call__(self, path, filename):
+        self.calls.append(filename)
+        with open(path, 'rb') as f:
+            content = f.read()
+        assert self.gate.wait(10)
+        if content.startswith(b'unreadable'):
+            return {'error': 'Could not extract text', 'timings': {'extract': 0.0}}
+        if content.startswith(b'crash'):
+            raise RuntimeError('parser crashed')
+        return {'skills': [{'name': content.decode(), 'confidence': 0.9}], 'timings': {'extract': 0.01}}
+
+
+@pytest.fixture
+def analysis(tmp_path, monkeypatch):
+    monkeypatch.setenv('SKILLGENOME_DB_PATH', str(tmp_path / 'jobs.db'))
+    monkeypatch.setenv('RESUME_JOB_SPOOL_DIR', str(tmp_path / 'spool'))
+    monkeypatch.setenv('RESUME_WORKERS', '0')
+    monkeypatch.setattr(database, '_pool', database.ConnectionPool())
+    monkeypatch.setattr(database, '_schema_applied', False)
+    monkeypatch.setattr(reference_data, '_store', reference_data.ReferenceDataStore())
+    fake = FakeAnalysis()
+    monkeypatch.setattr(jobs, 'analyze_document_file', fake)
+    monkeypatch.setattr(jobs, 'build_roadmap_response', lambda skills, role: {'target_role': role})
+    database.ensure_schema()
+    return fake
+
+
+@pytest.fixture
+def queue(analysis, monkeypatch):
+    queue = jobs.ResumeJobQueue()
+    monkeypatch.setattr(jobs, '_queue', queue)
+    yield queue
+    analysis.gate.set()
+    queue.shutdown()
+
+
+def wait_for(queue, job_id, *statuses):
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job['status'] in statuses:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f'{job_id} still {job["status"]}')
+
+
+def test_jobs_queued_before_a_restart_run_without_a_new_submit(queue, tmp_path):
+    payload = tmp_path / 'spool' / 'left-over'
+    payload.parent.mkdir(exist_ok=True)
+    payload.write_bytes(b'python')
+    conn = database.create_connection()
+    conn.execute("""
+        INSERT INTO resume_jobs (job_id, content_hash, filename, target_role, analysis_version,
+                                 status, payload_path, created_at)
+        VALUES ('left-over', 'h', 'cv.pdf', 'general', 'v', 'queued', ?, ?)
+    """, (str(payload), datetime.now(timezone.utc).isoformat()))
+    conn.commit()
+    conn.close()
+
+    job = wait_for(queue, 'left-over', jobs.STATUS_SUCCEEDED)
+
+    assert job['result']['skills'] == [{'name': 'python', 'confidence': 0.9}]
+    assert not payload.exists()
+
+
+def test_job_moves_from_queued_through_running_to_succeeded(queue, analysis):
+    analysis.gate.clear()
+    submitted = queue.submit(b'python', 'cv.pdf', 'data analyst')
+    assert submitted['status'] == jobs.STATUS_QUEUED
+
+    running = wait_for(queue, submitted['job_id'], jobs.STATUS_RUNNING)
+    assert running['started_at'] is not None and running['finished_at'] is None
+    assert 'result' not in running
+
+    analysis.gate.set()
+    done = wait_for(queue, submitted['job_id'], jobs.STATUS_SUCCEEDED)
+    assert done['result'] == {'skills': [{'name': 'python', 'confidence': 0.9}],
+                              'roadmap': {'target_role': 'data analyst'}}
+    assert done['finished_at'] >= done['started_at']
+    assert {'queue_wait', 'extract', 'roadmap'} <= set(done['timings'])
+    assert os.listdir(jobs._spool_dir()) == []
+
+
+def test_identical_uploads_share_one_job(queue, analysis):
+    analysis.gate.clear()
+    first = queue.submit(b'python', 'cv.pdf', 'data analyst')
+    again = queue.submit(io.BytesIO(b'python'), 'renamed.pdf', 'data analyst')
+    other_role = queue.submit(b'python', 'cv.pdf', 'backend developer')
+    other_file = queue.submit(b'sql', 'cv.pdf', 'data analyst')
+
+    assert again['job_id'] == first['job_id']
+    assert len({first['job_id'], other_role['job_id'], other_file['job_id']}) == 3
+
+    analysis.gate.set()
+    wait_for(queue, first['job_id'], jobs.STATUS_SUCCEEDED)
+    finished = queue.submit(b'python', 'cv.pdf', 'data analyst')
+    assert finished['job_id'] == first['job_id']
+    assert finished['result']['skills'][0]['name'] == 'python'
+
+
+def test_a_finished_job_is_not_reused_once_the_models_change(queue, monkeypatch):
+    first = queue.submit(b'python', 'cv.pdf', 'general')
+    wait_for(queue, first['job_id'], jobs.STATUS_SUCCEEDED)
+
+    monkeypatch.setattr(jobs, 'models_signature', lambda: 'spacy-reloaded')
+
+    assert queue.submit(b'python', 'cv.pdf', 'general')['job_id'] != first['job_id']
+
+
+@pytest.mark.parametrize('payload, error', [
+    (b'unreadable scan', 'Could not extract text'),
+    (b'crash', 'parser crashed'),
+])
+def test_failed_jobs_record_the_error_and_are_not_reused(queue, payload, error):
+    submitted = queue.submit(payload, 'cv.pdf', 'general')
+
+    failed = wait_for(queue, submitted['job_id'], jobs.STATUS_FAILED)
+    assert failed['error'] == error
+    assert 'result' not in failed
+
+    retried = queue.submit(payload, 'cv.pdf', 'general')
+    assert retried['job_id'] != submitted['job_id']
+    wait_for(queue, retried['job_id'], jobs.STATUS_FAILED)
+
+
+def _iso(delta):
+    return (datetime.now(timezone.utc) + delta).isoformat()
+
+
+def test_requeue_only_takes_back_jobs_whose_owner_is_gone(analysis):
+    host = socket.gethostname()
+    long_ago, now = _iso(-timedelta(hours=1)), _iso(timedelta())
+    rows = {
+        'exited-owner': (f'{host}:999999999', now),
+        'live-owner': (f'{host}:{os.getpid()}', now),
+        'silent-remote': ('otherhost:1', long_ago),
+        'beating-remote': ('otherhost:1', now),
+        'ours-silent': (f'{host}:{os.getpid()}', long_ago),
+    }
+    conn = database.create_connection()
+    for job_id, (owner, heartbeat_at) in rows.items():
+        conn.execute("""
+            INSERT INTO resume_jobs (job_id, content_hash, status, owner, started_at, heartbeat_at, created_at)
+            VALUES (?, 'h', 'running', ?, ?, ?, ?)
+        """, (job_id, owner, long_ago, heartbeat_at, long_ago))
+    conn.commit()
+
+    queue = jobs.ResumeJobQueue()
+    queue._running['ours-silent'] = long_ago    # this process is still running it
+    queue._requeue_stale(conn)
+
+    statuses = dict(conn.execute('SELECT job_id, status FROM resume_jobs').fetchall())
+    assert statuses == {
+        'exited-owner': 'queued',
+        'live-owner': 'running',
+        'silent-remote': 'queued',
+        'beating-remote': 'running',
+        'ours-silent': 'running',
+    }
+    requeued = conn.execute("SELECT owner, started_at, heartbeat_at FROM resume_jobs "
+                            "WHERE job_id = 'exited-owner'").fetchone()
+    assert tuple(requeued) == (None, None, None)
+    conn.close()
+
+
+def test_heartbeat_only_touches_this_process_running_claims(analysis):
+    long_ago = _iso(-timedelta(hours=1))
+    conn = database.create_connection()
+    for job_id in ('ours', 'reclaimed'):
+        conn.execute("""
+            INSERT INTO resume_jobs (job_id, content_hash, status, started_at, heartbeat_at, created_at)
+            VALUES (?, 'h', 'running', ?, ?, ?)
+        """, (job_id, long_ago, long_ago, long_ago))
+    conn.commit()
+
+    queue = jobs.ResumeJobQueue()
+    queue._running = {'ours': long_ago, 'reclaimed': 'an earlier claim'}
+    queue._heartbeat(conn)
+
+    beats = dict(conn.execute('SELECT job_id, heartbeat_at FROM resume_jobs').fetchall())
+    assert beats['ours'] > long_ago
+    assert beats['reclaimed'] == long_ago
+    conn.close()
+
+
+def test_a_requeued_run_does_not_overwrite_the_new_claim(analysis, tmp_path):
+    payload = tmp_path / 'payload'
+    payload.write_bytes(b'python')
+    conn = database.create_connection()
+    conn.execute("""
+        INSERT INTO resume_jobs (job_id, content_hash, status, started_at, payload_path, created_at)
+        VALUES ('j', 'h', 'running', 'second claim', ?, 'then')
+    """, (str(payload),))
+    conn.commit()
+
+    stale_run = {'job_id': 'j', 'started_at': 'first claim', 'payload_path': str(payload)}
+    jobs.ResumeJobQueue()._finish(stale_run, jobs.STATUS_FAILED, None, 'boom', {})
+
+    row = conn.execute("SELECT status, error, payload_path FROM resume_jobs WHERE job_id = 'j'").fetchone()
+    assert tuple(row) == ('running', None, str(payload))
+    assert payload.exists()
+    conn.close()
+
+
+@pytest.fixture
+def client(queue):
+    app = Flask(__name__)
+    database.init_db_pool(app)
+    app.register_blueprint(resume.bp, url_prefix='/api/resume')
+    return app.test_client()
+
+
+def post_async(client, content):
+    return client.post('/api/resume/analyze?async=1', data={
+        'file': (io.BytesIO(content), 'cv.pdf'), 'target_role': 'data analyst',
+    })
+
+
+def test_async_upload_is_accepted_then_answered_from_the_finished_job(client, queue):
+    accepted = post_async(client, b'python')
+    assert accepted.status_code == 202
+    assert set(accepted.json) == {'job_id', 'status', 'status_url'}
+
+    wait_for(queue, accepted.json['job_id'], jobs.STATUS_SUCCEEDED)
+    polled = client.get(accepted.json['status_url'])
+    assert polled.status_code == 200 and polled.json['status'] == jobs.STATUS_SUCCEEDED
+
+    repeated = post_async(client, b'python')
+    assert repeated.status_code == 200
+    assert repeated.json['job_id'] == accepted.json['job_id']
+    assert repeated.json['result']['roadmap'] == {'target_role': 'data analyst'}
+    assert repeated.json['status_url'] == accepted.json['status_url']
+
+
+def test_unknown_job_is_404(client):
+    assert client.get('/api/resume/jobs/missing').status_code == 404
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from app.services.readiness import SkillMatchIndex, compute_core_fit, compute_role_readiness
+from app.services.role_fit import RoleFitEngine
+
+
+def reference_top_roles(roles, user_skills, k=5):
+    """Score each role with the readiness helpers; best fit first."""
+    suggested = []
+    for role_name, reqs in roles.items():
+        core_fit = compute_core_fit(reqs, user_skills)
+        if core_fit['total_required'] <= 0:
+            continue
+        projected = compute_role_readiness(reqs, user_skills)
+        suggested.append({
+            'role': role_name,
+            'fit_score': core_fit['fit_score'],
+            'matched_required': core_fit['matched_required'],
+            'total_required': core_fit['total_required'],
+            'projected_readiness_score': projected['readiness_score'],
+        })
+    suggested.sort(key=lambda r: r['fit_score'], reverse=True)
+    return suggested[:k]
+
+
+ROLES = {
+    'data analyst': {'foundation': ['SQL', 'Excel'], 'core': ['Python'], 'advanced': ['Tableau']},
+    'backend engineer': {'foundation': ['Python', 'SQL'], 'core': ['Docker', 'REST APIs']},
+    'ml engineer': {'foundation': ['Python'], 'core': ['Machine Learning', 'PyTorch'], 'projects': ['ML project']},
+    'frontend engineer': {'foundation': ['JavaScript', 'CSS'], 'core': ['React']},
+    'no core role': {'advanced': ['Python']},
+    'duplicate reqs': {'foundation': ['Python', 'python'], 'core': ['  SQL ']},
+    'blank req': {'foundation': ['', 'Python']},
+}
+
+
+@pytest.mark.parametrize('user_skills', [
+    {},
+    {'python': 0.9},
+    {'python': 0.4},                                # below the threshold
+    {'python': 0.9, 'sql': 0.8, 'docker': 0.6},
+    {'java': 0.9},                                  # contained in "javascript"
+    {'machine learning engineering': 0.7},          # contains a requirement
+    {'react native': 0.2, 'react': 0.9},            # exact match beats containment
+    {'ml': 0.8, 'excel': 0.3, 'css': 0.5},
+    {'': 0.9},                                      # blank user skill
+])
+@pytest.mark.parametrize('k', [0, 1, 3, 10])
+def test_top_roles_table(user_skills, k):
+    engine = RoleFitEngine(ROLES)
+    expected = reference_top_roles(ROLES, user_skills, k)
+
+    assert engine.top_roles(user_skills, k) == expected
+    assert engine.top_roles(SkillMatchIndex(user_skills), k) == expected
+    assert engine._top_roles_python(SkillMatchIndex(user_skills), k) == expected
+
+
+def test_top_roles_matches_reference_on_random_roles():
+    rng = random.Random(11)
+    words = ['py', 'python', 'sql', 'nosql', 'java', 'javascript', 'ml', 'html', 'css', 'go', 'r', 'rust']
+    for _ in range(40):
+        vocab = [' '.join(rng.sample(words, rng.randint(1, 2))) for _ in range(15)]
+        roles = {
+            f'role{i}': {phase: rng.sample(vocab, rng.randint(0, 4)) for phase in ('foundation', 'core', 'advanced')}
+            for i in range(25)
+        }
+        engine = RoleFitEngine(roles)
+        for _ in range(10):
+            user = {rng.choice(words + vocab): round(rng.random(), 2) for _ in range(rng.randint(0, 6))}
+            assert engine.top_roles(user, 5) == reference_top_roles(roles, user, 5), user
+
+
+def test_fit_weights_change_the_ranking():
+    roles = {name: ROLES[name] for name in ('data analyst', 'backend engineer')}
+    user = {'python': 0.9, 'sql': 0.9}
+
+    unweighted = RoleFitEngine(roles).top_roles(user, k=2)
+    weighted = RoleFitEngine(roles, fit_weights={'foundation': 3.0}).top_roles(user, k=2)
+
+    assert [(r['role'], r['fit_score']) for r in unweighted] == [('data analyst', 66.67), ('backend engineer', 50.0)]
+    assert [(r['role'], r['fit_score']) for r in weighted] == [('backend engineer', 75.0), ('data analyst', 57.14)]
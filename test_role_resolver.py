@@ -0,0 +1,69 @@
+import random
+import re
+
+import pytest
+
+from app.services import reference_data
+from app.services.resume_analysis.role_resolver import RoleResolver
+from app.services.resume_analysis.utils import match_role
+
+
+def reference_match_role(target_role, roles_data):
+    """Exact title, then containment, then containment with dev/ml/fe/be spelled out."""
+    if not target_role:
+        return None
+    target_lower = target_role.lower().strip()
+    for role in roles_data:
+        if role.lower() == target_lower:
+            return role
+    for role in roles_data:
+        if target_lower in role.lower() or role.lower() in target_lower:
+            return role
+    augmented = target_lower
+    for short, long in {'dev': 'developer', 'ml': 'machine learning', 'fe': 'frontend', 'be': 'backend'}.items():
+        augmented = re.sub(rf'\b{short}\b', long, augmented)
+    if augmented != target_lower:
+        for role in roles_data:
+            if augmented in role.lower() or role.lower() in augmented:
+                return role
+    return None
+
+
+ROLES = ['Software Engineer', 'Data Analyst', 'Machine Learning Engineer', 'Frontend Developer',
+         'Backend Developer', 'data analyst', 'Engineer']
+
+
+@pytest.mark.parametrize('title', [
+    'software engineer', '  DATA ANALYST ', 'data analyst', 'engineer', 'Senior Software Engineer',
+    'analyst', 'ml engineer', 'fe dev', 'be dev', 'ml', 'nurse', '', None, 'Software',
+])
+def test_resolve_table(title):
+    expected = reference_match_role(title, dict.fromkeys(ROLES))
+    assert RoleResolver(ROLES).resolve(title) == expected
+    assert match_role(title, dict.fromkeys(ROLES)) == expected
+
+
+def test_resolve_matches_reference_on_random_titles():
+    rng = random.Random(13)
+    words = ['dev', 'ml', 'fe', 'be', 'data', 'engineer', 'developer', 'frontend', 'machine learning', 'ops']
+    for _ in range(100):
+        roles = list(dict.fromkeys(' '.join(rng.sample(words, rng.randint(1, 3))) for _ in range(rng.randint(1, 8))))
+        resolver = RoleResolver(roles)
+        for _ in range(20):
+            title = ' '.join(rng.sample(words, rng.randint(0, 3)))
+            assert resolver.resolve(title) == reference_match_role(title, dict.fromkeys(roles)), (title, roles)
+
+
+def test_only_the_snapshot_roles_use_the_snapshot_resolver(monkeypatch):
+    roles = {'data analyst': {}, 'backend developer': {}}
+
+    class Snapshot:
+        pass
+
+    # A resolver that disagrees with the mapping shows which path ran
+    snapshot = Snapshot()
+    snapshot.roles, snapshot.role_resolver = roles, RoleResolver(['backend developer'])
+    monkeypatch.setattr(reference_data._store, 'peek', lambda: snapshot)
+
+    assert match_role('data analyst', roles) is None
+    assert match_role('data analyst', dict(roles)) == 'data analyst'
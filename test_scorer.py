@@ -0,0 +1,96 @@
+import random
+import re
+
+import pytest
+
+from app.services.resume_analysis.scorer import score_skills
+
+ACTION_VERBS = {"built", "developed", "implemented", "designed", "created", "architected"}
+
+
+def reference_section_weight(text, pos):
+    context = text.lower()[max(0, pos - 200):min(len(text), pos + 200)]
+
+    def detect(name):
+        patterns = [rf"\b{name}\b", rf"{name}:", rf"{name}\s*:"]
+        return any(re.search(pattern, context, re.IGNORECASE) for pattern in patterns)
+
+    if detect("experience") or detect("work"):
+        return 3.0
+    if detect("project"):
+        return 2.0
+    return 1.0
+
+
+def reference_scores(skills_list, raw_text):
+    """Find every occurrence by rescanning; weigh each by section and nearby action verbs."""
+    text_lower = raw_text.lower()
+    skill_scores = {}
+    for skill in skills_list:
+        skill_lower = skill.lower()
+        count = text_lower.count(skill_lower)
+        if count == 0:
+            continue
+        base_score = count * 0.1
+
+        positions = []
+        start = 0
+        while True:
+            pos = text_lower.find(skill_lower, start)
+            if pos == -1:
+                break
+            positions.append(pos)
+            start = pos + 1
+
+        total = 0.0
+        for pos in positions:
+            context = raw_text[max(0, pos - 50):min(len(raw_text), pos + 50)].lower()
+            action_bonus = 0.2 if any(verb in context for verb in ACTION_VERBS) else 0.0
+            total += (base_score * reference_section_weight(raw_text, pos)) + action_bonus
+        skill_scores[skill] = total
+
+    if not skill_scores:
+        return []
+    max_score = max(skill_scores.values()) or 1.0
+    ranked = [(skill, min(1.0, score / max_score)) for skill, score in skill_scores.items()]
+    ranked.sort(key=lambda item: item[1], reverse=True)
+    return ranked
+
+
+def scored(skills_list, raw_text):
+    return [(skill.name, skill.confidence) for skill in score_skills(skills_list, raw_text)]
+
+
+RESUME = (
+    "Jane Doe\nSKILLS: Python, SQL, JavaScript, C++, Docker\n\n"
+    "Work Experience\nBuilt REST APIs in Python and Java at Acme. " + "Filler text. " * 30 +
+    "\nProjects:\nDesigned a React dashboard backed by PostgreSQL and Docker.\n" + "More filler. " * 30 +
+    "\nEducation\nBSc Computer Science; coursework in C and SQL."
+)
+
+
+@pytest.mark.parametrize("skills, text", [
+    (["python", "sql", "java", "javascript", "c", "c++", "docker"], RESUME),
+    (["Python", "python", "SQL"], RESUME),                  # case variants and duplicates
+    (["aa", "aaa"], "aaaaaa experience: aaaa"),             # overlapping occurrences
+    (["rust"], RESUME),                                     # absent
+    ([], RESUME),
+    (["python"], ""),
+    ([" sql", "sql ", " docker "], RESUME),                 # surrounding whitespace
+    (["python"], "Experıence\nbuilt python"),               # dotless i heading
+    (["python"], "Homework python project"),                # "work" inside a word
+    (["python"], "python " + "x" * 300 + " project :"),     # heading outside the window
+])
+def test_scores_match_reference_table(skills, text):
+    assert scored(skills, text) == reference_scores(skills, text)
+
+
+def test_scores_match_reference_on_random_resumes():
+    rng = random.Random(3)
+    words = ["python", "java", "javascript", "sql", "nosql", "c", "c++", "go", "experience", "work",
+             "project", "projects:", "skills", "built", "designed", "homework", "\n", ":", "the"]
+    skills = ["python", "java", "javascript", "sql", "c", "c++", "go", "py"]
+    for _ in range(200):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(0, 150)))
+        chosen = rng.sample(skills, rng.randint(1, len(skills)))
+        assert scored(chosen, text) == reference_scores(chosen, text), (chosen, text)
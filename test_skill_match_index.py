@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from app.services.readiness import SkillMatchIndex, compute_role_readiness
+
+
+def reference_lookup(required_skill, user_skills_dict):
+    """Exact name, else the first user skill on either side of a containment."""
+    required_lower = (required_skill or '').strip().lower()
+    if not required_lower:
+        return None
+
+    if required_lower in user_skills_dict:
+        return user_skills_dict[required_lower]
+
+    for user_skill, confidence in user_skills_dict.items():
+        if required_lower in user_skill or user_skill in required_lower:
+            return confidence
+
+    return None
+
+
+USER_SKILLS = {
+    'python': 0.9,
+    'machine learning': 0.7,
+    'sql': 0.4,
+    'c': 0.2,
+    'react native': 0.6,
+    'react': 0.8,
+}
+
+
+@pytest.mark.parametrize('required, expected', [
+    ('Python', 0.9),                  # exact, case-insensitive
+    ('  sql ', 0.4),                  # exact after strip
+    ('learning', 0.7),                # required in user skill
+    ('python 3', 0.9),                # user skill in required
+    ('react', 0.8),                   # exact beats an earlier containing skill
+    ('native', 0.6),
+    ('postgresql', 0.4),              # 'sql' is contained; earlier than 'c'
+    ('rust', None),
+    ('', None),
+    (None, None),
+    ('x' * 100 + 'python', 0.9),      # longer than the substring index covers
+])
+def test_lookup_table(required, expected):
+    assert reference_lookup(required, USER_SKILLS) == expected
+    assert SkillMatchIndex(USER_SKILLS).lookup(required) == expected
+
+
+def test_lookup_matches_reference_on_random_inputs():
+    rng = random.Random(5)
+    alphabet = 'abcde '
+    for _ in range(300):
+        skills = {
+            ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 6))).strip() or 'a': round(rng.random(), 2)
+            for _ in range(rng.randint(0, 12))
+        }
+        index = SkillMatchIndex(skills)
+        for _ in range(20):
+            required = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 8)))
+            assert index.lookup(required) == reference_lookup(required, skills), (required, skills)
+
+
+def test_readiness_accepts_dict_or_index():
+    role = {'foundation': ['Python', 'SQL'], 'core': ['Kubernetes'], 'advanced': ['learning']}
+
+    from_dict = compute_role_readiness(role, USER_SKILLS)
+    from_index = compute_role_readiness(role, SkillMatchIndex(USER_SKILLS))
+
+    assert from_dict == from_index
+    assert from_dict['skills_total'] == 4
+    assert from_dict['skills_missing'] == 1
@@ -0,0 +1,111 @@
+import json
+import random
+
+import pytest
+
+from app.services.skill_store import STATUS_INSERTED, STATUS_INVALID, STATUS_UPDATED, upsert_user_skills
+
+COLUMNS = 'user_id, skill_name, sector_context, confidence, source, acquired_date, evidence'
+
+
+@pytest.fixture
+def seeded_db(make_db):
+    def factory():
+        conn = make_db()
+        conn.execute(f"""
+            INSERT INTO user_skills ({COLUMNS}) VALUES
+                ('u1', 'Python', NULL, 0.4, 'manual', '2023-01-01', '[]'),
+                ('u1', 'SQL', 'Healthcare', 0.6, 'resume', NULL, '["x"]'),
+                ('u2', 'Python', NULL, 0.9, 'manual', NULL, '[]')
+        """)
+        return conn
+    return factory
+
+
+def reference_upsert(conn, user_id, skills):
+    """UPDATE each skill in place; INSERT it when no row matched."""
+    statuses = []
+    for skill in skills:
+        sector_context = skill.get('sector_context')
+        evidence = json.dumps(skill.get('evidence', []))
+        cursor = conn.execute("""
+            UPDATE user_skills SET confidence = ?, source = ?, evidence = ?
+            WHERE user_id = ? AND skill_name = ? AND (sector_context = ? OR (sector_context IS NULL AND ? IS NULL))
+        """, (skill.get('confidence', 0.5), skill.get('source', 'manual'), evidence,
+              user_id, skill['skill_name'], sector_context, sector_context))
+        if cursor.rowcount == 0:
+            conn.execute(f'INSERT INTO user_skills ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)', (
+                user_id, skill['skill_name'], sector_context, skill.get('confidence', 0.5),
+                skill.get('source', 'manual'), skill.get('acquired_date'), evidence,
+            ))
+            statuses.append(STATUS_INSERTED)
+        else:
+            statuses.append(STATUS_UPDATED)
+    return statuses
+
+
+def table(conn):
+    return [tuple(row) for row in conn.execute(f'SELECT {COLUMNS} FROM user_skills ORDER BY id')]
+
+
+@pytest.mark.parametrize('skills', [
+    [],
+    [{'skill_name': 'Python', 'confidence': 0.8}],                              # existing NULL context
+    [{'skill_name': 'SQL', 'sector_context': 'Healthcare', 'source': 'linkedin'}],
+    [{'skill_name': 'SQL'}],                                                    # same name, other context
+    [{'skill_name': 'Go', 'acquired_date': '2024-02-02', 'evidence': ['repo']}],
+    [{'skill_name': 'Go', 'confidence': 0.2, 'acquired_date': 'first'},         # repeated within the batch
+     {'skill_name': 'Go', 'confidence': 0.7, 'acquired_date': 'second'},
+     {'skill_name': 'Go', 'confidence': None}],
+    [{'skill_name': 'Rust', 'sector_context': 'Urban'}, {'skill_name': 'Rust'},
+     {'skill_name': 'Rust', 'sector_context': 'Urban', 'confidence': 1.0}],
+    [{'skill_name': 'python'}],                                                 # names are case-sensitive
+])
+def test_upsert_matches_reference_loop(seeded_db, skills):
+    expected_conn = seeded_db()
+    expected_statuses = reference_upsert(expected_conn, 'u1', skills)
+
+    conn = seeded_db()
+    outcome = upsert_user_skills(conn, 'u1', iter(skills))
+
+    assert table(conn) == table(expected_conn)
+    assert [r['status'] for r in outcome['results']] == expected_statuses
+    assert outcome['inserted'] == expected_statuses.count(STATUS_INSERTED)
+    assert outcome['updated'] == expected_statuses.count(STATUS_UPDATED)
+
+
+def test_upsert_matches_reference_loop_on_random_batches(seeded_db):
+    rng = random.Random(17)
+    for _ in range(50):
+        skills = [
+            {
+                'skill_name': rng.choice(['Python', 'SQL', 'Go', 'Rust']),
+                'sector_context': rng.choice([None, None, 'Healthcare', 'Urban']),
+                'confidence': rng.choice([None, 0.1, 0.5, 0.9]),
+                'source': rng.choice(['manual', 'resume']),
+                'acquired_date': rng.choice([None, '2024-01-01']),
+            }
+            for _ in range(rng.randint(1, 12))
+        ]
+        expected_conn = seeded_db()
+        expected_statuses = reference_upsert(expected_conn, 'u1', skills)
+        conn = seeded_db()
+        outcome = upsert_user_skills(conn, 'u1', skills)
+
+        assert table(conn) == table(expected_conn), skills
+        assert [r['status'] for r in outcome['results']] == expected_statuses, skills
+
+
+def test_invalid_entries_are_reported_and_skipped(seeded_db):
+    conn = seeded_db()
+    before = table(conn)
+
+    outcome = upsert_user_skills(conn, 'u1', [
+        None, {'confidence': 0.5}, {'skill_name': 'Go', 'confidence': 2}, {'skill_name': 'Go'},
+    ])
+
+    assert [(r['index'], r['status']) for r in outcome['results']] == [
+        (0, STATUS_INVALID), (1, STATUS_INVALID), (2, STATUS_INVALID), (3, STATUS_INSERTED),
+    ]
+    assert outcome['results'][2]['error'] == 'confidence must be between 0 and 1'
+    assert table(conn) == before + [('u1', 'Go', None, 0.5, 'manual', None, '[]')]
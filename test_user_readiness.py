@@ -0,0 +1,146 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import user_readiness
+from app.services.readiness import build_skill_conf_map_from_rows, compute_core_fit, compute_role_readiness
+from app.services.resume_analysis.utils import match_role
+
+ROLES = {
+    'data analyst': {'sector': 'Technology', 'foundation': ('SQL', 'Excel'), 'core': ('Python', 'Statistics'),
+                     'advanced': ('Tableau',), 'projects': ('Dashboard',)},
+    'software engineer': {'sector': 'Technology', 'foundation': ('Python', 'Git'), 'core': ('Docker',)},
+    'backend developer': {'sector': 'Technology', 'foundation': ('Python', 'SQL'), 'core': ('REST APIs',)},
+}
+
+
+@pytest.fixture
+def reference(monkeypatch):
+    reference = SimpleNamespace(version='7.1', roles=ROLES)
+    monkeypatch.setattr(user_readiness, 'get_reference_data', lambda: reference)
+    monkeypatch.setattr(user_readiness, 'ensure_schema', lambda: None)
+    return reference
+
+
+@pytest.fixture
+def conn(make_db, reference):
+    conn = make_db()
+    conn.execute("UPDATE users SET target_role = 'data analyst' WHERE user_id = 'u1'")
+    conn.executemany('INSERT INTO user_skills (user_id, skill_name, confidence) VALUES (?, ?, ?)', [
+        ('u1', 'SQL', 0.9), ('u1', 'Python', 0.3), ('u2', 'Docker', 0.8),
+    ])
+    conn.commit()
+    return conn
+
+
+def stored(conn, user_id='u1'):
+    return conn.execute('SELECT * FROM user_readiness WHERE user_id = ?', (user_id,)).fetchone()
+
+
+def on_demand(conn, user_id):
+    """Readiness computed straight from the user's row and skills, as the profile read once did."""
+    user = conn.execute('SELECT target_role FROM users WHERE user_id = ?', (user_id,)).fetchone()
+    skills = [dict(row) for row in conn.execute(
+        'SELECT skill_name, confidence FROM user_skills WHERE user_id = ? ORDER BY confidence DESC', (user_id,)
+    )]
+    target_role = (user['target_role'] or 'software engineer').strip()
+    matched_role = match_role(target_role, ROLES) or target_role
+    if matched_role not in ROLES:
+        matched_role = 'software engineer'
+    requirements = ROLES.get(matched_role, {})
+    skill_conf = build_skill_conf_map_from_rows(skills)
+    return {
+        **compute_role_readiness(requirements, skill_conf),
+        'target_role': matched_role,
+        'core_fit': compute_core_fit(requirements, skill_conf),
+    }
+
+
+def comparable(readiness):
+    return {key: value for key, value in readiness.items() if key != 'phases'}
+
+
+@pytest.mark.parametrize('write', [
+    "INSERT INTO user_skills (user_id, skill_name, confidence) VALUES ('u1', 'Excel', 0.7)",
+    "UPDATE user_skills SET confidence = 0.8 WHERE user_id = 'u1' AND skill_name = 'Python'",
+    "UPDATE user_skills SET user_id = 'u1' WHERE user_id = 'u2'",        # moves a skill in
+    "DELETE FROM user_skills WHERE user_id = 'u1' AND skill_name = 'SQL'",
+    "UPDATE users SET target_role = 'backend developer' WHERE user_id = 'u1'",
+    "DELETE FROM users WHERE user_id = 'u1'",
+])
+def test_writes_to_the_users_skills_or_role_drop_the_stored_row(conn, write):
+    user_readiness.refresh_user_readiness(conn, 'u1')
+    user_readiness.refresh_user_readiness(conn, 'u2')
+
+    conn.execute(write)
+
+    assert stored(conn, 'u1') is None
+    if 'u2' not in write:
+        assert stored(conn, 'u2') is not None
+
+
+@pytest.mark.parametrize('write', [
+    "INSERT INTO user_skills (user_id, skill_name, confidence) VALUES ('u2', 'Git', 0.7)",
+    "UPDATE users SET name = 'Ann' WHERE user_id = 'u1'",
+    "UPDATE users SET target_role = 'software engineer' WHERE user_id = 'u2'",
+])
+def test_unrelated_writes_keep_the_stored_row(conn, write):
+    user_readiness.refresh_user_readiness(conn, 'u1')
+
+    conn.execute(write)
+
+    assert stored(conn, 'u1') is not None
+
+
+def test_stored_readiness_matches_the_on_demand_computation(conn):
+    refreshed = user_readiness.refresh_user_readiness(conn, 'u1')
+
+    assert comparable(refreshed) == on_demand(conn, 'u1')
+    assert comparable(user_readiness.get_user_readiness(conn, 'u1')) == on_demand(conn, 'u1')
+    assert refreshed['phases'] == {
+        'foundation': {'complete': 1, 'weak': 0, 'missing': 1},
+        'core': {'complete': 0, 'weak': 1, 'missing': 1},
+        'advanced': {'complete': 0, 'weak': 0, 'missing': 1},
+        'projects': {'complete': 0, 'weak': 0, 'missing': 1},
+    }
+
+
+def test_reads_after_random_writes_match_the_on_demand_computation(conn):
+    rng = random.Random(3)
+    names = ['SQL', 'sql', 'Python', 'Excel', 'Statistics', 'Tableau', 'Git', 'Docker', 'REST APIs', 'Rust']
+    for _ in range(60):
+        action = rng.choice(['insert', 'update', 'delete', 'role'])
+        if action == 'insert':
+            conn.execute('INSERT INTO user_skills (user_id, skill_name, confidence) VALUES (?, ?, ?)',
+                         (rng.choice(['u1', 'u2']), rng.choice(names), rng.choice([0.1, 0.4, 0.5, 0.9])))
+        elif action == 'update':
+            conn.execute('UPDATE user_skills SET confidence = ? WHERE skill_name = ?',
+                         (rng.choice([0.2, 0.6]), rng.choice(names)))
+        elif action == 'delete':
+            conn.execute('DELETE FROM user_skills WHERE skill_name = ?', (rng.choice(names),))
+        else:
+            conn.execute('UPDATE users SET target_role = ? WHERE user_id = ?',
+                         (rng.choice([None, 'data analyst', 'backend dev', 'nurse']), rng.choice(['u1', 'u2'])))
+        conn.commit()
+        if rng.random() < 0.5:
+            user_readiness.after_skills_write(conn, rng.choice(['u1', 'u2']))
+        for user_id in ('u1', 'u2'):
+            assert comparable(user_readiness.get_user_readiness(conn, user_id)) == on_demand(conn, user_id)
+
+
+def test_rows_from_older_reference_data_are_recomputed(conn, reference):
+    user_readiness.refresh_user_readiness(conn, 'u1')
+    conn.execute("UPDATE user_readiness SET readiness_score = -1")
+    conn.commit()
+    assert user_readiness.get_user_readiness(conn, 'u1')['readiness_score'] == -1
+
+    reference.version = '8.1'
+
+    assert comparable(user_readiness.get_user_readiness(conn, 'u1')) == on_demand(conn, 'u1')
+    assert stored(conn)['reference_version'] == '8.1'
+
+
+def test_missing_users_have_no_readiness(conn):
+    assert user_readiness.refresh_user_readiness(conn, 'nobody') is None
+    assert stored(conn, 'nobody') is None